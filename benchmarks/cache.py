@@ -0,0 +1,83 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from json import loads as json_loads
+from subprocess import run as subprocess_run
+from sys import executable as sys_executable
+
+from benchmarks.catalogs import PATH_ROOT
+
+MIB = 1024 * 1024
+BUDGETS = (0, 32 * MIB, 128 * MIB, 512 * MIB)
+IMAGES = 300
+STEPS = 1500
+SCRIPT = """
+import json
+import resource
+import sys
+from random import Random
+from imageviewer.cache.cache import Cache
+budget, images, steps = (int(arg) for arg in sys.argv[1:4])
+random = Random(2021)
+sizes = [random.randrange(2, 9) * 1024 * 1024 for _ in range(images)]
+cache = Cache(budget)
+index = shown = 0
+for _ in range(steps):
+    step = random.random()
+    if step < 0.7:
+        index = (index + 1) % images
+    elif step < 0.9:
+        index = (index - 1) % images
+    else:
+        index = random.randrange(images)
+    cache.pin(index)
+    cache.unpin(shown)
+    shown = index
+    if cache.get(index) is None:
+        cache.put(index, bytearray(b'\\x01') * sizes[index])
+stats = cache.get_stats()
+stats['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+print(json.dumps(stats))
+"""
+
+
+def replay(budget):
+    """Replay the navigation trace with one budget in a new interpreter.
+
+    ---
+    The trace walks forward mostly, back sometimes and jumps now and then,
+    decoding (allocating and filling) the images that are not cached.
+    """
+    result = subprocess_run([sys_executable, '-c', SCRIPT, str(budget),
+                             str(IMAGES), str(STEPS)],
+                            cwd=PATH_ROOT, capture_output=True, text=True,
+                            check=True)
+    return json_loads(result.stdout)
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(f"{'budget MiB':>10} {'hit rate':>9} {'evictions':>10} "
+          f"{'peak MiB':>9} {'peak RSS MiB':>13}")
+    for budget in BUDGETS:
+        stats = replay(budget)
+        rate = stats['hits'] / max(1, stats['hits'] + stats['misses'])
+        print(f"{budget // MIB:>10} {rate:>9.2%} {stats['evictions']:>10} "
+              f"{stats['peak_bytes'] / MIB:>9.1f} {stats['rss'] / MIB:>13.1f}")
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,116 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from json import dump as json_dump
+from json import load as json_load
+from os import makedirs as os_makedirs
+from os.path import dirname as os_path_dirname
+from os.path import join as os_path_join
+
+PATH_ROOT = os_path_dirname(os_path_dirname(__file__)).replace('\\', '/')
+
+
+def read(path):
+    """Read a system file (*.json) of this program"""
+    with open(file=f"{PATH_ROOT}/{path}", mode='rt', encoding='utf-8') as file:
+        return json_load(file)
+
+
+def write(path, data):
+    """Write a file (*.json), creating its directories"""
+    os_makedirs(os_path_dirname(path), exist_ok=True)
+    with open(file=path, mode='wt', encoding='utf-8') as file:
+        json_dump(data, file, ensure_ascii=False, indent=4)
+
+
+def make_root(path_root, words=1000, themes=12, languages=2):
+    """Write a synthetic root of this program with large catalogs.
+
+    ---
+    The system files (*.json) are copied and grown to the given number of
+    words (per language shard), themes and languages, so the loaders can be
+    measured on catalogs of a realistic future size.
+
+    ---
+    Parameters:
+    ---
+    path_root: str
+        -- full path to the synthetic root directory
+
+    Keyword arguments:
+    ---
+    words: int
+        -- number of words in words.json (default 1000)
+    themes: int
+        -- number of themes in themes.json (default 12)
+    languages: int
+        -- number of languages, including 'en-US' (default 2)
+
+    Returns:
+    ---
+    : list[str]
+        -- ISO codes of the synthetic languages
+    """
+    dict_languages = read('imageviewer/languages/languages.json')
+    dict_shard = read('imageviewer/strings/languages/bn-IN.json')
+    dict_themes = read('imageviewer/themes/themes.json')
+    codes = ['en-US', 'bn-IN']
+    codes += [f"x{index}-XX" for index in range(max(0, languages - 2))]
+    write(os_path_join(path_root, 'imageviewer/strings/languages/en-US.json'),
+          read('imageviewer/strings/languages/en-US.json'))
+    for code in codes[1:]:
+        dict_languages['codes'][code] = f"Language {code}"
+        write(os_path_join(path_root,
+                           f"imageviewer/strings/languages/{code}.json"),
+              {'numbers': dict_shard['numbers'],
+               'alphabets': dict_shard['alphabets'],
+               'words': {f"Word {index}": f"{code} word {index}"
+                         for index in range(words)}})
+    for index in range(max(0, themes - 2)):
+        dict_themes[f"Theme {index}"] = dict_themes['Dark']
+    write(os_path_join(path_root, 'imageviewer/languages/languages.json'),
+          dict_languages)
+    write(os_path_join(path_root, 'imageviewer/themes/themes.json'),
+          dict_themes)
+    write(os_path_join(path_root, 'imageviewer/settings/settings.json'),
+          read('imageviewer/settings/settings.json'))
+    return codes
+
+
+def make_profile(path_profile, words=100, themes=2):
+    """Write synthetic user files (*.json) into a profile directory.
+
+    ---
+    Parameters:
+    ---
+    path_profile: str
+        -- full path to the synthetic ~/.imageviewer directory
+
+    Keyword arguments:
+    ---
+    words: int
+        -- number of words in user-words.json (default 100)
+    themes: int
+        -- number of themes in user-themes.json (default 2)
+    """
+    dict_themes = read('imageviewer/themes/themes.json')
+    write(os_path_join(path_profile, 'user-words.json'),
+          {f"Word {index}": {'bn-IN': f"user word {index}"}
+           for index in range(words)})
+    write(os_path_join(path_profile, 'user-themes.json'),
+          {f"User {index}": dict_themes['Light'] for index in range(themes)})
+    write(os_path_join(path_profile, 'user-settings.json'),
+          {'theme': 'Dark', 'language': 'bn-IN', 'statusbar': False})
@@ -0,0 +1,82 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from sys import stderr as sys_stderr
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from imageviewer.decoder.decoder import Decoder
+
+IMAGES = (('JPEG', 'jpg', (6000, 4000)), ('JPEG2000', 'jp2', (6000, 4000)))
+VIEW = (1920, 1080)
+REPEAT = 5
+
+
+def make_image(path, format, size):
+    """Write a photo-like test image: a gradient with some noise"""
+    from PIL import Image
+
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 48)
+    image = Image.merge('RGB', (gradient, noise,
+                                gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    image.save(path, format=format)
+
+
+def time_to_first_pixel(path, size):
+    """Time showing an image, from show until it is scaled to the view.
+
+    ---
+    Every run uses a new decoder, so nothing is prefetched or cached.
+    """
+    times = []
+    for _ in range(REPEAT):
+        decoder = Decoder(workers=1, prefetch=0, size=size)
+        start = perf_counter()
+        decoder.set_paths([path])
+        image = decoder.show(0, full=size is None).result()
+        image.thumbnail(VIEW)
+        times.append(perf_counter() - start)
+        decoder.close()
+    return min(times)
+
+
+def __Main():
+    """Main entry point of this program"""
+    try:
+        import PIL  # noqa: F401
+    except ImportError as e:
+        print(f"ERROR: {e}. Pillow is needed for this benchmark.",
+              file=sys_stderr)
+        return
+    print(f"{'format':>9} {'size':>10} {'full ms':>9} {'reduced ms':>11} "
+          f"{'speedup':>8}")
+    with TemporaryDirectory() as path:
+        for format, extension, size in IMAGES:
+            path_image = f"{path}/image.{extension}"
+            try:
+                make_image(path_image, format, size)
+            except (OSError, KeyError) as e:
+                print(f"ERROR: {e}. Skipping {format}.", file=sys_stderr)
+                continue
+            full = time_to_first_pixel(path_image, None)
+            reduced = time_to_first_pixel(path_image, VIEW)
+            print(f"{format:>9} {size[0]:>5}x{size[1]:<4} {full * 1000:>9.1f} "
+                  f"{reduced * 1000:>11.1f} {full / reduced:>7.1f}x")
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
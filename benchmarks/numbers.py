@@ -0,0 +1,63 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from timeit import repeat as timeit_repeat
+
+from benchmarks.catalogs import PATH_ROOT
+from benchmarks.catalogs import read
+from imageviewer.strings.strings import Strings
+
+VALUES = (7, 1920, 1080, 42069, 3.14159, 123456789, 65535)
+NUMBER = 20000
+
+
+def get_number_replace(numbers, number):
+    """The chained replaces get_number used before the translation tables"""
+    return str(number).replace('0', numbers[0]).replace('1', numbers[1])\
+        .replace('2', numbers[2]).replace('3', numbers[3])\
+        .replace('4', numbers[4]).replace('5', numbers[5])\
+        .replace('6', numbers[6]).replace('7', numbers[7])\
+        .replace('8', numbers[8]).replace('9', numbers[9])
+
+
+def best(statement):
+    """Best time of a statement per formatted value, in nanoseconds"""
+    times = timeit_repeat(statement, number=NUMBER, repeat=5)
+    return min(times) / NUMBER / len(VALUES) * 1e9
+
+
+def __Main():
+    """Main entry point of this program"""
+    strings = Strings(PATH_ROOT)
+    strings.load_language_codes(('bn-IN',))
+    strings.set_language('bn-IN')
+    numbers = read('imageviewer/strings/languages/bn-IN.json')['numbers']
+    for value in VALUES:
+        assert strings.get_number(value) == get_number_replace(numbers, value)
+    replace = best(lambda: [get_number_replace(numbers, value)
+                            for value in VALUES])
+    single = best(lambda: [strings.get_number(value) for value in VALUES])
+    batch = best(lambda: strings.get_numbers(VALUES))
+    print(f"{'chained replace':<20} {replace:>8.1f} ns/number",
+          f"{'get_number':<20} {single:>8.1f} ns/number "
+          f"({replace / single:.1f}x)",
+          f"{'get_numbers':<20} {batch:>8.1f} ns/number "
+          f"({replace / batch:.1f}x)",
+          sep='\n')
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,135 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from sys import exit as sys_exit
+from sys import stderr as sys_stderr
+from time import perf_counter
+
+from imageviewer.resample.resample import Resampler
+
+CASES = (((6000, 4000), (1920, 1280)),
+         ((1920, 1080), (1280, 720)),
+         ((1920, 1080), (800, 450)),
+         ((1024, 768), (2048, 1536)))
+FILTERS = ('nearest', 'bilinear', 'box')
+REPEAT = 5
+CHECKS = (((97, 61), (31, 20)), ((40, 30), (100, 77)), ((4, 4), (2, 2)))
+TOLERANCE = 3
+
+
+def make_image(size):
+    """Make a smooth RGB test image of a size"""
+    import numpy
+
+    width, height = size
+    rows = numpy.linspace(0, 255, height, dtype=numpy.float32)
+    columns = numpy.linspace(0, 255, width, dtype=numpy.float32)
+    image = numpy.empty((height, width, 3), dtype=numpy.uint8)
+    image[..., 0] = rows[:, None]
+    image[..., 1] = columns[None, :]
+    image[..., 2] = (rows[:, None] + columns[None, :]) / 2
+    return image
+
+
+def measure(resampler, image, size, filter):
+    """Time resizing an image, the best of some runs into the same buffer"""
+    resampler.resize(image, size, filter)
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = perf_counter()
+        resampler.resize(image, size, filter)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def compare(image, size, filter):
+    """Get the largest difference between the NumPy and Pillow backends.
+
+    ---
+    The colours of an image with an alpha band are compared premultiplied,
+    as they are shown: Pillow keeps them premultiplied in 8 bits, so the
+    colours of the faint pixels are only approximate in both backends.
+    """
+    import numpy
+
+    numpy_image = Resampler('numpy').resize(image, size, filter)\
+        .astype(numpy.float64)
+    pillow_image = Resampler('pillow').resize(image, size, filter)\
+        .astype(numpy.float64)
+    if image.shape[2] == 4:
+        numpy_image[..., :3] *= numpy_image[..., 3:] / 255.0
+        pillow_image[..., :3] *= pillow_image[..., 3:] / 255.0
+    return float(numpy.abs(numpy_image - pillow_image).max())
+
+
+def check_backends():
+    """Fail when the backends give different RGB or RGBA images.
+
+    ---
+    The images are random, so every pixel is an edge, and the RGBA ones
+    mix transparent and opaque pixels. Returns the exit status.
+    """
+    import numpy
+
+    generator = numpy.random.default_rng(0)
+    status = 0
+    for bands in (3, 4):
+        for source, size in CHECKS:
+            image = generator.integers(0, 256, (source[1], source[0], bands),
+                                       dtype=numpy.uint8)
+            if bands == 4:
+                image[::2, ::2, 3] = 0
+                image[1::2, 1::2, 3] = 255
+            for filter in FILTERS:
+                difference = compare(image, size, filter)
+                if difference > TOLERANCE:
+                    print(f"FAILED: {filter} {source} to {size} with "
+                          f"{bands} bands differs by {difference:.2f}")
+                    status = 1
+    if status == 0:
+        print(f"the backends agree within {TOLERANCE} level(s)")
+    return status
+
+
+def __Main():
+    """Main entry point of this program"""
+    try:
+        import numpy  # noqa: F401
+        import PIL  # noqa: F401
+    except ImportError as e:
+        print(f"ERROR: {e}. NumPy and Pillow are needed for this benchmark.",
+              file=sys_stderr)
+        return
+    numpy_backend = Resampler('numpy')
+    pillow_backend = Resampler('pillow')
+    auto_backend = Resampler('auto')
+    print(f"{'from':>10} {'to':>10} {'filter':>9} {'numpy ms':>9} "
+          f"{'pillow ms':>10} {'auto':>7}")
+    for source, size in CASES:
+        image = make_image(source)
+        enlarge = size[0] > source[0]
+        for filter in FILTERS:
+            numpy_time = measure(numpy_backend, image, size, filter)
+            pillow_time = measure(pillow_backend, image, size, filter)
+            print(f"{source[0]:>5}x{source[1]:<4} {size[0]:>5}x{size[1]:<4} "
+                  f"{filter:>9} {numpy_time * 1000:>9.2f} "
+                  f"{pillow_time * 1000:>10.2f} "
+                  f"{auto_backend.get_backend(filter, enlarge):>7}")
+    sys_exit(check_backends())
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,176 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from json import loads as json_loads
+from os import environ as os_environ
+from os import remove as os_remove
+from statistics import median
+from subprocess import run as subprocess_run
+from sys import executable as sys_executable
+from sys import exit as sys_exit
+from tempfile import TemporaryDirectory
+
+from benchmarks.catalogs import PATH_ROOT
+from benchmarks.catalogs import make_profile
+from benchmarks.catalogs import make_root
+from imageviewer.paths.paths import Paths
+
+SIZES = ((100, 2), (1000, 12), (5000, 24), (20000, 48))
+REPEAT = 5
+BUDGET = 300.0
+SCRIPT = """
+import sys
+from time import perf_counter
+from imageviewer.paths.paths import Paths
+from imageviewer.snapshot.snapshot import Snapshot
+snapshot = Snapshot(sys.argv[1], Paths())
+start = perf_counter()
+snapshot.load()
+print(perf_counter() - start)
+"""
+FIRST_SCRIPT = """
+import json
+import sys
+from imageviewer.startup.startup import Startup
+startup = Startup()
+startup.start()
+with startup.phase('import'):
+    import imageviewer.main
+imageviewer.main.start(sys.argv[1], startup)
+startup.stop()
+print(json.dumps({'total': startup.get_total(),
+                  'phases': startup.get_phases(),
+                  'imports': startup.get_imports()[:10],
+                  'report': startup.get_report()}))
+"""
+
+
+def measure(path_root, cold):
+    """Time one startup, with or without a valid snapshot.
+
+    ---
+    Every startup runs in a new interpreter, so nothing loaded by a previous
+    one is shared with it.
+    """
+    if cold:
+        try:
+            os_remove(f"{Paths().get_profile_path()}/snapshot.bin")
+        except FileNotFoundError:
+            pass
+    result = subprocess_run([sys_executable, '-c', SCRIPT, path_root],
+                            cwd=PATH_ROOT, capture_output=True, text=True,
+                            check=True)
+    return float(result.stdout)
+
+
+def bench(words, themes):
+    """Compare cold start with warm snapshot start for one catalog size"""
+    with TemporaryDirectory() as path:
+        path_root = f"{path}/root"
+        os_environ['HOME'] = f"{path}/home"
+        os_environ['USERPROFILE'] = f"{path}/home"
+        make_root(path_root, words=words, themes=themes)
+        make_profile(f"{path}/home/.imageviewer", words=words // 10)
+        cold = min(measure(path_root, True) for _ in range(REPEAT))
+        warm = min(measure(path_root, False) for _ in range(REPEAT))
+    return cold, warm
+
+
+def measure_first(path_image):
+    """Time one startup of the main entry point up to the first image.
+
+    ---
+    Returns the profile of imageviewer.startup, as a dict.
+    """
+    result = subprocess_run([sys_executable, '-c', FIRST_SCRIPT, path_image],
+                            cwd=PATH_ROOT, capture_output=True, text=True,
+                            check=True)
+    return json_loads(result.stdout.splitlines()[-1])
+
+
+def check_budget(budget):
+    """Fail when the median startup up to the first image exceeds the budget.
+
+    ---
+    The first image is a 12 MP JPEG, decoded for a 1280x800 window. The
+    painting is skipped without a display. Returns the exit status.
+    """
+    with TemporaryDirectory() as path:
+        os_environ['HOME'] = f"{path}/home"
+        os_environ['USERPROFILE'] = f"{path}/home"
+        path_image = ''
+        try:
+            from PIL import Image
+
+            path_image = f"{path}/first.jpg"
+            Image.linear_gradient('L').resize((4000, 3000))\
+                .convert('RGB').save(path_image, quality=90)
+        except ImportError:
+            print("Pillow is not installed, timing without an image")
+        profiles = [measure_first(path_image) for _ in range(REPEAT)]
+    totals = [profile['total'] * 1000 for profile in profiles]
+    elapsed = median(totals)
+    print(f"startup to the first image: {elapsed:.2f} ms (median of "
+          f"{REPEAT}, min {min(totals):.2f} ms), budget {budget:.2f} ms")
+    if elapsed <= budget:
+        return 0
+    ordered = sorted(profiles, key=lambda profile: profile['total'])
+    print(ordered[len(ordered) // 2]['report'])
+    print(f"FAILED: the startup exceeds the budget by "
+          f"{elapsed - budget:.2f} ms")
+    return 1
+
+
+def compare_snapshot():
+    """Compare cold start with warm snapshot start for every catalog size"""
+    home = os_environ.get('HOME')
+    print(f"{'words':>8} {'themes':>8} {'cold ms':>10} {'warm ms':>10} "
+          f"{'speedup':>8}")
+    try:
+        for words, themes in SIZES:
+            cold, warm = bench(words, themes)
+            print(f"{words:>8} {themes:>8} {cold * 1000:>10.2f} "
+                  f"{warm * 1000:>10.2f} {cold / warm:>7.1f}x")
+    finally:
+        if home is not None:
+            os_environ['HOME'] = home
+
+
+def __Main():
+    """Main entry point of this program"""
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='python -m benchmarks.startup')
+    parser.add_argument('--budget', type=float, default=BUDGET,
+                        help='fail when the startup up to the first image '
+                             'takes longer, in milliseconds (default '
+                             f'{BUDGET:g})')
+    parser.add_argument('--budget-only', action='store_true',
+                        help='only check the budget, not the snapshot')
+    arguments = parser.parse_args()
+    home = os_environ.get('HOME')
+    if not arguments.budget_only:
+        compare_snapshot()
+    try:
+        status = check_budget(arguments.budget)
+    finally:
+        if home is not None:
+            os_environ['HOME'] = home
+    sys_exit(status)
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
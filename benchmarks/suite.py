@@ -0,0 +1,332 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from datetime import datetime
+from io import StringIO
+from json import dump as json_dump
+from json import load as json_load
+from os import environ as os_environ
+from platform import platform as platform_platform
+from platform import python_version as platform_python_version
+from random import Random
+from statistics import median
+from sys import exit as sys_exit
+from sys import stderr as sys_stderr
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from timeit import repeat as timeit_repeat
+
+from benchmarks.catalogs import make_profile
+from benchmarks.catalogs import make_root
+
+VERSION = 1
+WORDS = 20000
+THEMES = 48
+LANGUAGES = 8
+REPEAT = 5
+VIEW = (1920, 1080)
+NAVIGATION = (40, (2400, 1600), 200)
+THRESHOLD = 0.10
+
+
+def get_result(times, operations=1):
+    """Make the result of a benchmark from its times, per operation"""
+    times = [time / operations for time in times]
+    return {'seconds': min(times), 'median': median(times),
+            'samples': len(times)}
+
+
+def time_calls(function, number, operations=1, quick=False):
+    """Time a function with timeit, as get_result.
+
+    ---
+    The function does the given number of operations per call, e.g. one
+    lookup for every word of a list.
+    """
+    if quick:
+        number = max(1, number // 10)
+    times = timeit_repeat(function, number=number,
+                          repeat=3 if quick else REPEAT)
+    return get_result(times, number * operations)
+
+
+def bench_config(path, quick):
+    """Microbenchmarks of the languages, strings, themes and settings.
+
+    ---
+    They are loaded from a synthetic root with large catalogs, see
+    benchmarks.catalogs.
+    """
+    from imageviewer.languages.languages import Languages
+    from imageviewer.settings.settings import Settings
+    from imageviewer.strings.strings import Strings
+    from imageviewer.themes.themes import Themes
+
+    path_root = f"{path}/root"
+    codes = make_root(path_root, words=WORDS, themes=THEMES,
+                      languages=LANGUAGES)
+    make_profile(f"{path}/home/.imageviewer", words=WORDS // 10)
+    dict_results = {}
+    languages = Languages(path_root)
+    strings = Strings(path_root)
+    strings.load_language_codes(codes)
+    strings.set_language('bn-IN')
+    themes = Themes(path_root)
+    settings = Settings(path_root, languages, strings, themes)
+    numbers = [7, 1920, 1080, 42069, 3.14159, 123456789, 65535]
+    words = [f"Word {index}" for index in range(0, WORDS, WORDS // 100)]
+    abbreviations = [f"a{index}b{index}c" for index in range(100)]
+    names = themes.get_names()
+    dict_results['strings.get_number'] = time_calls(
+        lambda: [strings.get_number(number) for number in numbers], 5000,
+        len(numbers), quick)
+    dict_results['strings.get_abbreviation'] = time_calls(
+        lambda: [strings.get_abbreviation(string)
+                 for string in abbreviations], 500, len(abbreviations), quick)
+    dict_results['strings.get_word'] = time_calls(
+        lambda: [strings.get_word(word) for word in words], 500, len(words),
+        quick)
+    dict_results['strings.get_word.other'] = time_calls(
+        lambda: [strings.get_word(word, codes[-1]) for word in words], 500,
+        len(words), quick)
+    dict_results['themes.set'] = time_calls(
+        lambda: [themes.set(name) for name in names], 500, len(names), quick)
+    dict_results['themes.get'] = time_calls(
+        lambda: [themes.get(name) for name in names], 500, len(names), quick)
+    dict_results['languages.set_code'] = time_calls(
+        lambda: [languages.set_code(code) for code in codes], 2000,
+        len(codes), quick)
+    path_settings = f"{path}/home/.imageviewer/user-settings.json"
+    dict_results['settings.load'] = time_calls(
+        lambda: settings.load(path_settings), 500, 1, quick)
+    dict_results['settings.dump'] = time_calls(
+        lambda: settings.dump(StringIO()), 500, 1, quick)
+    return dict_results
+
+
+def bench_decode(path, quick):
+    """Macrobenchmarks of showing a large JPEG, full and reduced"""
+    from benchmarks.decode import make_image
+    from imageviewer.decoder.decoder import Decoder
+
+    path_image = f"{path}/decode.jpg"
+    make_image(path_image, 'JPEG', (6000, 4000))
+    dict_results = {}
+    for name, size in (('full', None), ('reduced', VIEW)):
+        times = []
+        for _ in range(2 if quick else REPEAT):
+            decoder = Decoder(workers=1, prefetch=0, size=size)
+            start = perf_counter()
+            decoder.set_paths([path_image])
+            image = decoder.show(0, full=size is None).result()
+            image.thumbnail(VIEW)
+            times.append(perf_counter() - start)
+            decoder.close()
+        dict_results[f"decode.jpeg.{name}"] = get_result(times)
+    return dict_results
+
+
+def bench_resize(quick):
+    """Macrobenchmarks of resizing a 24 MP image to the view"""
+    from benchmarks.resample import make_image
+    from imageviewer.resample.resample import Resampler
+
+    image = make_image((6000, 4000))
+    dict_results = {}
+    for backend in ('numpy', 'pillow'):
+        resampler = Resampler(backend)
+        for filter in ('nearest', 'bilinear', 'box'):
+            resampler.resize(image, (1920, 1280), filter)
+            times = []
+            for _ in range(2 if quick else REPEAT):
+                start = perf_counter()
+                resampler.resize(image, (1920, 1280), filter)
+                times.append(perf_counter() - start)
+            dict_results[f"resize.{filter}.{backend}"] = get_result(times)
+    return dict_results
+
+
+def bench_navigation(path, quick):
+    """Macrobenchmark of replaying a navigation trace through a directory.
+
+    ---
+    The trace walks forward mostly, back sometimes and jumps now and then,
+    with the decoder prefetching the next image into a cache. The result is
+    the time from a step until its image is decoded.
+    """
+    from benchmarks.decode import make_image
+    from imageviewer.cache.cache import Cache
+    from imageviewer.decoder.decoder import Decoder
+
+    images, size, steps = NAVIGATION
+    if quick:
+        steps //= 4
+    list_paths = []
+    for index in range(images):
+        list_paths.append(f"{path}/navigation{index:03}.jpg")
+        make_image(list_paths[-1], 'JPEG', size)
+    random = Random(2021)
+    cache = Cache(256 * 1024 * 1024)
+    decoder = Decoder(workers=2, prefetch=1, cache=cache, size=VIEW)
+    decoder.set_paths(list_paths)
+    index = 0
+    times = []
+    for _ in range(steps):
+        step = random.random()
+        if step < 0.7:
+            index = (index + 1) % images
+        elif step < 0.9:
+            index = (index - 1) % images
+        else:
+            index = random.randrange(images)
+        start = perf_counter()
+        decoder.show(index).result()
+        times.append(perf_counter() - start)
+    hit_rate = decoder.get_hit_rate()
+    decoder.close()
+    result = get_result([sum(times)], len(times))
+    result['median'] = median(times)
+    result['p95'] = sorted(times)[int(len(times) * 0.95)]
+    result['hit_rate'] = hit_rate
+    return {'navigation.step': result}
+
+
+def run(filter='', quick=False):
+    """Run the benchmarks whose names start with the filter.
+
+    ---
+    Returns the results as written into the JSON file: the environment and
+    the best and median seconds per operation of every benchmark (the mean
+    for the navigation trace, whose best step is always a cache hit).
+    """
+    dict_results = {}
+    home = os_environ.get('HOME')
+    with TemporaryDirectory() as path:
+        os_environ['HOME'] = f"{path}/home"
+        os_environ['USERPROFILE'] = f"{path}/home"
+        try:
+            for group, bench in (
+                    ('strings themes languages settings',
+                     lambda: bench_config(path, quick)),
+                    ('decode', lambda: bench_decode(path, quick)),
+                    ('resize', lambda: bench_resize(quick)),
+                    ('navigation', lambda: bench_navigation(path, quick))):
+                if not any(name.startswith(filter) or filter.startswith(name)
+                           for name in group.split()):
+                    continue
+                try:
+                    results = bench()
+                except ImportError as e:
+                    print(f"ERROR: {e}. Skipping the {group} benchmarks.",
+                          file=sys_stderr)
+                    continue
+                dict_results.update((name, result) for name, result in
+                                    results.items()
+                                    if name.startswith(filter))
+        finally:
+            if home is not None:
+                os_environ['HOME'] = home
+    return {'version': VERSION, 'date': datetime.now().isoformat(),
+            'python': platform_python_version(),
+            'platform': platform_platform(), 'quick': quick,
+            'results': dict_results}
+
+
+def compare(previous, current, threshold=THRESHOLD):
+    """Compare the results of two runs.
+
+    ---
+    A benchmark regressed when its best time grew by more than the
+    threshold, e.g. 0.10 for 10 %.
+
+    ---
+    Returns a list of the name, previous seconds, current seconds, ratio
+    and 'regression', 'improvement' or '' of every common benchmark.
+    """
+    list_rows = []
+    for name, result in current['results'].items():
+        old = previous['results'].get(name)
+        if old is None:
+            continue
+        ratio = result['seconds'] / max(old['seconds'], 1e-12)
+        flag = 'regression' if ratio > 1 + threshold else \
+            'improvement' if ratio < 1 / (1 + threshold) else ''
+        list_rows.append((name, old['seconds'], result['seconds'], ratio,
+                          flag))
+    return list_rows
+
+
+def format_time(seconds):
+    """Format seconds with a readable unit"""
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def __Main():
+    """Main entry point of this program"""
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='python -m benchmarks.suite')
+    parser.add_argument('--output', default='',
+                        help='write the results into this JSON file')
+    parser.add_argument('--compare', default='',
+                        help='compare with the results of a previous run '
+                             'and exit with 1 on a regression')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='slowdown flagged as a regression '
+                             '(default 0.10, i.e. 10 %%)')
+    parser.add_argument('--filter', default='',
+                        help='only the benchmarks starting with this, '
+                             'e.g. strings or decode')
+    parser.add_argument('--quick', action='store_true',
+                        help='fewer runs, for a smoke test')
+    arguments = parser.parse_args()
+    current = run(arguments.filter, arguments.quick)
+    print(f"{'benchmark':<28} {'time':>11} {'median':>11}")
+    for name, result in current['results'].items():
+        extra = f"  hit rate {result['hit_rate']:.1%}" \
+            if 'hit_rate' in result else ''
+        print(f"{name:<28} {format_time(result['seconds']):>11} "
+              f"{format_time(result['median']):>11}{extra}")
+    if len(arguments.output) > 0:
+        with open(file=arguments.output, mode='wt', encoding='utf-8') \
+                as file:
+            json_dump(current, file, indent=4)
+    if len(arguments.compare) == 0:
+        return
+    with open(file=arguments.compare, mode='rt', encoding='utf-8') as file:
+        previous = json_load(file)
+    if previous.get('version') != VERSION:
+        print(f"ERROR: '{arguments.compare}' was written by another version "
+              "of the suite.", file=sys_stderr)
+        sys_exit(2)
+    rows = compare(previous, current, arguments.threshold)
+    print(f"\n{'benchmark':<28} {'previous':>11} {'current':>11} "
+          f"{'change':>8}")
+    for name, old, new, ratio, flag in rows:
+        print(f"{name:<28} {format_time(old):>11} {format_time(new):>11} "
+              f"{ratio - 1:>+8.1%}  {flag}")
+    regressions = [row[0] for row in rows if row[4] == 'regression']
+    if len(regressions) > 0:
+        print(f"FAILED: {len(regressions)} regression(s): "
+              f"{', '.join(regressions)}")
+        sys_exit(1)
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,88 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from os import environ as os_environ
+from os import makedirs as os_makedirs
+from os import urandom as os_urandom
+from subprocess import run as subprocess_run
+from sys import executable as sys_executable
+from tempfile import TemporaryDirectory
+
+from benchmarks.catalogs import PATH_ROOT
+from imageviewer.paths.paths import Paths
+from imageviewer.thumbnails.thumbnails import Thumbnails
+
+SIZES = (1000, 5000, 20000)
+REPEAT = 3
+SCRIPT = """
+import os
+import sys
+from time import perf_counter
+start = perf_counter()
+from imageviewer.paths.paths import Paths
+from imageviewer.thumbnails.thumbnails import Thumbnails
+thumbnails = Thumbnails(Paths())
+shown = sum(1 for entry in os.scandir(sys.argv[1])
+            if thumbnails.get(entry.path, entry) is not None)
+print(perf_counter() - start, shown)
+"""
+
+
+def bench(images):
+    """Time reopening the store and getting the thumbnails of a folder.
+
+    ---
+    The thumbnails are random data of a typical PNG thumbnail size, stored
+    with put, so Pillow is not needed. Every reopening runs in a new
+    interpreter.
+    """
+    with TemporaryDirectory() as path:
+        os_environ['HOME'] = f"{path}/home"
+        os_environ['USERPROFILE'] = f"{path}/home"
+        os_makedirs(f"{path}/images")
+        thumbnails = Thumbnails(Paths())
+        for image in range(images):
+            path_image = f"{path}/images/{image:05}.jpg"
+            with open(file=path_image, mode='wb') as file:
+                file.write(b'\xff\xd8')
+            thumbnails.put(path_image, os_urandom(12 * 1024))
+        thumbnails.close()
+        times = []
+        for _ in range(REPEAT):
+            result = subprocess_run([sys_executable, '-c', SCRIPT,
+                                     f"{path}/images"],
+                                    cwd=PATH_ROOT, capture_output=True,
+                                    text=True, check=True)
+            time, shown = result.stdout.split()
+            assert int(shown) == images
+            times.append(float(time))
+    return min(times)
+
+
+def __Main():
+    """Main entry point of this program"""
+    home = os_environ.get('HOME')
+    print(f"{'images':>8} {'reopen ms':>10}")
+    try:
+        for images in SIZES:
+            print(f"{images:>8} {bench(images) * 1000:>10.2f}")
+    finally:
+        if home is not None:
+            os_environ['HOME'] = home
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,280 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import ProcessPoolExecutor
+from os import makedirs as os_makedirs
+from os import remove as os_remove
+from os import replace as os_replace
+from os import stat as os_stat
+from os import walk as os_walk
+from os.path import dirname as os_path_dirname
+from os.path import relpath as os_path_relpath
+from os.path import splitext as os_path_splitext
+from sys import stderr as sys_stderr
+from time import perf_counter
+
+
+class Batch:
+
+    __EXTENSIONS = frozenset((
+        '.bmp', '.dib', '.gif', '.ico', '.j2k', '.jp2', '.jpe', '.jpeg',
+        '.jpg', '.jpx', '.pbm', '.pgm', '.png', '.pnm', '.ppm', '.tif',
+        '.tiff', '.webp'
+    ))
+    __dict_FORMATS = {
+        'bmp': ('BMP', '.bmp'), 'gif': ('GIF', '.gif'),
+        'jpeg': ('JPEG', '.jpg'), 'jpg': ('JPEG', '.jpg'),
+        'png': ('PNG', '.png'), 'tiff': ('TIFF', '.tif'),
+        'tif': ('TIFF', '.tif'), 'webp': ('WEBP', '.webp')
+    }
+
+    __source = ''
+    __destination = ''
+    __format = ''
+    __size = None
+    __quality = 0
+    __overwrite = False
+
+    def __init__(self, source, destination, format='', size=None,
+                 quality=90, overwrite=False):
+        """Convert, resize or re-encode a whole directory tree of images.
+
+        ---
+        The tree of the source directory is mirrored into the destination
+        directory. An image whose output is newer than itself is skipped,
+        unless overwrite is set, so a nightly run only converts the new and
+        the modified images.
+
+        ---
+        Parameters:
+        ---
+        source: str
+            -- full path to the directory of the images
+        destination: str
+            -- full path to the directory of the converted images
+
+        Keyword arguments:
+        ---
+        format: str
+            -- output format, e.g. 'jpeg', 'png' or 'webp', the format of
+               every image is kept if it is an empty string (default ' ')
+        size: tuple[int, int]
+            -- the images are shrunk to fit in this width and height, keeping
+               their aspect ratio, None to keep their size (default None)
+        quality: int
+            -- quality of the JPEG and WebP outputs (default 90)
+        overwrite: bool
+            -- convert the images even if their output is newer (default
+               False)
+
+        Raises:
+        ---
+        ValueError
+        """
+        self.__source = source.replace('\\', '/').rstrip('/')
+        self.__destination = destination.replace('\\', '/').rstrip('/')
+        if len(format) > 0 and format.lower() not in self.__dict_FORMATS:
+            raise ValueError(f"'{format}' is not a supported format, "
+                             f"supported formats are: "
+                             f"{sorted(self.__dict_FORMATS.keys())}")
+        self.__format = format.lower()
+        self.__size = size
+        self.__quality = quality
+        self.__overwrite = overwrite
+
+    def get_jobs(self):
+        """Walk the source directory for the images to convert.
+
+        ---
+        Returns:
+        ---
+        : Iterator[tuple]
+            -- one job per image, see convert_image, the images whose
+               output is up to date are left out
+        """
+        for directory, list_directories, list_files in \
+                os_walk(self.__source):
+            list_directories.sort()
+            relative = os_path_relpath(directory, self.__source)
+            relative = '' if relative == '.' else \
+                f"/{relative.replace(chr(92), '/')}"
+            for name in sorted(list_files):
+                stem, extension = os_path_splitext(name)
+                if extension.lower() not in self.__EXTENSIONS:
+                    continue
+                if len(self.__format) > 0:
+                    format, extension = self.__dict_FORMATS[self.__format]
+                else:
+                    format = ''
+                source = f"{directory.replace(chr(92), '/')}/{name}"
+                destination = f"{self.__destination}{relative}/{stem}"\
+                              f"{extension}"
+                if not self.__overwrite and \
+                   not is_outdated(source, destination):
+                    continue
+                yield (source, destination, format, self.__size,
+                       self.__quality)
+
+    def run(self, workers=None, chunksize=64, callback=None):
+        """Convert the images in a pool of processes.
+
+        ---
+        The jobs are handed to the processes in chunks, so the cost of
+        scheduling is paid once per chunk and not once per image.
+
+        ---
+        Keyword arguments:
+        ---
+        workers: int
+            -- number of processes, the number of processors if None
+               (default None)
+        chunksize: int
+            -- number of images handed to a process at once (default 64)
+        callback: Callable[[str, str | None, dict], None]
+            -- called with the path of every image, the error message or
+               None, and the counters so far (default None)
+
+        Returns:
+        ---
+        : dict[str, int | float]
+            -- 'converted', 'failed', 'bytes' (written) and 'seconds'
+        """
+        dict_stats = {'converted': 0, 'failed': 0, 'bytes': 0,
+                      'seconds': 0.0}
+        start = perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for source, error, size in executor.map(
+                    convert_image, self.get_jobs(),
+                    chunksize=max(1, chunksize)):
+                if error is None:
+                    dict_stats['converted'] += 1
+                    dict_stats['bytes'] += size
+                else:
+                    dict_stats['failed'] += 1
+                dict_stats['seconds'] = perf_counter() - start
+                if callback is None:
+                    continue
+                try:
+                    callback(source, error, dict_stats)
+                except Exception as e:
+                    print(f"ERROR: {e}. In the batch callback.",
+                          file=sys_stderr)
+        dict_stats['seconds'] = perf_counter() - start
+        return dict_stats
+
+    def __str__(self):
+        """Evaluates to the source and the destination directories"""
+        return f'"{self.__source}" -> "{self.__destination}"'
+
+
+def is_outdated(source, destination):
+    """Checks if the output of an image is missing or older than the image.
+
+    ---
+    Parameters:
+    ---
+    source: str
+        -- full path to the image
+    destination: str
+        -- full path to the converted image
+
+    Returns:
+    ---
+    : bool
+        -- True if the image has to be converted, False otherwise
+    """
+    try:
+        return os_stat(destination).st_mtime_ns < os_stat(source).st_mtime_ns
+    except OSError:
+        return True
+
+
+def convert_image(job):
+    """Convert one image, in a process of the pool.
+
+    ---
+    The image is decoded at a reduced resolution when the codec can do it,
+    see reduce_image, and the encoder writes straight to a temporary file
+    next to the output, which then replaces the output. Nothing but the
+    pixels is held in memory and a failed conversion leaves no partial
+    output.
+
+    ---
+    Parameters:
+    ---
+    job: tuple[str, str, str, tuple[int, int] | None, int]
+        -- full path to the image, full path to the output, output format
+           ('' to keep the format of the image), size to fit in and quality
+
+    Returns:
+    ---
+    : tuple[str, str | None, int]
+        -- full path to the image, the error message or None, and the
+           number of bytes written
+    """
+    from PIL import Image
+    from imageviewer.decoder.decoder import reduce_image
+
+    source, destination, format, size, quality = job
+    temporary = f"{destination}.tmp"
+    try:
+        with Image.open(source) as image:
+            format = format or image.format
+            if size is not None:
+                reduce_image(image, size)
+                image.thumbnail(size)
+            else:
+                image.load()
+            if format == 'JPEG' and image.mode not in ('L', 'RGB', 'CMYK'):
+                image = image.convert('RGB')
+            elif image.mode == 'P' and format not in ('GIF', 'PNG', 'BMP',
+                                                      'TIFF'):
+                image = image.convert('RGBA')
+            os_makedirs(os_path_dirname(destination), exist_ok=True)
+            dict_options = {}
+            if format in ('JPEG', 'WEBP'):
+                dict_options['quality'] = quality
+            with open(file=temporary, mode='wb') as file:
+                image.save(file, format=format, **dict_options)
+                written = file.tell()
+        os_replace(temporary, destination)
+        return source, None, written
+    except Exception as e:
+        try:
+            os_remove(temporary)
+        except OSError:
+            pass
+        return source, str(e), 0
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Batch - Converts the images of a directory tree.\n"
+        "Copyright:\n"
+        "    imageviewer::batch  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # b = Batch('D:/Pictures', 'D:/Pictures (small)', format='webp',
+    #           size=(1920, 1080))
+    # print(b)
+    # print(b.run(callback=lambda path, error, stats: print(path, error)))
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
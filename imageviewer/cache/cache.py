@@ -0,0 +1,282 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class Cache:
+
+    __budget = 0
+    __size = None
+    __dict_entries = None
+    __pinned = set()
+    __bytes = 0
+    __peak = 0
+    __dict_stats = {}
+    __lock = None
+
+    def __init__(self, budget, size=None):
+        """A least recently used cache of decoded images, bounded in bytes.
+
+        ---
+        When an image is put and the images exceed the budget, the least
+        recently used ones are evicted until they fit again. Pinned images,
+        like the displayed one, are never evicted, and an image larger than
+        the whole budget is not cached unless it is pinned.
+
+        ---
+        Parameters:
+        ---
+        budget: int
+            -- maximum number of bytes of the cached images
+
+        Keyword arguments:
+        ---
+        size: Callable[[Any], int]
+            -- gets the number of bytes of an image, see get_size (default
+               None)
+        """
+        self.__budget = max(0, budget)
+        self.__size = size if size is not None else get_size
+        self.__dict_entries = OrderedDict()
+        self.__pinned = set()
+        self.__bytes = 0
+        self.__peak = 0
+        self.__dict_stats = {'hits': 0, 'misses': 0, 'evictions': 0,
+                             'evicted_bytes': 0, 'rejections': 0}
+        self.__lock = Lock()
+
+    def get(self, key):
+        """Get an image and mark it as the most recently used.
+
+        ---
+        Parameters:
+        ---
+        key: Hashable
+            -- key of the image, e.g. its full path
+
+        Returns:
+        ---
+        : Any | None
+            -- the image, None if it is not cached
+        """
+        with self.__lock:
+            entry = self.__dict_entries.get(key)
+            if entry is None:
+                self.__dict_stats['misses'] += 1
+                return None
+            self.__dict_entries.move_to_end(key)
+            self.__dict_stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key, image, size=None):
+        """Cache an image as the most recently used.
+
+        ---
+        Parameters:
+        ---
+        key: Hashable
+            -- key of the image, e.g. its full path
+        image: Any
+            -- the decoded image
+
+        Keyword arguments:
+        ---
+        size: int
+            -- number of bytes of the image, measured if None (default None)
+
+        Returns:
+        ---
+        : bool
+            -- True if the image was cached, False if it is too large
+        """
+        if size is None:
+            size = self.__size(image)
+        with self.__lock:
+            self.__remove(key)
+            if size > self.__budget and key not in self.__pinned:
+                self.__dict_stats['rejections'] += 1
+                return False
+            self.__dict_entries[key] = (image, size)
+            self.__bytes += size
+            self.__peak = max(self.__peak, self.__bytes)
+            self.__evict()
+            return True
+
+    def remove(self, key):
+        """Remove an image, if it is cached.
+
+        ---
+        Parameters:
+        ---
+        key: Hashable
+            -- key of the image
+        """
+        with self.__lock:
+            self.__remove(key)
+
+    def clear(self):
+        """Remove all the images, the pins are kept."""
+        with self.__lock:
+            self.__dict_entries.clear()
+            self.__bytes = 0
+
+    def pin(self, key):
+        """Pin an image, cached or not, so it is never evicted.
+
+        ---
+        Parameters:
+        ---
+        key: Hashable
+            -- key of the image
+        """
+        with self.__lock:
+            self.__pinned.add(key)
+
+    def unpin(self, key):
+        """Unpin an image, and evict the images exceeding the budget.
+
+        ---
+        Parameters:
+        ---
+        key: Hashable
+            -- key of the image
+        """
+        with self.__lock:
+            self.__pinned.discard(key)
+            self.__evict()
+
+    def set_budget(self, budget):
+        """Set the budget, and evict the images exceeding it.
+
+        ---
+        Parameters:
+        ---
+        budget: int
+            -- maximum number of bytes of the cached images
+        """
+        with self.__lock:
+            self.__budget = max(0, budget)
+            self.__evict()
+
+    def get_budget(self):
+        """Get the maximum number of bytes of the cached images"""
+        return self.__budget
+
+    def get_stats(self):
+        """Get the occupancy and the counters of the cache.
+
+        ---
+        Returns:
+        ---
+        : dict[str, int]
+            -- 'budget', 'bytes', 'peak_bytes', 'entries', 'pinned', 'hits',
+               'misses', 'evictions', 'evicted_bytes' and 'rejections'
+        """
+        with self.__lock:
+            stats = {'budget': self.__budget,
+                     'bytes': self.__bytes,
+                     'peak_bytes': self.__peak,
+                     'entries': len(self.__dict_entries),
+                     'pinned': len(self.__pinned)}
+            stats.update(self.__dict_stats)
+            return stats
+
+    def __contains__(self, key):
+        """Checks if an image is cached, without marking it as used"""
+        return key in self.__dict_entries
+
+    def __len__(self):
+        """Evaluates to the number of cached images"""
+        return len(self.__dict_entries)
+
+    def __remove(self, key):
+        """Remove an image, the lock must be held"""
+        entry = self.__dict_entries.pop(key, None)
+        if entry is not None:
+            self.__bytes -= entry[1]
+
+    def __evict(self):
+        """Evict the least recently used images that are not pinned until
+           the images fit in the budget, the lock must be held
+        """
+        if self.__bytes <= self.__budget:
+            return
+        for key in list(self.__dict_entries.keys()):
+            if self.__bytes <= self.__budget:
+                break
+            if key in self.__pinned:
+                continue
+            size = self.__dict_entries.pop(key)[1]
+            self.__bytes -= size
+            self.__dict_stats['evictions'] += 1
+            self.__dict_stats['evicted_bytes'] += size
+
+    def __str__(self):
+        """Evaluates to the occupancy of the cache"""
+        return f"{len(self.__dict_entries)} image(s), {self.__bytes} of "\
+               f"{self.__budget} bytes"
+
+
+def get_size(image):
+    """Get the number of bytes of a decoded image.
+
+    ---
+    Parameters:
+    ---
+    image: PIL.Image.Image | numpy.ndarray | bytes | bytearray | memoryview
+        -- the decoded image
+
+    Returns:
+    ---
+    : int
+        -- the number of bytes of its pixels, 0 if it is not known
+    """
+    nbytes = getattr(image, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(image, (bytes, bytearray)):
+        return len(image)
+    size = getattr(image, 'size', None)
+    mode = getattr(image, 'mode', None)
+    if isinstance(size, tuple) and isinstance(mode, str):
+        bands = len(image.getbands())
+        depth = 4 if mode in ('I', 'F') or mode.startswith('I;32') else\
+            2 if mode.startswith('I;16') else 1
+        return size[0] * size[1] * max(1, bands) * depth
+    return 0
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Cache - Caches the decoded images.\n"
+        "Copyright:\n"
+        "    imageviewer::cache  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # c = Cache(64 * 1024 * 1024)
+    # c.put('D:/Pictures/1.jpg', bytearray(40 * 1024 * 1024))
+    # c.pin('D:/Pictures/1.jpg')
+    # c.put('D:/Pictures/2.jpg', bytearray(40 * 1024 * 1024))
+    # print(c, c.get_stats())
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
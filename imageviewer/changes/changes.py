@@ -0,0 +1,136 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+ADDED = 'added'
+CHANGED = 'changed'
+REMOVED = 'removed'
+
+
+def flatten(dict_nested, prefix=''):
+    """Flatten a nested dict into a dict of dotted keys.
+
+    ---
+    E.g. {'statusbar': {'bar': {'background': '#ffffff'}}} becomes
+    {'statusbar.bar.background': '#ffffff'}.
+
+    ---
+    Parameters:
+    ---
+    dict_nested: dict
+        -- a dict of dicts and values
+
+    Keyword arguments:
+    ---
+    prefix: str
+        -- prefix of all the keys (default '')
+
+    Returns:
+    ---
+    : dict[str, Any]
+        -- a flat dict of dotted keys and values
+    """
+    dict_flat = {}
+    for key, value in dict_nested.items():
+        if isinstance(value, dict):
+            dict_flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            dict_flat[f"{prefix}{key}"] = value
+    return dict_flat
+
+
+def diff(dict_old, dict_new):
+    """Compare two flat dicts.
+
+    ---
+    Parameters:
+    ---
+    dict_old: dict
+        -- the previously applied dict
+    dict_new: dict
+        -- the newly parsed dict
+
+    Returns:
+    ---
+    : list[tuple[Any, str]]
+        -- the (key, action) pairs of all the keys that were added, changed
+           or removed, action being ADDED, CHANGED or REMOVED
+    """
+    changes = []
+    for key, value in dict_new.items():
+        if key not in dict_old:
+            changes.append((key, ADDED))
+        elif dict_old[key] != value:
+            changes.append((key, CHANGED))
+    for key in dict_old.keys() - dict_new.keys():
+        changes.append((key, REMOVED))
+    return changes
+
+
+def apply(dict_nested, dict_flat, changes):
+    """Apply the changes of diff to a nested dict, in place.
+
+    ---
+    The removed keys are applied first, so a value that became a dict (or
+    the other way round) is replaced and not removed afterwards.
+
+    ---
+    Parameters:
+    ---
+    dict_nested: dict
+        -- the dict the old flat dict was flattened from
+    dict_flat: dict
+        -- the new flat dict, see flatten
+    changes: list[tuple[str, str]]
+        -- the (key, action) pairs returned by diff
+    """
+    for key, action in sorted(changes, key=lambda change:
+                              change[1] != REMOVED):
+        *parents, leaf = key.split('.')
+        node = dict_nested
+        for parent in parents:
+            child = node.get(parent)
+            if not isinstance(child, dict):
+                if action == REMOVED:
+                    break
+                child = node[parent] = {}
+            node = child
+        else:
+            if action == REMOVED:
+                node.pop(leaf, None)
+            else:
+                node[leaf] = dict_flat[key]
+
+
+def describe(change):
+    """Describe a change reported by a reload.
+
+    ---
+    Parameters:
+    ---
+    change: tuple[str, str, str, str]
+        -- the (kind, name, key, action) of the change, e.g.
+           ('theme', 'Dark', 'statusbar.bar.background', 'changed')
+
+    Returns:
+    ---
+    : str
+        -- e.g. "theme Dark / statusbar.bar.background changed", or
+           "theme Dark removed" if the key is empty
+    """
+    kind, name, key, action = change
+    if len(key) == 0:
+        return f"{kind} {name} {action}"
+    return f"{kind} {name} / {key} {action}"
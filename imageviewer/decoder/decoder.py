@@ -0,0 +1,387 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from sys import stderr as sys_stderr
+
+
+class Decoder:
+
+    __decode = None
+    __cache = None
+    __workers = 0
+    __prefetch = 0
+    __executor = None
+    __size = None
+    __paths = []
+    __index = -1
+    __key = None
+    __dict_futures = {}
+    __dict_stats = {}
+
+    def __init__(self, workers=2, prefetch=1, decode=None, cache=None,
+                 size=None):
+        """Decode images on a pool of worker threads.
+
+        ---
+        The image shown with show is decoded first, then the next and the
+        previous images up to the prefetch depth, so they are most likely
+        decoded already when the user navigates to them. The images outside
+        that window are dropped, unless a cache is given: the decoded images
+        are then put into it, and the shown image is pinned in it.
+        While a size is set the images are decoded at a reduced resolution
+        not smaller than it, where the format allows it (see decode_image).
+
+        ---
+        Keyword arguments:
+        ---
+        workers: int
+            -- number of worker threads (default 2)
+        prefetch: int
+            -- number of images decoded ahead on each side (default 1)
+        decode: Callable[[str, tuple[int, int] | None], Any]
+            -- decodes the image at a full path for a size, see decode_image
+               (default None)
+        cache: Cache
+            -- cache of the decoded images, keyed by (full path, size)
+               (default None)
+        size: tuple[int, int]
+            -- width and height of the image view, see set_size (default
+               None)
+        """
+        self.__decode = decode if decode is not None else decode_image
+        self.__cache = cache
+        self.__workers = max(1, workers)
+        self.__prefetch = max(0, prefetch)
+        self.__executor = ThreadPoolExecutor(max_workers=self.__workers,
+                                             thread_name_prefix='ImageViewer'
+                                                                '::Decoder')
+        self.__size = None
+        self.__paths = []
+        self.__index = -1
+        self.__key = None
+        self.__dict_futures = {}
+        self.__dict_stats = {'hits': 0, 'waits': 0, 'misses': 0,
+                             'prefetches': 0, 'drops': 0}
+        self.set_size(size)
+
+    def set_size(self, size):
+        """Set the size the images are decoded for.
+
+        ---
+        The shown image is not decoded again, show it again to do so.
+
+        ---
+        Parameters:
+        ---
+        size: tuple[int, int] | None
+            -- width and height of the image view, None to always decode at
+               full resolution
+        """
+        if size is not None:
+            size = (max(1, int(size[0])), max(1, int(size[1])))
+        self.__size = size
+
+    def get_size(self):
+        """Get the size the images are decoded for, None if full size"""
+        return self.__size
+
+    def set_paths(self, paths, index=-1):
+        """Set the images to navigate through.
+
+        ---
+        The decoded images that are still in the new list are kept.
+
+        ---
+        Parameters:
+        ---
+        paths: list[str]
+            -- full paths of the images, in navigation order
+
+        Keyword arguments:
+        ---
+        index: int
+            -- index of the image to be shown, none if -1 (default -1)
+        """
+        if self.__cache is not None and self.__key is not None:
+            self.__cache.unpin(self.__key)
+        self.__key = None
+        self.__paths = list(paths)
+        self.__index = -1
+        if 0 <= index < len(self.__paths):
+            self.show(index)
+        else:
+            self.__drop(set())
+
+    def get_paths(self):
+        """Get the images to navigate through.
+
+        ---
+        Returns:
+        ---
+        : list[str]
+            -- full paths of the images, in navigation order
+        """
+        return self.__paths
+
+    def show(self, index, full=False):
+        """Get the image at an index and prefetch its neighbours.
+
+        ---
+        Parameters:
+        ---
+        index: int
+            -- index of the image in the paths, wrapped around
+
+        Keyword arguments:
+        ---
+        full: bool
+            -- decode the image at full resolution, e.g. when it is zoomed
+               past 100% (default False)
+
+        Returns:
+        ---
+        : Future | None
+            -- the future of the decoded image, None if there are no paths.
+               Its result raises the error of the decoding, if any.
+        """
+        if len(self.__paths) == 0:
+            return None
+        index %= len(self.__paths)
+        key = (self.__paths[index], None if full else self.__size)
+        future = self.__dict_futures.get(key)
+        image = None
+        if self.__cache is not None:
+            self.__cache.pin(key)
+            if self.__key is not None and self.__key != key:
+                self.__cache.unpin(self.__key)
+            if future is None:
+                image = self.__cache.get(key)
+        self.__index = index
+        self.__key = key
+        if image is not None:
+            self.__dict_stats['hits'] += 1
+            future = Future()
+            future.set_result(image)
+        elif future is None:
+            self.__dict_stats['misses'] += 1
+            future = self.__submit(key)
+        elif future.done():
+            self.__dict_stats['hits'] += 1
+        else:
+            self.__dict_stats['waits'] += 1
+        window = {key}
+        for distance in range(1, self.__prefetch + 1):
+            for neighbour in (index + distance, index - distance):
+                key = (self.__paths[neighbour % len(self.__paths)],
+                       self.__size)
+                if key not in window:
+                    window.add(key)
+                    if key not in self.__dict_futures and \
+                       (self.__cache is None or key not in self.__cache):
+                        self.__dict_stats['prefetches'] += 1
+                        self.__submit(key)
+        self.__drop(window)
+        return future
+
+    def next(self):
+        """Show the next image, see show"""
+        return self.show(self.__index + 1)
+
+    def previous(self):
+        """Show the previous image, see show"""
+        return self.show(self.__index - 1)
+
+    def get_index(self):
+        """Get the index of the shown image, -1 if none is shown"""
+        return self.__index
+
+    def get_stats(self):
+        """Get the counters of the decoder.
+
+        ---
+        Returns:
+        ---
+        : dict[str, int]
+            -- 'hits' (shown images already decoded), 'waits' (shown images
+               still being prefetched), 'misses' (shown images not
+               prefetched), 'prefetches' and 'drops' (images dropped from the
+               prefetch window)
+        """
+        return dict(self.__dict_stats)
+
+    def get_hit_rate(self):
+        """Get the fraction of the shown images that were prefetched.
+
+        ---
+        Returns:
+        ---
+        : float
+            -- (hits + waits) / shown images, 0.0 if none was shown
+        """
+        shown = self.__dict_stats['hits'] + self.__dict_stats['waits'] +\
+            self.__dict_stats['misses']
+        if shown == 0:
+            return 0.0
+        return (self.__dict_stats['hits'] + self.__dict_stats['waits']) / shown
+
+    def close(self):
+        """Cancel the pending decodings and stop the worker threads."""
+        self.__drop(set())
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+
+    def __submit(self, key):
+        """Start decoding an image for a size"""
+        future = self.__executor.submit(self.__decode, key[0], key[1])
+        self.__dict_futures[key] = future
+        if self.__cache is not None:
+            future.add_done_callback(lambda done: self.__put(key, done))
+        return future
+
+    def __put(self, key, future):
+        """Put a decoded image into the cache"""
+        if not future.cancelled() and future.exception() is None:
+            self.__cache.put(key, future.result())
+
+    def __drop(self, window):
+        """Drop the images outside of the window"""
+        for key in [key for key in self.__dict_futures if key not in window]:
+            self.__dict_futures.pop(key).cancel()
+            self.__dict_stats['drops'] += 1
+
+    def __str__(self):
+        """Evaluates to the workers, prefetch depth and hit rate"""
+        return f"{self.__workers} worker(s), prefetch {self.__prefetch}, "\
+               f"hit rate {self.get_hit_rate():.2f}"
+
+
+def decode_image(path, size=None):
+    """Decode an image with Pillow, at a reduced resolution if possible.
+
+    ---
+    Pillow is imported only when the first image is decoded. For a size the
+    image is decoded at the smallest resolution not smaller than it that the
+    format gives cheaply: JPEG is scaled by 1/2, 1/4 or 1/8 while decoding,
+    JPEG 2000 decodes fewer resolution levels and a multi-page TIFF pyramid
+    uses its smallest fitting page. Other formats are decoded at full
+    resolution.
+
+    ---
+    Parameters:
+    ---
+    path: str
+        -- full path to the image
+
+    Keyword arguments:
+    ---
+    size: tuple[int, int]
+        -- width and height the image is shown at, None for full resolution
+           (default None)
+
+    Returns:
+    ---
+    : PIL.Image.Image
+        -- the decoded image
+
+    Raises:
+    ---
+    ImportError, OSError and PIL.UnidentifiedImageError
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        print(f"ERROR: {e}. Pillow is needed to decode the images.",
+              file=sys_stderr)
+        raise
+    image = Image.open(path)
+    if size is None:
+        image.load()
+        return image
+    try:
+        reduce_image(image, size)
+        image.load()
+    except OSError:
+        image.close()
+        image = Image.open(path)
+        image.load()
+    return image
+
+
+def reduce_image(image, size):
+    """Ask the codec of an opened, not loaded image for a reduced resolution.
+
+    ---
+    Parameters:
+    ---
+    image: PIL.Image.Image
+        -- the image, as returned by PIL.Image.open
+    size: tuple[int, int]
+        -- width and height the image is shown at
+
+    Returns:
+    ---
+    : tuple[int, int]
+        -- the size the image will be decoded at
+    """
+    width, height = size
+    if image.format == 'JPEG':
+        image.draft(image.mode, (width, height))
+    elif image.format == 'JPEG2000':
+        factor = min(image.width // width, image.height // height)
+        levels = min(max(0, factor.bit_length() - 1), 5)
+        if levels > 0:
+            image.reduce = levels
+            return (-(-image.width // (1 << levels)),
+                    -(-image.height // (1 << levels)))
+    elif image.format == 'TIFF' and getattr(image, 'n_frames', 1) > 1:
+        best = (0, image.width * image.height)
+        ratio = image.width / max(1, image.height)
+        for frame in range(1, image.n_frames):
+            image.seek(frame)
+            if image.width >= width and image.height >= height and \
+               abs(image.width / max(1, image.height) - ratio) < 0.02 and \
+               image.width * image.height < best[1]:
+                best = (frame, image.width * image.height)
+        image.seek(best[0])
+    return image.size
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Decoder - Decodes the images in the background.\n"
+        "Copyright:\n"
+        "    imageviewer::decoder  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # from imageviewer.cache.cache import Cache
+    #
+    # d = Decoder(workers=2, prefetch=1, cache=Cache(512 * 1024 * 1024))
+    # d.set_paths(['D:/Pictures/1.jpg', 'D:/Pictures/2.jpg',
+    #              'D:/Pictures/3.jpg'], 0)
+    # d.set_size((1920, 1080))
+    # print(d.show(0).result().size)
+    # print(d.show(0, full=True).result().size)
+    # print(d.next().result().size)
+    # print(d.get_stats())
+    # d.close()
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
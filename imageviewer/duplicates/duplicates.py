@@ -0,0 +1,491 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from os import makedirs as os_makedirs
+from os import walk as os_walk
+from os import stat as os_stat
+from os.path import abspath as os_path_abspath
+from os.path import splitext as os_path_splitext
+from sqlite3 import connect as sqlite3_connect
+from sqlite3 import Error as SqliteError
+from sys import stderr as sys_stderr
+
+
+class Duplicates:
+
+    __DATABASE_FILE = 'duplicates.sqlite'
+    __VERSION = 1
+    __SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS hashes ("
+        " path TEXT PRIMARY KEY,"
+        " size INTEGER NOT NULL,"
+        " mtime INTEGER NOT NULL,"
+        " dhash INTEGER,"
+        " phash INTEGER)",
+    )
+    __KINDS = ('dhash', 'phash')
+    __BATCH = 256
+    __EXTENSIONS = frozenset((
+        '.bmp', '.dib', '.gif', '.ico', '.j2k', '.jp2', '.jpe', '.jpeg',
+        '.jpg', '.jpx', '.pbm', '.pgm', '.png', '.pnm', '.ppm', '.tif',
+        '.tiff', '.webp'
+    ))
+
+    __path = ''
+    __connection = None
+
+    def __init__(self, paths):
+        """Find the duplicate and near duplicate images of a directory tree.
+
+        ---
+        The perceptual hashes (dHash and pHash, 64 bits each) of the images
+        are kept in a SQLite database in the profile directory, keyed by
+        absolute path, so only the new and the changed images are hashed
+        again (see update). The images are then matched over the Hamming
+        distance of their hashes by multi-index hashing (see find), instead
+        of comparing every pair.
+
+        ---
+        Parameters:
+        ---
+        paths: Paths
+            -- the user paths, the hashes are in the profile directory
+
+        Raises:
+        ---
+        sqlite3.Error
+        """
+        path = paths.get_profile_path()
+        self.__path = f"{path}/{self.__DATABASE_FILE}"
+        os_makedirs(path, exist_ok=True)
+        self.__connection = sqlite3_connect(self.__path, timeout=10.0)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute('PRAGMA synchronous=NORMAL')
+        version, = self.__connection.execute(
+            'PRAGMA user_version').fetchone()
+        if version != self.__VERSION:
+            with self.__connection:
+                self.__connection.execute('DROP TABLE IF EXISTS hashes')
+                for statement in self.__SCHEMA:
+                    self.__connection.execute(statement)
+                self.__connection.execute(
+                    f'PRAGMA user_version={self.__VERSION}')
+
+    def close(self):
+        """Close the database of the hashes."""
+        self.__connection.close()
+
+    def update(self, directory, workers=None, chunksize=64, callback=None):
+        """Hash the new and the changed images of a directory tree.
+
+        ---
+        The images are hashed in a pool of processes, handed out in chunks,
+        and the hashes are written in batches. The hashes of the removed
+        images are dropped.
+
+        ---
+        Parameters:
+        ---
+        directory: str
+            -- full path to the directory
+
+        Keyword arguments:
+        ---
+        workers: int
+            -- number of processes, the number of processors if None
+               (default None)
+        chunksize: int
+            -- number of images handed to a process at once (default 64)
+        callback: Callable[[int, int], None]
+            -- called with the number of hashed images and the number of
+               images to hash after every batch (default None)
+
+        Returns:
+        ---
+        : int
+            -- the number of hashed images
+        """
+        directory = os_path_abspath(directory)
+        known = dict((path, (size, mtime)) for path, size, mtime in
+                     self.__select('path, size, mtime', directory))
+        list_paths = []
+        seen = set()
+        for path in self.__walk(directory):
+            seen.add(path)
+            try:
+                stat = os_stat(path)
+            except OSError:
+                continue
+            if known.get(path) != (stat.st_size, stat.st_mtime_ns):
+                list_paths.append(path)
+        removed = [(path,) for path in known if path not in seen]
+        rows = []
+        done = 0
+        try:
+            if len(list_paths) > 0:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for row in executor.map(hash_image, list_paths,
+                                            chunksize=max(1, chunksize)):
+                        done += 1
+                        if row is not None:
+                            rows.append(row)
+                        if len(rows) >= self.__BATCH:
+                            self.__write(rows, removed)
+                            rows, removed = [], []
+                            self.__call(callback, done, len(list_paths))
+            self.__write(rows, removed)
+            self.__call(callback, done, len(list_paths))
+        except SqliteError as e:
+            print(f"ERROR: {e}. Could not write the hashes of "
+                  f"'{directory}'.", file=sys_stderr)
+        return done
+
+    def find(self, directory, distance=4, kind='phash'):
+        """Find the groups of duplicate and near duplicate images.
+
+        ---
+        The images with equal hashes are grouped first, then the pairs of
+        hashes within the distance are found by multi-index hashing (see
+        get_pairs), and their groups are merged. Call update before, to hash
+        the images.
+
+        ---
+        Parameters:
+        ---
+        directory: str
+            -- full path to the directory, its subdirectories are included
+
+        Keyword arguments:
+        ---
+        distance: int
+            -- maximum number of different bits of two near duplicates, 0
+               for identical hashes only (default 4)
+        kind: str
+            -- 'dhash' or 'phash' (default 'phash')
+
+        Returns:
+        ---
+        : list[list[str]]
+            -- the full paths to the images of every group, largest groups
+               first
+
+        Raises:
+        ---
+        ValueError
+        """
+        if kind not in self.__KINDS:
+            raise ValueError(f"'{kind}' is not a valid kind of hash")
+        dict_groups = {}
+        for path, value in self.__select(f'path, {kind}',
+                                         os_path_abspath(directory)):
+            if value is not None:
+                dict_groups.setdefault(value & 0xFFFFFFFFFFFFFFFF,
+                                       []).append(path)
+        values = list(dict_groups.keys())
+        parents = list(range(len(values)))
+
+        def get_root(index):
+            """Find the group of a hash, halving the path"""
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        if distance > 0 and len(values) > 1:
+            for first, second in zip(*get_pairs(values, distance)):
+                parents[get_root(int(first))] = get_root(int(second))
+        dict_merged = {}
+        for index, value in enumerate(values):
+            dict_merged.setdefault(get_root(index), []).extend(
+                dict_groups[value])
+        groups = [sorted(group) for group in dict_merged.values()
+                  if len(group) > 1]
+        groups.sort(key=lambda group: (-len(group), group[0]))
+        return groups
+
+    def get(self, path):
+        """Get the stored hashes of an image.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+
+        Returns:
+        ---
+        : tuple[int, int] | None
+            -- the dHash and the pHash, None if the image is not hashed
+        """
+        row = self.__connection.execute(
+            'SELECT dhash, phash FROM hashes WHERE path = ?',
+            (os_path_abspath(path),)).fetchone()
+        if row is None:
+            return None
+        return tuple(None if value is None else value & 0xFFFFFFFFFFFFFFFF
+                     for value in row)
+
+    def __len__(self):
+        """Evaluates to the number of hashed images"""
+        return self.__connection.execute(
+            'SELECT COUNT(*) FROM hashes').fetchone()[0]
+
+    def __select(self, columns, directory):
+        """Select columns of the hashes of a directory tree"""
+        directory = directory.rstrip('/\\')
+        separator = '\\' if '\\' in directory else '/'
+        return self.__connection.execute(
+            f"SELECT {columns} FROM hashes WHERE path > ? AND path < ?",
+            (f"{directory}{separator}",
+             f"{directory}{chr(ord(separator) + 1)}"))
+
+    def __walk(self, directory):
+        """List the images of a directory tree"""
+        for path, list_directories, list_files in os_walk(directory):
+            for name in list_files:
+                if os_path_splitext(name)[1].lower() in self.__EXTENSIONS:
+                    yield f"{path}/{name}" if '\\' not in path else \
+                        f"{path}\\{name}"
+
+    def __write(self, rows, removed):
+        """Write a batch of hashes and drop the removed images in one
+           transaction
+        """
+        with self.__connection:
+            self.__connection.executemany('DELETE FROM hashes WHERE path = ?',
+                                          removed)
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO hashes (path, size, mtime, dhash, "
+                "phash) VALUES (?, ?, ?, ?, ?)", rows)
+
+    @staticmethod
+    def __call(callback, done, total):
+        """Call the progress callback"""
+        if callback is None:
+            return
+        try:
+            callback(done, total)
+        except Exception as e:
+            print(f"ERROR: {e}. In the duplicates callback.", file=sys_stderr)
+
+    def __str__(self):
+        """Evaluates to the path of the database of the hashes"""
+        return f'"{self.__path}"'
+
+
+def get_pairs(values, distance):
+    """Find the pairs of hashes within a Hamming distance.
+
+    ---
+    The hashes are split into distance + 1 chunks of bits, and two hashes
+    within the distance have at least one equal chunk. So for every chunk
+    the hashes are sorted by it, and only the hashes with an equal chunk,
+    which are next to each other, are compared, with NumPy. Every pair
+    sharing more than one chunk is found more than once.
+
+    ---
+    Parameters:
+    ---
+    values: list[int]
+        -- the hashes, 64 bits each, all different
+    distance: int
+        -- maximum number of different bits
+
+    Returns:
+    ---
+    : tuple[numpy.ndarray, numpy.ndarray]
+        -- the indexes of the first and of the second hash of every pair
+    """
+    import numpy as np
+
+    hashes = np.array(values, dtype=np.uint64)
+    chunks = min(distance + 1, 64)
+    bounds = [64 * chunk // chunks for chunk in range(chunks + 1)]
+    firsts, seconds = [], []
+    for low, high in zip(bounds[:-1], bounds[1:]):
+        mask = np.uint64((1 << (high - low)) - 1)
+        keys = (hashes >> np.uint64(low)) & mask
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        active = np.arange(len(order) - 1)
+        offset = 1
+        while len(active) > 0:
+            active = active[keys[active] == keys[active + offset]]
+            if len(active) == 0:
+                break
+            near = get_distances(hashes[order[active]],
+                                 hashes[order[active + offset]]) <= distance
+            firsts.append(order[active[near]])
+            seconds.append(order[active[near] + offset])
+            active = active[active + offset + 1 < len(order)]
+            offset += 1
+    if len(firsts) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def get_distances(first, second):
+    """Get the Hamming distances of two arrays of hashes.
+
+    ---
+    Parameters:
+    ---
+    first: numpy.ndarray
+        -- hashes, as numpy.uint64
+    second: numpy.ndarray
+        -- other hashes, as numpy.uint64
+
+    Returns:
+    ---
+    : numpy.ndarray
+        -- the number of different bits of every two hashes
+    """
+    import numpy as np
+
+    different = first ^ second
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(different)
+    return get_bits()[different.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+@lru_cache(maxsize=1)
+def get_bits():
+    """Get the number of set bits of every byte, for NumPy < 2.0"""
+    import numpy as np
+
+    return np.array([bin(byte).count('1') for byte in range(256)],
+                    dtype=np.uint8)
+
+
+@lru_cache(maxsize=4)
+def get_dct(size):
+    """Get the matrix of the orthonormal DCT-II of a size.
+
+    ---
+    Parameters:
+    ---
+    size: int
+        -- number of samples
+
+    Returns:
+    ---
+    : numpy.ndarray
+        -- the size x size matrix, read-only
+    """
+    import numpy as np
+
+    samples = np.arange(size)
+    matrix = np.cos(np.pi * (2 * samples[None, :] + 1) *
+                    samples[:, None] / (2 * size))
+    matrix *= np.sqrt(2.0 / size)
+    matrix[0] /= np.sqrt(2.0)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def get_hashes(image):
+    """Get the dHash and the pHash of a grayscale image.
+
+    ---
+    The dHash compares every pixel of a 9x8 reduction with its right
+    neighbour, the pHash compares the lowest 8x8 frequencies of the DCT of
+    a 32x32 reduction with their median.
+
+    ---
+    Parameters:
+    ---
+    image: PIL.Image.Image
+        -- the image, in mode 'L'
+
+    Returns:
+    ---
+    : tuple[int, int]
+        -- the dHash and the pHash, 64 bits each
+    """
+    import numpy as np
+    from PIL import Image
+
+    pixels = np.asarray(image.resize((9, 8), Image.BOX), dtype=np.int16)
+    dhash = np.packbits(pixels[:, 1:] > pixels[:, :-1])
+    pixels = np.asarray(image.resize((32, 32), Image.BOX),
+                        dtype=np.float64)
+    dct = get_dct(32)
+    frequencies = (dct @ pixels @ dct.T)[:8, :8].ravel()
+    phash = np.packbits(frequencies > np.median(frequencies[1:]))
+    return (int.from_bytes(dhash.tobytes(), 'big'),
+            int.from_bytes(phash.tobytes(), 'big'))
+
+
+def hash_image(path):
+    """Hash an image, in a process of the pool.
+
+    ---
+    The image is decoded at a reduced resolution when the codec can do it,
+    see reduce_image, since only a 32x32 reduction is hashed.
+
+    ---
+    Parameters:
+    ---
+    path: str
+        -- full path to the image
+
+    Returns:
+    ---
+    : tuple | None
+        -- the path, size, mtime (in nanoseconds), dHash and pHash (as
+           signed 64-bit integers, as SQLite stores them), None if the image
+           could not be read
+    """
+    from PIL import Image
+    from imageviewer.decoder.decoder import reduce_image
+
+    try:
+        stat = os_stat(path)
+        with Image.open(path) as image:
+            reduce_image(image, (64, 64))
+            hashes = get_hashes(image.convert('L'))
+    except Exception as e:
+        print(f"ERROR: {e}. Could not hash '{path}'.", file=sys_stderr)
+        return None
+    return (path, stat.st_size, stat.st_mtime_ns,
+            *(value - (1 << 64) if value >= 1 << 63 else value
+              for value in hashes))
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Duplicates - Finds the duplicate images.\n"
+        "Copyright:\n"
+        "    imageviewer::duplicates  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # from imageviewer.paths.paths import Paths
+    #
+    # d = Duplicates(Paths())
+    # print(d.update('D:/Pictures', callback=lambda done, total: print(
+    #     f"{done}/{total}")))
+    # for group in d.find('D:/Pictures', distance=6):
+    #     print(*group, sep='\n', end='\n\n')
+    # d.close()
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
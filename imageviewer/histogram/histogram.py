@@ -0,0 +1,415 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from math import sqrt
+from sys import stderr as sys_stderr
+from threading import Lock
+
+
+class Histogram:
+
+    __limit = 0
+    __samples = 0
+    __dict_entries = None
+    __pending = set()
+    __dict_queued = None
+    __workers = 0
+    __executor = None
+    __closed = False
+    __dict_stats = {}
+    __lock = None
+
+    def __init__(self, limit=4096, samples=65536, workers=1):
+        """Histograms and pixel statistics of the images, for the statusbar.
+
+        ---
+        The statistics of an image are first computed on a strided subsample,
+        so they can be shown with the image, and then computed exactly by a
+        background thread. Both are cached by the key of the image (the same
+        key as in the Decoder and the Cache), so switching back to an image
+        never computes them again. The statistics are small, so they are
+        kept for many more images than the decoded ones. At most one image
+        per worker waits for its exact statistics, the most recent ones
+        first, the older ones are dropped with their pixels, so flicking
+        through many images does not keep them all alive.
+
+        ---
+        Keyword arguments:
+        ---
+        limit: int
+            -- maximum number of images whose statistics are cached (default
+               4096)
+        samples: int
+            -- about the number of pixels of the subsample (default 65536)
+        workers: int
+            -- number of threads computing the exact statistics (default 1)
+        """
+        self.__limit = max(1, limit)
+        self.__samples = max(1, samples)
+        self.__dict_entries = OrderedDict()
+        self.__pending = set()
+        self.__dict_queued = OrderedDict()
+        self.__workers = max(1, workers)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.__workers,
+            thread_name_prefix='ImageViewer::Histogram')
+        self.__closed = False
+        self.__dict_stats = {'hits': 0, 'sampled': 0, 'refined': 0,
+                             'dropped': 0}
+        self.__lock = Lock()
+
+    def get(self, key, image, callback=None):
+        """Get the statistics of an image.
+
+        ---
+        If the image is not cached, the statistics of a subsample are
+        returned and the exact ones are computed in the background. The
+        callback is then called from the background thread (use the after
+        method of a widget to update Tk from it).
+
+        ---
+        Parameters:
+        ---
+        key: Hashable
+            -- key of the image, e.g. (path, size) as in the Decoder
+        image: numpy.ndarray | PIL.Image.Image
+            -- the decoded image
+
+        Keyword arguments:
+        ---
+        callback: Callable[[Hashable, dict], None]
+            -- called with the key and the exact statistics (default None)
+
+        Returns:
+        ---
+        : dict
+            -- the statistics, see get_statistics
+        """
+        with self.__lock:
+            stats = self.__dict_entries.get(key)
+            if stats is not None:
+                self.__dict_entries.move_to_end(key)
+                self.__dict_stats['hits'] += 1
+                if stats['exact'] or key in self.__pending:
+                    return stats
+        array, top = get_array(image)
+        if stats is None:
+            step = get_step(array.shape[:2], self.__samples)
+            stats = get_statistics(array, step, top)
+            self.__put(key, stats)
+            with self.__lock:
+                self.__dict_stats['sampled'] += 1
+            if stats['exact']:
+                return stats
+        with self.__lock:
+            if self.__closed or key in self.__pending:
+                return stats
+            self.__pending.add(key)
+            self.__dict_queued[key] = (array, top, callback)
+            while len(self.__dict_queued) > self.__workers:
+                dropped, _ = self.__dict_queued.popitem(last=False)
+                self.__pending.discard(dropped)
+                self.__dict_stats['dropped'] += 1
+        self.__executor.submit(self.__refine)
+        return stats
+
+    def peek(self, key):
+        """Get the cached statistics of an image without computing them.
+
+        ---
+        Parameters:
+        ---
+        key: Hashable
+            -- key of the image
+
+        Returns:
+        ---
+        : dict | None
+            -- the statistics, None if they are not cached
+        """
+        with self.__lock:
+            return self.__dict_entries.get(key)
+
+    def get_status(self, stats, strings, language_code=''):
+        """Get the statistics as a short text, for the statusbar.
+
+        ---
+        Parameters:
+        ---
+        stats: dict
+            -- the statistics, see get
+        strings: Strings
+            -- the loaded strings
+
+        Keyword arguments:
+        ---
+        language_code: str
+            -- ISO language code of the default language (default ' ')
+
+        Returns:
+        ---
+        : str
+            -- e.g. 'Mean 118.4  Clipped 0.52%', with localised digits and
+               words, the values of a subsample are prefixed with '~'
+        """
+        approximate = '' if stats['exact'] else '~'
+        mean = strings.get_number(round(stats['luma'], 1), language_code)
+        clipped = strings.get_number(round(stats['shadows'] +
+                                           stats['highlights'], 2),
+                                     language_code)
+        return f"{strings.get_word('Mean', language_code)} "\
+               f"{approximate}{mean}  "\
+               f"{strings.get_word('Clipped', language_code)} "\
+               f"{approximate}{clipped}%"
+
+    def get_stats(self):
+        """Get the counters of the cache.
+
+        ---
+        Returns:
+        ---
+        : dict[str, int]
+            -- 'hits', 'sampled' (images seen for the first time), 'refined'
+               (exact statistics computed), 'dropped' (waited too long for
+               the exact statistics), 'pending' and 'entries'
+        """
+        with self.__lock:
+            stats = dict(self.__dict_stats)
+            stats['pending'] = len(self.__pending)
+            stats['entries'] = len(self.__dict_entries)
+        return stats
+
+    def close(self):
+        """Stop computing the exact statistics."""
+        with self.__lock:
+            self.__closed = True
+            self.__dict_queued.clear()
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+
+    def __put(self, key, stats):
+        """Cache the statistics and evict the least recently used ones"""
+        with self.__lock:
+            self.__dict_entries[key] = stats
+            self.__dict_entries.move_to_end(key)
+            while len(self.__dict_entries) > self.__limit:
+                self.__dict_entries.popitem(last=False)
+
+    def __refine(self):
+        """Compute the exact statistics of the most recent waiting image in
+           the background
+        """
+        with self.__lock:
+            if len(self.__dict_queued) == 0:
+                return
+            key, (array, top, callback) = self.__dict_queued.popitem()
+        try:
+            stats = get_statistics(array, top=top)
+        except Exception as e:
+            print(f"ERROR: {e}. Could not compute the statistics.",
+                  file=sys_stderr)
+            with self.__lock:
+                self.__pending.discard(key)
+            return
+        self.__put(key, stats)
+        with self.__lock:
+            self.__pending.discard(key)
+            self.__dict_stats['refined'] += 1
+            if self.__closed:
+                return
+        if callback is None:
+            return
+        try:
+            callback(key, stats)
+        except Exception as e:
+            print(f"ERROR: {e}. In the histogram callback.", file=sys_stderr)
+
+    def __str__(self):
+        """Evaluates to the counters of the cache"""
+        stats = self.get_stats()
+        return f"{stats['entries']} image(s), {stats['hits']} hit(s), "\
+               f"{stats['pending']} pending"
+
+
+def get_step(size, samples):
+    """Get the stride of a subsample of about the provided number of pixels.
+
+    ---
+    Parameters:
+    ---
+    size: tuple[int, int]
+        -- height and width of the image
+    samples: int
+        -- number of pixels wanted
+
+    Returns:
+    ---
+    : int
+        -- the stride along both axes, 1 for the whole image
+    """
+    return max(1, int(sqrt(size[0] * size[1] / samples)))
+
+
+def get_array(image):
+    """Get the pixels of an image as an array, with their white level.
+
+    ---
+    Palette, bilevel, CMYK and the other modes whose values are not gray or
+    RGB levels are converted first. The floating point images of Pillow
+    ('F') are in 0.0 - 255.0, and its 32-bit integer images ('I') hold
+    16-bit files, so their white levels are 255.0 and 65535.
+
+    ---
+    Parameters:
+    ---
+    image: numpy.ndarray | PIL.Image.Image
+        -- the decoded image
+
+    Returns:
+    ---
+    : tuple[numpy.ndarray, int | float | None]
+        -- the pixels and the white level, None for the default one of the
+           type of the array (see get_statistics)
+    """
+    import numpy as np
+
+    mode = getattr(image, 'mode', None)
+    if mode in ('1', 'LA', 'La'):
+        image = image.convert('L')
+    elif mode is not None and mode not in ('L', 'RGB', 'RGBA', 'RGBX', 'I',
+                                           'F') \
+            and not mode.startswith('I;16'):
+        image = image.convert('RGB')
+    return np.asarray(image), {'F': 255.0, 'I': 65535}.get(mode)
+
+
+def get_statistics(array, step=1, top=None):
+    """Get the histograms and pixel statistics of an image.
+
+    ---
+    The histograms have 256 bins, over the values from 0 to the white level
+    of the image. The luma is the Rec. 601 one, in fixed point. The alpha
+    band is ignored.
+
+    ---
+    Parameters:
+    ---
+    array: numpy.ndarray
+        -- pixels of the image, (height, width) or (height, width, bands)
+
+    Keyword arguments:
+    ---
+    step: int
+        -- stride of the subsample along both axes (default 1)
+    top: int | float | None
+        -- white level of the image, None for 255 for 8-bit images, the
+           largest value for the other unsigned integers, 65535 for signed
+           integers and 1.0 for floating point (default None)
+
+    Returns:
+    ---
+    : dict
+        -- 'histograms' ('red', 'green', 'blue' and 'luma', or only 'luma'
+           for grayscale images, numpy arrays of 256 counts), 'minimum',
+           'maximum' and 'mean' (tuples, one value per band, in the range
+           of the image), 'luma' (mean luma, 0 - 255), 'shadows' and
+           'highlights' (percent of the pixels with a band at the lowest or
+           highest value), 'pixels' (number of pixels counted) and 'exact'
+           (False for a subsample)
+    """
+    import numpy as np
+
+    if array.ndim == 2:
+        array = array[:, :, None]
+    bands = 3 if array.shape[2] >= 3 else 1
+    sample = array[::step, ::step, :bands].reshape(-1, bands)
+    unsigned = np.issubdtype(sample.dtype, np.unsignedinteger)
+    if top is None:
+        if unsigned:
+            top = int(np.iinfo(sample.dtype).max)
+        elif np.issubdtype(sample.dtype, np.integer):
+            top = 65535
+        else:
+            top = 1.0
+    if sample.dtype == np.uint8 and top == 255:
+        values = sample
+    elif unsigned and top == np.iinfo(sample.dtype).max:
+        shift = np.iinfo(sample.dtype).bits - 8
+        values = (sample >> shift).astype(np.uint8)
+    else:
+        values = (np.clip(sample, 0, top) * (255.0 / top) + 0.5)\
+            .astype(np.uint8)
+    pixels = len(values)
+    counts = [np.bincount(values[:, band], minlength=256)
+              for band in range(bands)]
+    if bands == 3:
+        luma = (values[:, 0].astype(np.uint16) * 77 +
+                values[:, 1].astype(np.uint16) * 150 +
+                values[:, 2].astype(np.uint16) * 29) >> 8
+        histograms = {'red': counts[0], 'green': counts[1],
+                      'blue': counts[2],
+                      'luma': np.bincount(luma, minlength=256)}
+    else:
+        histograms = {'luma': counts[0]}
+    if values is sample:
+        levels = np.arange(256)
+        minimum = tuple(int(np.flatnonzero(count)[0]) if pixels else 0
+                        for count in counts)
+        maximum = tuple(int(np.flatnonzero(count)[-1]) if pixels else 0
+                        for count in counts)
+        mean = tuple(float(count @ levels) / max(1, pixels)
+                     for count in counts)
+    else:
+        minimum = tuple(sample.min(axis=0).tolist()) if pixels else (0,)
+        maximum = tuple(sample.max(axis=0).tolist()) if pixels else (0,)
+        mean = tuple(sample.mean(axis=0, dtype=np.float64).tolist()) \
+            if pixels else (0.0,)
+    luma = float(histograms['luma'] @ np.arange(256)) / max(1, pixels)
+    shadows = int(np.count_nonzero((sample <= 0).any(axis=1)))
+    highlights = int(np.count_nonzero((sample >= top).any(axis=1)))
+    return {'histograms': histograms, 'minimum': minimum, 'maximum': maximum,
+            'mean': mean, 'luma': luma,
+            'shadows': 100.0 * shadows / max(1, pixels),
+            'highlights': 100.0 * highlights / max(1, pixels),
+            'pixels': pixels, 'exact': step == 1}
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Histogram - Computes the histograms of the images.\n"
+        "Copyright:\n"
+        "    imageviewer::histogram  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # from PIL import Image
+    # from imageviewer.strings.strings import Strings
+    #
+    # s = Strings('D:/Repository/ImageViewer', 'bn-IN')
+    # h = Histogram()
+    # image = Image.open('D:/Pictures/photo.jpg')
+    # stats = h.get(('D:/Pictures/photo.jpg', None), image,
+    #               lambda key, exact: print(h.get_status(exact, s)))
+    # print(h.get_status(stats, s))
+    # h.close()
+    # print(h)
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
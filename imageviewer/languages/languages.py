@@ -14,32 +14,47 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import ChainMap
 from json import load as json_load
 from sys import stderr as sys_stderr
 
+from imageviewer.changes.changes import REMOVED
+from imageviewer.changes.changes import diff
+
 
 class Languages:
 
     __PATH_LANGUAGES = 'imageviewer/languages/languages.json'
 
-    __dict_codes = {}
+    __dict_bases = {}
+
+    __path = ''
+    __dict_codes = ChainMap()
     __dict_names = {}
+    __dict_user_codes = {}
     __codes = set()
     __names = set()
     __default_code = ''
     __default_name = ''
+    __user_default_code = None
     __code = ''
     __name = ''
 
-    def __init__(self, path_root, code=''):
+    def __init__(self, path_root, code='', state=None):
         """Load the system languages from the root path.
 
         ---
         The path_root sould be full path to the root of this project.
+        The system languages are read once per process and shared, read-only,
+        by all the instances loaded from the same root path. The user
+        languages and the default language are kept per instance, so every
+        window can use its own.
         If the code is an empty string the system default language is set. If
         the language corresponding to the code is not in the loaded languages
         list the default language is set as the system default language and a
         ValueError is raised.
+        If the state is given (see get_state) the languages are restored from
+        it and the languages file is not read at all.
 
         ---
         Parameters:
@@ -51,38 +66,53 @@ class Languages:
         ---
         code: str
             -- ISO code of the default language (default ' ')
+        state: dict
+            -- a state previously returned by get_state (default None)
 
         Raises:
         ---
         FileNotFoundError and ValueError
         """
+        if state is not None:
+            self.set_state(state)
+            return
         path = path_root + '/' + self.__PATH_LANGUAGES
-        with open(file=path, mode='rt', encoding='utf-8') as file:
-            dict_languages = json_load(file)
-            self.__dict_codes = dict_languages['codes']
-            for code_name, display_name in self.__dict_codes.items():
-                self.__dict_names[display_name] = code_name
-                self.__names.add(display_name)
-                self.__codes.add(code_name)
-            self.__default_code = dict_languages['default']
-            self.__default_name = self.__dict_codes[self.__default_code]
-            if len(code) == 0:
+        base = self.__dict_bases.get(path)
+        if base is None:
+            with open(file=path, mode='rt', encoding='utf-8') as file:
+                dict_languages = json_load(file)
+            base = (dict_languages['codes'], dict_languages['default'])
+            self.__dict_bases[path] = base
+        self.__path = path
+        self.__dict_user_codes = {}
+        self.__dict_codes = ChainMap(self.__dict_user_codes, base[0])
+        self.__index()
+        self.__default_code = base[1]
+        self.__default_name = self.__dict_codes[self.__default_code]
+        if len(code) == 0:
+            code = self.__default_code
+        else:
+            try:
+                if code not in self.__codes:
+                    raise ValueError(
+                        f"'{code}' is not a valid system language code")
+            except ValueError as e:
+                print(f"ERROR: {e}.",
+                      f"       Valid language codes are: {self.__codes}",
+                      f"       Reverting to default language code, "
+                      f"'{self.__default_code}'.",
+                      sep='\n',
+                      file=sys_stderr)
                 code = self.__default_code
-            else:
-                try:
-                    if code not in self.__codes:
-                        raise ValueError(
-                            f"'{code}' is not a valid system language code")
-                except ValueError as e:
-                    print(f"ERROR: {e}.",
-                          f"       Valid language codes are: {self.__codes}",
-                          f"       Reverting to default language code, "
-                          f"'{self.__default_code}'.",
-                          sep='\n',
-                          file=sys_stderr)
-                    code = self.__default_code
-            self.__code = code
-            self.__name = self.__dict_codes[code]
+        self.__code = code
+        self.__name = self.__dict_codes[code]
+
+    def __index(self):
+        """Index the languages by their display names"""
+        self.__dict_names = {display_name: code_name for code_name,
+                             display_name in self.__dict_codes.items()}
+        self.__codes = set(self.__dict_codes.keys())
+        self.__names = set(self.__dict_names.keys())
 
     def set_code(self, code=''):
         """Set the default language code.
@@ -274,12 +304,110 @@ class Languages:
         with open(file=path_full, mode='rt', encoding='utf-8') as file:
             dict_languages = json_load(file)
             for code_name, display_name in dict_languages['codes'].items():
-                self.__dict_codes[code_name] = display_name
-                self.__dict_names[display_name] = code_name
-                self.__names.add(display_name)
-                self.__codes.add(code_name)
+                self.__dict_user_codes[code_name] = display_name
+            self.__index()
+            self.__user_default_code = dict_languages.get('default')
             self.set_code(dict_languages.get('default', self.__code))
 
+    def reload(self, path_full):
+        """Reload the user languages from the given full path incrementally.
+
+        ---
+        The user-languages file is compared with the previously loaded user
+        languages and only the languages that were added, changed or removed
+        are applied and reported. A removed user language reverts to the
+        system language of the same code, if there is one. The current
+        language is kept, unless the 'default' of the file changed, then it
+        is set, or the language was removed, then the system default language
+        is set.
+
+        ---
+        Parameters:
+        ---
+        path_full: str
+            -- full path to the user-languages file (*.json)
+
+        Returns:
+        ---
+        : list[tuple[str, str, str, str]]
+            -- the ('language', ISO code, 'name', action) of every change
+
+        Raises:
+        ---
+        FileNotFoundError and ValueError
+        """
+        with open(file=path_full, mode='rt', encoding='utf-8') as file:
+            dict_languages = json_load(file)
+        dict_user_codes = dict_languages['codes']
+        changes = []
+        for code_name, action in diff(self.__dict_user_codes,
+                                      dict_user_codes):
+            if action == REMOVED:
+                del self.__dict_user_codes[code_name]
+            else:
+                self.__dict_user_codes[code_name] = dict_user_codes[code_name]
+            changes.append(('language', code_name, 'name', action))
+        if len(changes) > 0:
+            self.__index()
+        self.__default_name = self.__dict_codes[self.__default_code]
+        if self.__code not in self.__codes:
+            self.set_code()
+        default_code = dict_languages.get('default')
+        if default_code != self.__user_default_code:
+            self.__user_default_code = default_code
+            if default_code is not None:
+                self.set_code(default_code)
+        self.__name = self.__dict_codes[self.__code]
+        return changes
+
+    def get_state(self):
+        """Get the loaded languages, including the user languages.
+
+        ---
+        Returns:
+        ---
+        : dict
+            -- a picklable dict that can be passed to set_state
+        """
+        return {
+            'path': self.__path,
+            'system_codes': self.__dict_codes.maps[1],
+            'default_code': self.__default_code,
+            'user_codes': self.__dict_user_codes,
+            'user_default_code': self.__user_default_code,
+            'code': self.__code,
+            'name': self.__name
+        }
+
+    def set_state(self, state):
+        """Restore the languages from a state returned by get_state.
+
+        ---
+        The system languages of the state are shared with the other instances
+        loaded from the same root path.
+
+        ---
+        Parameters:
+        ---
+        state: dict
+            -- a state previously returned by get_state
+
+        Raises:
+        ---
+        KeyError
+        """
+        base = self.__dict_bases.setdefault(
+            state['path'], (state['system_codes'], state['default_code']))
+        self.__path = state['path']
+        self.__dict_user_codes = dict(state['user_codes'])
+        self.__user_default_code = state['user_default_code']
+        self.__dict_codes = ChainMap(self.__dict_user_codes, base[0])
+        self.__index()
+        self.__default_code = base[1]
+        self.__default_name = self.__dict_codes[self.__default_code]
+        self.__code = state['code']
+        self.__name = state['name']
+
     def __str__(self):
         """Evaluates to the default language name and its ISO code"""
         return f"{self.__name} - (ISO:{self.__code})"
@@ -0,0 +1,105 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from importlib import import_module
+
+
+class Lazy:
+
+    __module = ''
+    __name = ''
+    __object = None
+
+    def __init__(self, module, name=''):
+        """A module, or an object of a module, imported on first use.
+
+        ---
+        Calling it or getting an attribute of it imports the module, so a
+        module level Lazy costs nothing until the code that needs it runs,
+        e.g. Pillow, NumPy or Tk are not imported before the first image.
+
+        ---
+        Parameters:
+        ---
+        module: str
+            -- full name of the module, e.g. 'imageviewer.strings.strings'
+
+        Keyword arguments:
+        ---
+        name: str
+            -- name of an object of the module, e.g. 'Strings', the module
+               itself if it is an empty string (default ' ')
+        """
+        self.__module = module
+        self.__name = name
+        self.__object = None
+
+    def get(self):
+        """Import the module, if it is not imported yet.
+
+        ---
+        Returns:
+        ---
+        : Any
+            -- the module, or its object
+
+        Raises:
+        ---
+        ImportError and AttributeError
+        """
+        if self.__object is None:
+            module = import_module(self.__module)
+            self.__object = module if len(self.__name) == 0 else \
+                getattr(module, self.__name)
+        return self.__object
+
+    def is_loaded(self):
+        """Checks if the module is imported already"""
+        return self.__object is not None
+
+    def __call__(self, *args, **kwargs):
+        """Calls the object, e.g. a class to make an instance"""
+        return self.get()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        """Gets an attribute of the module, or of its object"""
+        return getattr(self.get(), name)
+
+    def __str__(self):
+        """Evaluates to the full name of the module, or of its object"""
+        name = self.__module if len(self.__name) == 0 else \
+            f"{self.__module}.{self.__name}"
+        return f"{name} ({'loaded' if self.is_loaded() else 'not loaded'})"
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Lazy - Imports the modules on first use.\n"
+        "Copyright:\n"
+        "    imageviewer::lazy  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # Image = Lazy('PIL.Image')
+    # print(Image)
+    # print(Image.new('RGB', (1, 1)))
+    # print(Image)
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
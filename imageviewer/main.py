@@ -14,14 +14,246 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from imageviewer.languages.languages import Languages
-from imageviewer.strings.strings import Strings
-from imageviewer.themes.themes import Themes
-from imageviewer.settings.settings import Settings
+from os.path import abspath as os_path_abspath
+from os.path import dirname as os_path_dirname
+from contextlib import nullcontext
+from sys import stderr as sys_stderr
+
+from imageviewer.lazy.lazy import Lazy
+
+Languages = Lazy('imageviewer.languages.languages', 'Languages')
+Strings = Lazy('imageviewer.strings.strings', 'Strings')
+Themes = Lazy('imageviewer.themes.themes', 'Themes')
+Settings = Lazy('imageviewer.settings.settings', 'Settings')
+Paths = Lazy('imageviewer.paths.paths', 'Paths')
+Snapshot = Lazy('imageviewer.snapshot.snapshot', 'Snapshot')
+
+PATH_ROOT = os_path_dirname(os_path_dirname(os_path_abspath(__file__)))\
+    .replace('\\', '/')
+
+
+def get_parser():
+    """Get the parser of the command line arguments.
+
+    ---
+    Returns:
+    ---
+    : argparse.ArgumentParser
+        -- the parser, without a command the viewer is started
+    """
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='python -m imageviewer.main')
+    parser.add_argument('--language', default='',
+                        help='ISO language code of the messages')
+    parser.add_argument('--profile-startup', nargs='?', const='',
+                        default=None, metavar='IMAGE',
+                        help='start up to the first painted image and '
+                             'report the time of every import and step')
+    commands = parser.add_subparsers(dest='command')
+    batch = commands.add_parser(
+        'batch', help='convert, resize or re-encode a directory tree '
+                      'without starting the viewer')
+    batch.add_argument('source', help='directory of the images')
+    batch.add_argument('destination', help='directory of the outputs')
+    batch.add_argument('--format', default='',
+                       help='output format, e.g. jpeg, png or webp')
+    batch.add_argument('--size', type=get_size, default=None,
+                       help='fit the images in WIDTHxHEIGHT')
+    batch.add_argument('--quality', type=int, default=90)
+    batch.add_argument('--workers', type=int, default=None,
+                       help='number of processes (default: processors)')
+    batch.add_argument('--chunksize', type=int, default=64,
+                       help='images handed to a process at once')
+    batch.add_argument('--overwrite', action='store_true',
+                       help='also convert the images with newer outputs')
+    batch.add_argument('--progress', type=int, default=1000,
+                       help='report the progress every N images')
+    return parser
+
+
+def get_size(text):
+    """Parse a size argument, e.g. '1920x1080'.
+
+    ---
+    Parameters:
+    ---
+    text: str
+        -- width and height separated by 'x'
+
+    Returns:
+    ---
+    : tuple[int, int]
+        -- the width and the height
+
+    Raises:
+    ---
+    ValueError
+    """
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def load_strings(language_code=''):
+    """Load the strings for the messages of the command line.
+
+    ---
+    Keyword arguments:
+    ---
+    language_code: str
+        -- ISO language code of the messages, the language of the settings
+           if it is an empty string (default ' ')
+
+    Returns:
+    ---
+    : Strings
+        -- the loaded strings
+    """
+    strings = Snapshot(PATH_ROOT, Paths()).load()[1]
+    if len(language_code) > 0:
+        strings.set_language(language_code)
+    return strings
+
+
+def run_batch(arguments, strings):
+    """Run the batch conversion and report the progress on the console.
+
+    ---
+    Parameters:
+    ---
+    arguments: argparse.Namespace
+        -- the parsed arguments of the batch command
+    strings: Strings
+        -- the loaded strings
+
+    Returns:
+    ---
+    : int
+        -- the exit status, 1 if an image could not be converted
+    """
+    from imageviewer.batch.batch import Batch
+
+    def get_rate(stats):
+        """Get the throughput, localised"""
+        done = stats['converted'] + stats['failed']
+        rate = done / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        return f"{strings.get_number(round(rate, 1))} "\
+               f"{strings.get_word('images/s')}"
+
+    def report(path, error, stats):
+        """Report a failed image and the progress"""
+        if error is not None:
+            print(f"{strings.get_word('Failed')}: {path}: {error}",
+                  file=sys_stderr)
+        done = stats['converted'] + stats['failed']
+        if done % max(1, arguments.progress) == 0:
+            print(f"{strings.get_number(done)} "
+                  f"{strings.get_word('Images')}, {get_rate(stats)}")
+
+    try:
+        batch = Batch(arguments.source, arguments.destination,
+                      arguments.format, arguments.size, arguments.quality,
+                      arguments.overwrite)
+    except ValueError as e:
+        print(f"ERROR: {e}.", file=sys_stderr)
+        return 2
+    stats = batch.run(arguments.workers, arguments.chunksize, report)
+    print(f"{strings.get_word('Converted')}: "
+          f"{strings.get_number(stats['converted'])}, "
+          f"{strings.get_word('Failed')}: "
+          f"{strings.get_number(stats['failed'])}, "
+          f"{strings.get_number(round(stats['seconds'], 1))} s, "
+          f"{get_rate(stats)}")
+    return 1 if stats['failed'] > 0 else 0
+
+
+def start(path='', startup=None):
+    """Start up to the first painted image.
+
+    ---
+    The steps are the ones the viewer takes before its first frame: loading
+    the languages, strings, themes and settings (each timed on its own, see
+    Snapshot.load), decoding the first image and painting it in a Tk
+    window. Painting is skipped without a display.
+
+    ---
+    Keyword arguments:
+    ---
+    path: str
+        -- full path to the first image, no image is decoded if it is an
+           empty string (default ' ')
+    startup: Startup
+        -- times the steps, see imageviewer.startup (default None)
+
+    Returns:
+    ---
+    : tuple[Languages, Strings, Themes, Settings]
+        -- the loaded languages, strings, themes and settings
+    """
+    def phase(name):
+        """Time a step if profiled"""
+        return nullcontext() if startup is None else startup.phase(name)
+
+    with phase('snapshot import'):
+        Snapshot.get()
+    loaded = Snapshot(PATH_ROOT, Paths()).load(startup)
+    if len(path) == 0:
+        return loaded
+    with phase('decode'):
+        from imageviewer.decoder.decoder import decode_image
+
+        image = decode_image(path, (1280, 800))
+    with phase('paint'):
+        try:
+            import tkinter
+        except ImportError as e:
+            print(f"ERROR: {e}. Not painting the image.", file=sys_stderr)
+            return loaded
+        try:
+            from PIL import ImageTk
+
+            root = tkinter.Tk()
+        except (ImportError, RuntimeError, tkinter.TclError) as e:
+            print(f"ERROR: {e}. Not painting the image.", file=sys_stderr)
+            return loaded
+        try:
+            photo = ImageTk.PhotoImage(image)
+            tkinter.Label(root, image=photo).pack()
+            root.update()
+        finally:
+            root.destroy()
+    return loaded
+
+
+def profile_startup(path=''):
+    """Profile the startup and report it on the console.
+
+    ---
+    Keyword arguments:
+    ---
+    path: str
+        -- full path to the first image (default ' ')
+    """
+    from imageviewer.startup.startup import Startup
+
+    startup = Startup()
+    startup.start()
+    try:
+        start(path, startup)
+    finally:
+        startup.stop()
+    print(startup.get_report())
 
 
 def __Main():
     """Main entry point of this program"""
+    arguments = get_parser().parse_args()
+    if arguments.profile_startup is not None:
+        profile_startup(arguments.profile_startup)
+        return
+    if arguments.command == 'batch':
+        raise SystemExit(run_batch(arguments,
+                                   load_strings(arguments.language)))
     print('Hello')
 
 
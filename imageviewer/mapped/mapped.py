@@ -0,0 +1,331 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from mmap import ACCESS_READ as MMAP_ACCESS_READ
+from mmap import mmap
+from struct import error as struct_error
+from struct import unpack_from as struct_unpack_from
+
+
+class Mapped:
+
+    __TIFF_TYPES = {3: ('H', 2), 4: ('I', 4)}
+    __TIFF_KINDS = {1: 'u', 2: 'i', 3: 'f'}
+
+    __path = ''
+    __file = None
+    __map = None
+    __array = None
+    __format = ''
+
+    def __init__(self, path):
+        """Map an uncompressed image and view its pixels without copying.
+
+        ---
+        Binary PGM/PPM (P5, P6), uncompressed 24 and 32 bit BMP and
+        uncompressed, strip based, chunky TIFF are supported. The file is
+        mapped read-only, and the pixels are a NumPy view of the mapping, so
+        only the pages of the regions that are used are read from the disk.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+
+        Raises:
+        ---
+        ImportError, OSError, ValueError, KeyError, TypeError and struct.error
+        """
+        import numpy
+
+        self.__path = path
+        self.__file = open(file=path, mode='rb')
+        try:
+            self.__map = mmap(self.__file.fileno(), 0, access=MMAP_ACCESS_READ)
+            magic = self.__map[:4]
+            if magic[:2] in (b'P5', b'P6'):
+                self.__format = 'PPM'
+                self.__array = self.__map_ppm(numpy)
+            elif magic[:2] == b'BM':
+                self.__format = 'BMP'
+                self.__array = self.__map_bmp(numpy)
+            elif magic in (b'II*\0', b'MM\0*'):
+                self.__format = 'TIFF'
+                self.__array = self.__map_tiff(numpy)
+            else:
+                raise ValueError('The image format can not be mapped')
+        except (OSError, ValueError, KeyError, TypeError, struct_error):
+            self.close()
+            raise
+
+    def __map_ppm(self, numpy):
+        """View the pixels of a binary PGM or PPM image"""
+        values = []
+        offset = 2
+        while len(values) < 3:
+            while self.__map[offset:offset + 1].isspace():
+                offset += 1
+            if self.__map[offset:offset + 1] == b'#':
+                offset = self.__map.find(b'\n', offset) + 1
+                if offset == 0:
+                    raise ValueError('The PPM header is truncated')
+                continue
+            start = offset
+            while self.__map[offset:offset + 1].isdigit():
+                offset += 1
+            if start == offset:
+                raise ValueError('The PPM header is not valid')
+            values.append(int(self.__map[start:offset]))
+        width, height, maximum = values
+        dtype = numpy.dtype('u1' if maximum < 256 else '>u2')
+        shape = (height, width) if self.__map[1:2] == b'5' else\
+            (height, width, 3)
+        return numpy.ndarray(shape, dtype=dtype, buffer=self.__map,
+                             offset=offset + 1)
+
+    def __map_bmp(self, numpy):
+        """View the pixels of an uncompressed 24 or 32 bit BMP image"""
+        offset, = struct_unpack_from('<I', self.__map, 10)
+        width, height, _, bits, compression = struct_unpack_from('<iiHHI',
+                                                                 self.__map,
+                                                                 18)
+        if bits not in (24, 32) or compression != 0:
+            raise ValueError('Only uncompressed 24 and 32 bit BMP images can '
+                             'be mapped')
+        stride = (width * bits + 31) // 32 * 4
+        channels = bits // 8
+        array = numpy.ndarray((abs(height), width, channels), dtype='u1',
+                              buffer=self.__map, offset=offset,
+                              strides=(stride, channels, 1))
+        if height > 0:
+            array = array[::-1]
+        return array[:, :, 2::-1]
+
+    def __map_tiff(self, numpy):
+        """View the pixels of an uncompressed, strip based TIFF image"""
+        order = '<' if self.__map[:2] == b'II' else '>'
+        offset, = struct_unpack_from(f'{order}I', self.__map, 4)
+        count, = struct_unpack_from(f'{order}H', self.__map, offset)
+        dict_tags = {}
+        for entry in range(count):
+            tag, kind, number, value = struct_unpack_from(
+                f'{order}HHI4s', self.__map, offset + 2 + entry * 12)
+            if kind not in self.__TIFF_TYPES:
+                continue
+            code, size = self.__TIFF_TYPES[kind]
+            if number * size > 4:
+                dict_tags[tag] = struct_unpack_from(
+                    f'{order}{number}{code}', self.__map,
+                    struct_unpack_from(f'{order}I', value)[0])
+            else:
+                dict_tags[tag] = struct_unpack_from(f'{order}{number}{code}',
+                                                    value)
+        width, = dict_tags[256]
+        height, = dict_tags[257]
+        bits = dict_tags.get(258, (1,))
+        samples, = dict_tags.get(277, (1,))
+        if dict_tags.get(259, (1,))[0] != 1 or \
+           dict_tags.get(284, (1,))[0] != 1 or \
+           dict_tags.get(262, (1,))[0] not in (1, 2) or 322 in dict_tags or \
+           len(set(bits)) != 1 or bits[0] not in (8, 16, 32):
+            raise ValueError('Only uncompressed, strip based, chunky 8, 16 '
+                             'and 32 bit TIFF images can be mapped')
+        offsets = dict_tags[273]
+        counts = dict_tags[279]
+        for strip in range(1, len(offsets)):
+            if offsets[strip] != offsets[strip - 1] + counts[strip - 1]:
+                raise ValueError('The TIFF strips are not contiguous')
+        kind = self.__TIFF_KINDS.get(dict_tags.get(339, (1,))[0])
+        if kind is None or (kind == 'f' and bits[0] == 8):
+            raise ValueError('Only unsigned, signed and floating point TIFF '
+                             'samples can be mapped')
+        dtype = numpy.dtype(f'{order}{kind}{bits[0] // 8}')
+        shape = (height, width) if samples == 1 else (height, width, samples)
+        return numpy.ndarray(shape, dtype=dtype, buffer=self.__map,
+                             offset=offsets[0])
+
+    def get_array(self):
+        """Get the pixels.
+
+        ---
+        Returns:
+        ---
+        : numpy.ndarray
+            -- a read-only view of the mapped pixels, height by width (by
+               channels)
+        """
+        return self.__array
+
+    def get_format(self):
+        """Get the format of the image, 'PPM', 'BMP' or 'TIFF'"""
+        return self.__format
+
+    def get_size(self):
+        """Get the width and the height of the image"""
+        return (self.__array.shape[1], self.__array.shape[0])
+
+    def is_tiled(self):
+        """Checks if regions can be read on their own, which they always can"""
+        return True
+
+    def read(self, box, scale):
+        """Get a region of the image at full resolution, as a view.
+
+        ---
+        Only the full resolution is a view, nothing is copied. Taking every
+        scale-th pixel would alias, so the reduced regions are made from the
+        full resolution ones by the caller (see Tiles).
+
+        ---
+        Parameters:
+        ---
+        box: tuple[int, int, int, int]
+            -- left, top, right and bottom of the region
+        scale: int
+            -- the region is reduced by this factor
+
+        Returns:
+        ---
+        : numpy.ndarray | None
+            -- a read-only view of the region, None if scale is not 1
+        """
+        if scale != 1:
+            return None
+        return self.__array[box[1]:box[3], box[0]:box[2]]
+
+    def read_level(self, scale):
+        """Get the whole image at a reduced resolution.
+
+        ---
+        The image is halved until it is reduced by the scale, a band of rows
+        at a time, see reduce_array.
+
+        ---
+        Parameters:
+        ---
+        scale: int
+            -- the image is reduced by this power of 2
+
+        Returns:
+        ---
+        : numpy.ndarray
+            -- the image, a read-only view if scale is 1, a copy otherwise
+        """
+        import numpy
+
+        array = self.__array
+        while scale > 1:
+            array = numpy.concatenate([reduce_array(array[row:row + 512])
+                                       for row in range(0, len(array), 512)])
+            scale //= 2
+        return array
+
+    def close(self):
+        """Unmap the image, the views must not be used anymore."""
+        self.__array = None
+        if self.__map is not None:
+            try:
+                self.__map.close()
+            except BufferError:
+                pass
+            self.__map = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __str__(self):
+        """Evaluates to the path, format and shape of the image"""
+        shape = None if self.__array is None else self.__array.shape
+        return f'"{self.__path}", {self.__format} {shape}'
+
+
+def open_mapped(path):
+    """Map an image if it is uncompressed, see Mapped.
+
+    ---
+    Parameters:
+    ---
+    path: str
+        -- full path to the image
+
+    Returns:
+    ---
+    : Mapped | None
+        -- the mapped image, None if it can not be mapped or NumPy is not
+           installed
+    """
+    try:
+        return Mapped(path)
+    except (ImportError, OSError, ValueError, KeyError, TypeError,
+            struct_error):
+        return None
+
+
+def reduce_array(array):
+    """Halve the width and the height of the pixels of an image.
+
+    ---
+    Every pixel is the mean of a 2x2 block, the blocks of an odd last row or
+    column are the mean of the pixels they have, as with the reduce method
+    of PIL.Image.Image.
+
+    ---
+    Parameters:
+    ---
+    array: numpy.ndarray
+        -- the pixels, height by width (by channels)
+
+    Returns:
+    ---
+    : numpy.ndarray
+        -- the reduced pixels, of the same type
+    """
+    import numpy
+
+    height, width = array.shape[:2]
+    shape = (-(-height // 2), -(-width // 2)) + array.shape[2:]
+    total = numpy.zeros(shape)
+    count = numpy.zeros(shape[:2] + (1,) * (array.ndim - 2))
+    for row in (0, 1):
+        for column in (0, 1):
+            part = array[row::2, column::2]
+            total[:part.shape[0], :part.shape[1]] += part
+            count[:part.shape[0], :part.shape[1]] += 1
+    total /= count
+    if numpy.issubdtype(array.dtype, numpy.integer):
+        numpy.rint(total, out=total)
+    return total.astype(array.dtype)
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Mapped - Maps the uncompressed images.\n"
+        "Copyright:\n"
+        "    imageviewer::mapped  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # m = Mapped('D:/Pictures/frame.pgm')
+    # print(m)
+    # print(m.read((0, 0, 256, 256), 1).mean())
+    # m.close()
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,480 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from hashlib import blake2b
+from os import makedirs as os_makedirs
+from os import scandir as os_scandir
+from os import stat as os_stat
+from os.path import abspath as os_path_abspath
+from os.path import basename as os_path_basename
+from os.path import dirname as os_path_dirname
+from os.path import splitext as os_path_splitext
+from queue import Queue
+from sqlite3 import connect as sqlite3_connect
+from sqlite3 import Error as SqliteError
+from sys import stderr as sys_stderr
+from threading import Thread
+
+
+class Metadata:
+
+    __DATABASE_FILE = 'metadata.sqlite'
+    __VERSION = 1
+    __SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS files ("
+        " path TEXT PRIMARY KEY,"
+        " directory TEXT NOT NULL,"
+        " name TEXT NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " mtime INTEGER NOT NULL,"
+        " width INTEGER,"
+        " height INTEGER,"
+        " pixels INTEGER,"
+        " format TEXT,"
+        " date TEXT,"
+        " hash TEXT)",
+        "CREATE INDEX IF NOT EXISTS files_name ON files (directory, name)",
+        "CREATE INDEX IF NOT EXISTS files_date ON files (directory, date)",
+        "CREATE INDEX IF NOT EXISTS files_pixels ON files (directory, pixels)",
+        "CREATE INDEX IF NOT EXISTS files_size ON files (directory, size)",
+        "CREATE INDEX IF NOT EXISTS files_mtime ON files (directory, mtime)",
+        "CREATE INDEX IF NOT EXISTS files_hash ON files (hash)"
+    )
+    __ORDERS = ('name', 'date', 'pixels', 'size', 'mtime')
+    __COLUMNS = ('path', 'size', 'mtime', 'width', 'height', 'format', 'date',
+                 'hash')
+    __BATCH = 256
+    __EXTENSIONS = frozenset((
+        '.bmp', '.dib', '.gif', '.ico', '.j2k', '.jp2', '.jpe', '.jpeg',
+        '.jpg', '.jpx', '.pbm', '.pgm', '.png', '.pnm', '.ppm', '.tif',
+        '.tiff', '.webp'
+    ))
+
+    __path = ''
+    __connection = None
+    __queue = None
+    __thread = None
+    __callback = None
+
+    def __init__(self, paths):
+        """Open the metadata index of the profile directory.
+
+        ---
+        The index is a SQLite database recording the size, modification
+        time, dimensions, format and EXIF date of the images, keyed by
+        absolute path, and their content hash once get_duplicates needed
+        it. It is refreshed by a background worker (see
+        refresh) which only reads the files whose size or modification time
+        changed, and queried from the calling thread.
+
+        ---
+        Parameters:
+        ---
+        paths: Paths
+            -- the user paths, the index is in the profile directory
+
+        Raises:
+        ---
+        sqlite3.Error
+        """
+        path = paths.get_profile_path()
+        self.__path = f"{path}/{self.__DATABASE_FILE}"
+        os_makedirs(path, exist_ok=True)
+        self.__connection = self.__connect()
+        self.__queue = Queue()
+
+    def __connect(self):
+        """Open a connection to the index, creating or upgrading it"""
+        connection = sqlite3_connect(self.__path, timeout=10.0)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        version, = connection.execute('PRAGMA user_version').fetchone()
+        if version != self.__VERSION:
+            with connection:
+                connection.execute('DROP TABLE IF EXISTS files')
+                for statement in self.__SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f'PRAGMA user_version={self.__VERSION}')
+        return connection
+
+    def start(self, callback=None):
+        """Start the background worker.
+
+        ---
+        The callback is called from the worker thread, a Tk user interface
+        must hand the call over to the main thread (e.g. with after).
+
+        ---
+        Keyword arguments:
+        ---
+        callback: Callable[[str, int], None]
+            -- called with the directory and the number of updated and
+               removed files after every committed batch (default None)
+        """
+        if self.__thread is not None:
+            return
+        self.__callback = callback
+        self.__thread = Thread(target=self.__run,
+                               name='ImageViewer::Metadata',
+                               daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop the background worker after the current refresh."""
+        if self.__thread is None:
+            return
+        self.__queue.put(None)
+        self.__thread.join()
+        self.__thread = None
+
+    def close(self):
+        """Stop the background worker and close the index."""
+        self.stop()
+        self.__connection.close()
+
+    def refresh(self, directory, wait=False):
+        """Refresh the index of the images of a directory.
+
+        ---
+        New and changed images are read, removed ones are dropped. Without a
+        started worker the refresh is done in the calling thread.
+
+        ---
+        Parameters:
+        ---
+        directory: str
+            -- full path to the directory
+
+        Keyword arguments:
+        ---
+        wait: bool
+            -- wait until the refresh is done (default False)
+        """
+        directory = os_path_abspath(directory)
+        if self.__thread is None:
+            self.__refresh(self.__connection, directory)
+            return
+        self.__queue.put(directory)
+        if wait:
+            self.__queue.join()
+
+    def query(self, directory, order='name', descending=False, format=None,
+              width=0, height=0, date_from=None, date_to=None):
+        """Get the indexed images of a directory, filtered and sorted.
+
+        ---
+        Parameters:
+        ---
+        directory: str
+            -- full path to the directory
+
+        Keyword arguments:
+        ---
+        order: str
+            -- 'name', 'date', 'pixels', 'size' or 'mtime' (default 'name')
+        descending: bool
+            -- sort in descending order (default False)
+        format: str
+            -- only the images of this format, e.g. 'JPEG' (default None)
+        width: int
+            -- only the images at least this wide (default 0)
+        height: int
+            -- only the images at least this high (default 0)
+        date_from: str
+            -- only the images taken at or after this ISO date (default None)
+        date_to: str
+            -- only the images taken before this ISO date (default None)
+
+        Returns:
+        ---
+        : list[str]
+            -- the full paths to the images
+
+        Raises:
+        ---
+        ValueError
+        """
+        if order not in self.__ORDERS:
+            raise ValueError(f"'{order}' is not a valid order")
+        conditions = ['directory = ?']
+        values = [os_path_abspath(directory)]
+        if format is not None:
+            conditions.append('format = ?')
+            values.append(format)
+        if width > 0:
+            conditions.append('width >= ?')
+            values.append(width)
+        if height > 0:
+            conditions.append('height >= ?')
+            values.append(height)
+        if date_from is not None:
+            conditions.append('date >= ?')
+            values.append(date_from)
+        if date_to is not None:
+            conditions.append('date < ?')
+            values.append(date_to)
+        direction = 'DESC' if descending else 'ASC'
+        rows = self.__connection.execute(
+            f"SELECT path FROM files WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {order} {direction}, name {direction}", values)
+        return [row[0] for row in rows]
+
+    def get(self, path):
+        """Get the indexed metadata of an image.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+
+        Returns:
+        ---
+        : dict | None
+            -- 'path', 'size', 'mtime' (in nanoseconds), 'width', 'height',
+               'format', 'date' (ISO) and 'hash', None if it is not indexed
+        """
+        row = self.__connection.execute(
+            f"SELECT {', '.join(self.__COLUMNS)} FROM files WHERE path = ?",
+            (os_path_abspath(path),)).fetchone()
+        return None if row is None else dict(zip(self.__COLUMNS, row))
+
+    def get_duplicates(self, directory=None):
+        """Get the groups of indexed images with the same content.
+
+        ---
+        The content is hashed here and not when the images are indexed, and
+        only for the images of the same size as another one. The hashes are
+        kept in the index until the images change.
+
+        ---
+        Keyword arguments:
+        ---
+        directory: str
+            -- only the images of this directory, all if None (default None)
+
+        Returns:
+        ---
+        : list[list[str]]
+            -- the full paths to the images of every group
+        """
+        condition, values = '', ()
+        if directory is not None:
+            condition, values = 'WHERE directory = ?', \
+                (os_path_abspath(directory),)
+        sizes = {}
+        for path, size, digest in self.__connection.execute(
+                f"SELECT path, size, hash FROM files {condition} "
+                f"ORDER BY size, path", values):
+            sizes.setdefault(size, []).append((path, digest))
+        groups = {}
+        hashed = []
+        for files in sizes.values():
+            if len(files) < 2:
+                continue
+            for path, digest in files:
+                if digest is None:
+                    try:
+                        digest = hash_file(path)
+                    except OSError as e:
+                        print(f"ERROR: {e}. Could not hash '{path}'.",
+                              file=sys_stderr)
+                        continue
+                    hashed.append((digest, path))
+                groups.setdefault(digest, []).append(path)
+        if len(hashed) > 0:
+            with self.__connection:
+                self.__connection.executemany(
+                    'UPDATE files SET hash = ? WHERE path = ?', hashed)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def __len__(self):
+        """Evaluates to the number of indexed images"""
+        return self.__connection.execute(
+            'SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def __run(self):
+        """Refresh the queued directories until stop is called"""
+        connection = self.__connect()
+        try:
+            while True:
+                directory = self.__queue.get()
+                try:
+                    if directory is None:
+                        return
+                    self.__refresh(connection, directory)
+                finally:
+                    self.__queue.task_done()
+        finally:
+            connection.close()
+
+    def __refresh(self, connection, directory):
+        """Refresh the index of a directory with a connection"""
+        try:
+            known = dict(((path, (size, mtime)) for path, size, mtime in
+                          connection.execute("SELECT path, size, mtime FROM "
+                                             "files WHERE directory = ?",
+                                             (directory,))))
+            rows = []
+            seen = set()
+            with os_scandir(directory) as entries:
+                for entry in entries:
+                    if os_path_splitext(entry.name)[1].lower() not in \
+                       self.__EXTENSIONS or not entry.is_file():
+                        continue
+                    seen.add(entry.path)
+                    stat = entry.stat()
+                    if known.get(entry.path) == (stat.st_size,
+                                                 stat.st_mtime_ns):
+                        continue
+                    rows.append(read_metadata(entry.path, stat))
+                    if len(rows) >= self.__BATCH:
+                        self.__write(connection, directory, rows, [])
+                        rows = []
+            removed = [(path,) for path in known if path not in seen]
+            if len(rows) > 0 or len(removed) > 0:
+                self.__write(connection, directory, rows, removed)
+        except (OSError, SqliteError) as e:
+            print(f"ERROR: {e}. Could not index '{directory}'.",
+                  file=sys_stderr)
+
+    def __write(self, connection, directory, rows, removed):
+        """Write a batch of metadata and drop the removed images in one
+           transaction
+        """
+        with connection:
+            connection.executemany('DELETE FROM files WHERE path = ?',
+                                   removed)
+            connection.executemany(
+                "INSERT OR REPLACE INTO files (path, directory, name, size, "
+                "mtime, width, height, pixels, format, date, hash) VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        if self.__callback is not None:
+            try:
+                self.__callback(directory, len(rows) + len(removed))
+            except Exception as e:
+                print(f"ERROR: {e}. In the metadata callback.",
+                      file=sys_stderr)
+
+    def __str__(self):
+        """Evaluates to the path of the index"""
+        return f'"{self.__path}"'
+
+
+def read_metadata(path, stat=None, digest=False):
+    """Read the metadata of an image.
+
+    ---
+    Only the header of the image is read with Pillow (if it is installed).
+    The whole file is read only to hash it, when asked to.
+
+    ---
+    Parameters:
+    ---
+    path: str
+        -- full path to the image
+
+    Keyword arguments:
+    ---
+    stat: os.stat_result
+        -- the stat of the image, if it is known already (default None)
+    digest: bool
+        -- also hash the content, see hash_file (default False)
+
+    Returns:
+    ---
+    : tuple
+        -- the path, directory, name, size, mtime (in nanoseconds), width,
+           height, pixels, format, date (ISO) and hash (None if it was not
+           asked for) of the image
+
+    Raises:
+    ---
+    OSError
+    """
+    if stat is None:
+        stat = os_stat(path)
+    width = height = pixels = format = date = None
+    try:
+        from PIL import Image
+
+        with Image.open(path) as image:
+            width, height = image.size
+            pixels = width * height
+            format = image.format
+            exif = image.getexif()
+            value = exif.get_ifd(0x8769).get(36867) or exif.get(306)
+            if isinstance(value, str) and len(value) >= 19:
+                date = f"{value[:4]}-{value[5:7]}-{value[8:10]}T{value[11:19]}"
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"ERROR: {e}. Could not read the header of '{path}'.",
+              file=sys_stderr)
+    return (path, os_path_dirname(path), os_path_basename(path),
+            stat.st_size, stat.st_mtime_ns, width, height, pixels, format,
+            date, hash_file(path) if digest else None)
+
+
+def hash_file(path):
+    """Hash the content of a file with BLAKE2b.
+
+    ---
+    Parameters:
+    ---
+    path: str
+        -- full path to the file
+
+    Returns:
+    ---
+    : str
+        -- the 128-bit digest, in hexadecimal
+
+    Raises:
+    ---
+    OSError
+    """
+    digest = blake2b(digest_size=16)
+    with open(file=path, mode='rb') as file:
+        while True:
+            chunk = file.read(1024 * 1024)
+            if len(chunk) == 0:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Metadata - Indexes the metadata of the images.\n"
+        "Copyright:\n"
+        "    imageviewer::metadata  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # from imageviewer.paths.paths import Paths
+    #
+    # m = Metadata(Paths())
+    # m.start()
+    # m.refresh('D:/Pictures', wait=True)
+    # print(len(m), m.query('D:/Pictures', order='date', descending=True)[:10])
+    # m.close()
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -35,9 +35,13 @@ class Paths:
     def __init__(self):
         """Load the user path and user settings files (*.json).
 
+        ---
+        The user settings files are optional, a missing file is recorded with
+        a modification time of 0.0.
+
         Raises:
         ---
-        NotADirectoryError and FileNotFoundError
+        NotADirectoryError
         """
         try:
             self.__user_path = os_path_expanduser('~').replace('\\', '/')
@@ -50,8 +54,8 @@ class Paths:
                 time = 0.0
                 try:
                     time = os_path_getmtime(file)
-                except FileNotFoundError as e:
-                    print(f"ERROR: {e}.", file=sys_stderr)
+                except OSError:
+                    pass
                 finally:
                     self.__dict_pahts[key] = [file, time, False]
         except NotADirectoryError as e:
@@ -60,9 +64,13 @@ class Paths:
     def check(self):
         """Checks the user path and user settings files (*.json).
 
+        ---
+        Every file is checked with update, so is_modified afterwards tells if
+        the file was modified since the previous check.
+
         Raises:
         ---
-        NotADirectoryError and FileNotFoundError
+        NotADirectoryError
         """
         try:
             if len(self.__user_path) == 0:
@@ -70,24 +78,104 @@ class Paths:
                 if len(self.__user_path) == 0:
                     raise NotADirectoryError('The user directory could not be '
                                              'found')
-            for value in self.__dict_pahts.values():
-                time = value[1]
-                try:
-                    time = os_path_getmtime(value[0])
-                except FileNotFoundError as e:
-                    print(f"ERROR: {e}.", file=sys_stderr)
-                finally:
-                    if time != value[1]:
-                        value[1] = time
-                        value[2] = True
-                    else:
-                        value[2] = False
+            for key in self.__dict_pahts.keys():
+                self.update(key)
         except NotADirectoryError as e:
             print(f"ERROR: {e}.", file=sys_stderr)
 
+    def update(self, file):
+        """Checks a single user settings file (*.json).
+
+        ---
+        The modification time of the file is collected again and the file is
+        marked as modified if it differs from the previous one. A file that
+        was removed is marked as modified with a modification time of 0.0.
+
+        ---
+        Parameters:
+        ---
+        file: str
+            -- name of the file (*.json) to be checked
+
+        Returns:
+        ---
+        : bool
+            -- True if the file was modified, False otherwise
+
+        Raises:
+        ---
+        KeyError
+        """
+        try:
+            value = self.__dict_pahts[file]
+        except KeyError as e:
+            print(f'ERROR: {e}.', file=sys_stderr)
+            return False
+        time = 0.0
+        try:
+            time = os_path_getmtime(value[0])
+        except OSError:
+            pass
+        value[2] = time != value[1]
+        value[1] = time
+        return value[2]
+
+    def clear(self, file):
+        """Marks a user settings file (*.json) as not modified.
+
+        ---
+        Parameters:
+        ---
+        file: str
+            -- name of the file (*.json) that has been handled
+
+        Raises:
+        ---
+        KeyError
+        """
+        try:
+            self.__dict_pahts[file][2] = False
+        except KeyError as e:
+            print(f'ERROR: {e}.', file=sys_stderr)
+
+    def ignore(self, file):
+        """Ignores the last modification of a user settings file (*.json).
+
+        ---
+        The modification time of the file is collected again without marking
+        the file as modified, so the program's own writes (see Writer) are not
+        reported by update, check or a Watcher.
+
+        ---
+        Parameters:
+        ---
+        file: str
+            -- name of the file (*.json) that has just been written
+
+        Raises:
+        ---
+        KeyError
+        """
+        try:
+            value = self.__dict_pahts[file]
+        except KeyError as e:
+            print(f'ERROR: {e}.', file=sys_stderr)
+            return
+        time = 0.0
+        try:
+            time = os_path_getmtime(value[0])
+        except OSError:
+            pass
+        value[1] = time
+        value[2] = False
+
     def is_modified(self, file):
         """Checks if a user settings file (*.json) was modified or not.
 
+        ---
+        Only the state collected by check, update or a Watcher is returned,
+        the file system is not touched.
+
         ---
         Parameters:
         ---
@@ -106,6 +194,66 @@ class Paths:
         finally:
             return modified
 
+    def get_profile_path(self):
+        """Get the profile directory of this program inside the user path.
+
+        ---
+        Returns:
+        ---
+        : str
+            -- full path to the profile directory (~/.imageviewer)
+        """
+        return f"{self.__user_path}/{self.__IMAGEVIEWER_FILE}"
+
+    def get_files(self):
+        """Get the names of the user settings files (*.json).
+
+        ---
+        Returns:
+        ---
+        : list[str]
+            -- names of the files, e.g. 'themes' for user-themes.json
+        """
+        return list(self.__dict_pahts.keys())
+
+    def get_file(self, file):
+        """Get the full path of a user settings file (*.json).
+
+        ---
+        Parameters:
+        ---
+        file: str
+            -- name of the file (*.json), e.g. 'themes'
+
+        Returns:
+        ---
+        : str
+            -- full path to the user settings file, or '' if unknown
+
+        Raises:
+        ---
+        KeyError
+        """
+        try:
+            return self.__dict_pahts[file][0]
+        except KeyError as e:
+            print(f'ERROR: {e}.', file=sys_stderr)
+            return ''
+
+    def get_times(self):
+        """Get the last collected modification times of the user files.
+
+        ---
+        A time of 0.0 means the file did not exist when it was last checked.
+
+        ---
+        Returns:
+        ---
+        : dict[str, float]
+            -- a dict mapping file names to their modification times
+        """
+        return {key: value[1] for key, value in self.__dict_pahts.items()}
+
     def __str__(self):
         """Evaluates to the user profile directory"""
         return f'User profile directory: "{self.__user_path}"'
@@ -122,17 +270,16 @@ def __Main() -> None:
         "    under certain conditions."
     )
     # from time import sleep
+    # from imageviewer.paths.watcher import Watcher
     # p = Paths()
     # print(p)
-    # for _ in range(100):
-    #     sleep(3.0)
-    #     p.check()
-    #     for file in ['settings', 'languages', 'themes',
-    #                  'numbers', 'alphabets', 'words']:
-    #         if p.is_modified(file):
-    #             print(f'*** {file} has been modified.')
-    #         else:
-    #             print(f'{file} has not been modified.')
+    # w = Watcher(p)
+    # w.add_callback(lambda file, path: print(f'*** {file} has been '
+    #                                         f'modified: "{path}"'))
+    # w.start()
+    # print(w)
+    # sleep(300.0)
+    # w.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,331 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from ctypes import CDLL
+from ctypes import get_errno as ctypes_get_errno
+from ctypes.util import find_library as ctypes_util_find_library
+from os import close as os_close
+from os import pipe as os_pipe
+from os import read as os_read
+from os import stat as os_stat
+from os import strerror as os_strerror
+from os import write as os_write
+from os.path import dirname as os_path_dirname
+from os.path import isdir as os_path_isdir
+from os.path import basename as os_path_basename
+from select import select
+from struct import calcsize as struct_calcsize
+from struct import unpack_from as struct_unpack_from
+from sys import platform as sys_platform
+from sys import stderr as sys_stderr
+from threading import Event
+from threading import Lock
+from threading import Thread
+from time import monotonic
+
+
+class Watcher:
+
+    __IN_MODIFY = 0x00000002
+    __IN_CLOSE_WRITE = 0x00000008
+    __IN_MOVED_FROM = 0x00000040
+    __IN_MOVED_TO = 0x00000080
+    __IN_CREATE = 0x00000100
+    __IN_DELETE = 0x00000200
+    __IN_DELETE_SELF = 0x00000400
+    __IN_MOVE_SELF = 0x00000800
+    __IN_IGNORED = 0x00008000
+    __IN_NONBLOCK = 0o4000
+    __IN_CLOEXEC = 0o2000000
+    __IN_MASK = __IN_MODIFY | __IN_CLOSE_WRITE | __IN_MOVED_FROM |\
+        __IN_MOVED_TO | __IN_CREATE | __IN_DELETE | __IN_DELETE_SELF |\
+        __IN_MOVE_SELF
+    __EVENT = 'iIII'
+    __EVENT_SIZE = struct_calcsize(__EVENT)
+
+    __paths = None
+    __debounce = 0.0
+    __interval = 0.0
+    __use_inotify = True
+    __inotify = None
+    __callbacks = []
+    __dict_files = {}
+    __dict_pending = {}
+    __dict_stats = {}
+    __lock = None
+    __thread = None
+    __pipe = None
+    __stopping = None
+
+    def __init__(self, paths, debounce=0.25, interval=1.0, inotify=True):
+        """Watch the user settings files (*.json) of the paths.
+
+        ---
+        On Linux the profile directory is watched with inotify, everywhere
+        else (or if inotify is not available) the files are polled with stat
+        every interval seconds. The inotify thread waits with select on the
+        inotify and a pipe written by stop, the polling thread waits on an
+        Event set by stop, as select only takes sockets on Windows. Bursts of
+        events on a file, like the several
+        writes and renames of an editor saving it, are coalesced until the
+        file has been quiet for the debounce window. Only then the paths are
+        updated and the callbacks are called, once per modified file.
+
+        ---
+        Parameters:
+        ---
+        paths: Paths
+            -- the user paths to be watched and updated
+
+        Keyword arguments:
+        ---
+        debounce: float
+            -- seconds a file must be quiet before it is reported (default
+               0.25)
+        interval: float
+            -- seconds between two polls of the stat fallback (default 1.0)
+        inotify: bool
+            -- use inotify if it is available (default True)
+        """
+        self.__paths = paths
+        self.__debounce = debounce
+        self.__interval = interval
+        self.__use_inotify = inotify and sys_platform.startswith('linux')
+        self.__callbacks = []
+        self.__dict_files = {}
+        for file in paths.get_files():
+            self.__dict_files[os_path_basename(paths.get_file(file))] = file
+        self.__dict_pending = {}
+        self.__dict_stats = {}
+        self.__lock = Lock()
+        self.__stopping = Event()
+
+    def add_callback(self, callback):
+        """Register a callback for the modified user settings files.
+
+        ---
+        The callback is called from the watcher thread, a Tk user interface
+        should hand the event over to its main loop (e.g. with after).
+
+        ---
+        Parameters:
+        ---
+        callback: Callable[[str, str], None]
+            -- called with the name and the full path of a modified file
+        """
+        with self.__lock:
+            if callback not in self.__callbacks:
+                self.__callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """Unregister a callback registered with add_callback.
+
+        ---
+        Parameters:
+        ---
+        callback: Callable[[str, str], None]
+            -- a registered callback
+        """
+        with self.__lock:
+            if callback in self.__callbacks:
+                self.__callbacks.remove(callback)
+
+    def start(self):
+        """Start watching in a background (daemon) thread."""
+        if self.__thread is not None:
+            return
+        self.__stopping.clear()
+        if self.__use_inotify:
+            self.__inotify = self.__open_inotify()
+        if self.__inotify is not None:
+            self.__pipe = os_pipe()
+        else:
+            for file in self.__dict_files.values():
+                self.__dict_stats[file] = self.__stat(file)
+        run = self.__run if self.__inotify is not None else self.__run_polling
+        self.__thread = Thread(target=run,
+                               name='ImageViewer::Watcher',
+                               daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop watching and wait for the background thread to finish."""
+        if self.__thread is None:
+            return
+        self.__stopping.set()
+        if self.__pipe is not None:
+            os_write(self.__pipe[1], b'\0')
+        self.__thread.join()
+        self.__thread = None
+        if self.__pipe is not None:
+            for fd in self.__pipe:
+                os_close(fd)
+            self.__pipe = None
+        if self.__inotify is not None:
+            os_close(self.__inotify[0])
+            self.__inotify = None
+
+    def is_inotify(self):
+        """Checks if the files are watched with inotify or polled with stat.
+
+        ---
+        Returns:
+        ---
+        : bool
+            -- True if inotify is used, False otherwise
+        """
+        return self.__inotify is not None
+
+    def __open_inotify(self):
+        """Open an inotify instance watching the profile directory"""
+        try:
+            libc = CDLL(ctypes_util_find_library('c') or 'libc.so.6',
+                        use_errno=True)
+            fd = libc.inotify_init1(self.__IN_NONBLOCK | self.__IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(os_strerror(ctypes_get_errno()))
+        except (OSError, AttributeError) as e:
+            print(f"ERROR: {e}. Falling back to polling the user files.",
+                  file=sys_stderr)
+            return None
+        inotify = [fd, libc, -1]
+        if not self.__add_watch(inotify):
+            print(f"ERROR: {os_strerror(ctypes_get_errno())}. Falling back to "
+                  f"polling the user files.",
+                  file=sys_stderr)
+            os_close(fd)
+            return None
+        return inotify
+
+    def __add_watch(self, inotify):
+        """Watch the profile directory, or its parent until it is created.
+
+        ---
+        The previous watch is removed, its events are not read anymore.
+        """
+        path = self.__paths.get_profile_path()
+        if not os_path_isdir(path):
+            path = os_path_dirname(path)
+        if inotify[2] >= 0:
+            inotify[1].inotify_rm_watch(inotify[0], inotify[2])
+        inotify[2] = inotify[1].inotify_add_watch(inotify[0], path.encode(),
+                                                  self.__IN_MASK)
+        return inotify[2] >= 0
+
+    def __stat(self, file):
+        """Get the identity of a user file for the stat fallback"""
+        try:
+            stat = os_stat(self.__paths.get_file(file))
+            return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            return None
+
+    def __read_inotify(self):
+        """Read the pending inotify events and mark the touched files"""
+        try:
+            data = os_read(self.__inotify[0], 65536)
+        except BlockingIOError:
+            return
+        profile = os_path_basename(self.__paths.get_profile_path())
+        offset = 0
+        rewatch = False
+        while offset < len(data):
+            wd, mask, _, length = struct_unpack_from(self.__EVENT, data,
+                                                     offset)
+            offset += self.__EVENT_SIZE
+            name = data[offset:offset + length].rstrip(b'\0').decode(
+                errors='replace')
+            offset += length
+            if wd != self.__inotify[2]:
+                continue
+            if mask & (self.__IN_DELETE_SELF | self.__IN_MOVE_SELF |
+                       self.__IN_IGNORED):
+                rewatch = True
+            elif name == profile:
+                rewatch = True
+            elif name in self.__dict_files:
+                self.__touch(self.__dict_files[name])
+        if rewatch:
+            self.__add_watch(self.__inotify)
+            for file in self.__dict_files.values():
+                self.__touch(file)
+
+    def __poll(self):
+        """Stat all the user files and mark the touched ones"""
+        for file in self.__dict_files.values():
+            stat = self.__stat(file)
+            if stat != self.__dict_stats.get(file):
+                self.__dict_stats[file] = stat
+                self.__touch(file)
+
+    def __touch(self, file):
+        """Restart the debounce window of a user file"""
+        self.__dict_pending[file] = monotonic() + self.__debounce
+
+    def __deliver(self):
+        """Report the user files that have been quiet for the debounce
+           window
+        """
+        now = monotonic()
+        files = [file for file, deadline in self.__dict_pending.items()
+                 if deadline <= now]
+        for file in files:
+            del self.__dict_pending[file]
+            if not self.__paths.update(file):
+                continue
+            with self.__lock:
+                callbacks = list(self.__callbacks)
+            for callback in callbacks:
+                try:
+                    callback(file, self.__paths.get_file(file))
+                except Exception as e:
+                    print(f"ERROR: {e}. In the callback for user-{file}.json.",
+                          file=sys_stderr)
+
+    def __run(self):
+        """Wait for the inotify events until stop is called"""
+        fds = [self.__pipe[0], self.__inotify[0]]
+        while True:
+            timeout = None
+            if len(self.__dict_pending) > 0:
+                timeout = max(0.0, min(self.__dict_pending.values()) -
+                              monotonic())
+            ready, _, _ = select(fds, [], [], timeout)
+            if self.__pipe[0] in ready:
+                return
+            if self.__inotify[0] in ready:
+                self.__read_inotify()
+            self.__deliver()
+
+    def __run_polling(self):
+        """Poll the user files until stop is called"""
+        poll = monotonic() + self.__interval
+        while True:
+            now = monotonic()
+            timeout = poll - now
+            if len(self.__dict_pending) > 0:
+                timeout = min(timeout, min(self.__dict_pending.values()) - now)
+            if self.__stopping.wait(max(0.0, timeout)):
+                return
+            if monotonic() >= poll:
+                self.__poll()
+                poll = monotonic() + self.__interval
+            self.__deliver()
+
+    def __str__(self):
+        """Evaluates to the watching mode and the profile directory"""
+        mode = 'inotify' if self.is_inotify() else 'stat polling'
+        return f'Watching "{self.__paths.get_profile_path()}" with {mode}'
@@ -0,0 +1,334 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import deque
+from sys import stderr as sys_stderr
+from threading import Condition
+from threading import Thread
+from time import monotonic
+
+
+class Player:
+
+    __MINIMUM_DURATION = 20
+    __DEFAULT_DURATION = 100
+    __STALL = 5
+
+    __path = ''
+    __widget = None
+    __show = None
+    __capacity = 0
+    __budget = 0
+    __ring = None
+    __bytes = 0
+    __condition = None
+    __thread = None
+    __stopping = False
+    __finished = False
+    __canvas = None
+    __after = None
+    __deadline = 0.0
+    __paused = 0.0
+    __dict_stats = {}
+
+    def __init__(self, path, widget, show, buffer=32,
+                 budget=64 * 1024 * 1024):
+        """Play an animated GIF, APNG or WebP image.
+
+        ---
+        A worker thread decodes the frames ahead into a ring buffer bounded in
+        frames and in bytes. Every frame is stored as the region that changed
+        since the previous one, and composited on the shown frame when it is
+        its turn, so long animations take little memory. The frames are
+        scheduled with the after method of the widget against the sum of the
+        frame durations since the start, so the delays of the Tk event loop do
+        not add up. A frame whose turn has passed is composited but not shown,
+        and counted as dropped. The animation is played as many times as its
+        loop count says, forever for a loop count of 0 and once without one.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+        widget: tkinter.Misc
+            -- any widget, its after and after_cancel methods are used
+        show: Callable[[PIL.Image.Image], None]
+            -- shows a frame, called from the Tk main thread. The frame is
+               changed afterwards, it must be copied (e.g. into a PhotoImage)
+
+        Keyword arguments:
+        ---
+        buffer: int
+            -- maximum number of frames decoded ahead (default 32)
+        budget: int
+            -- maximum number of bytes of the frames decoded ahead (default
+               64 MiB)
+        """
+        self.__path = path
+        self.__widget = widget
+        self.__show = show
+        self.__capacity = max(1, buffer)
+        self.__budget = budget
+        self.__ring = deque()
+        self.__bytes = 0
+        self.__condition = Condition()
+        self.__stopping = False
+        self.__finished = False
+        self.__canvas = None
+        self.__after = None
+        self.__dict_stats = {'shown': 0, 'dropped': 0, 'stalls': 0,
+                             'loops': 0, 'decoded': 0}
+
+    def play(self):
+        """Start or resume playing, or play again an animation that ended."""
+        if self.__after is not None:
+            return
+        if self.__thread is not None:
+            with self.__condition:
+                ended = self.__finished and len(self.__ring) == 0
+            if ended:
+                self.__thread.join()
+                self.__thread = None
+        if self.__thread is None:
+            self.__stopping = False
+            self.__finished = False
+            self.__canvas = None
+            self.__dict_stats['loops'] = 0
+            self.__thread = Thread(target=self.__decode,
+                                   name='ImageViewer::Player',
+                                   daemon=True)
+            self.__thread.start()
+            self.__deadline = monotonic()
+        else:
+            self.__deadline += monotonic() - self.__paused
+        self.__after = self.__widget.after(0, self.__tick)
+
+    def pause(self):
+        """Pause playing, the frames stay decoded ahead."""
+        if self.__after is None:
+            return
+        self.__widget.after_cancel(self.__after)
+        self.__after = None
+        self.__paused = monotonic()
+
+    def stop(self):
+        """Stop playing and the worker thread."""
+        self.pause()
+        if self.__thread is None:
+            return
+        with self.__condition:
+            self.__stopping = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        self.__thread = None
+        self.__ring.clear()
+        self.__bytes = 0
+
+    def is_playing(self):
+        """Checks if the animation is playing"""
+        return self.__after is not None
+
+    def get_stats(self):
+        """Get the counters of the playback.
+
+        ---
+        Returns:
+        ---
+        : dict[str, int]
+            -- 'shown', 'dropped' (composited too late to be shown),
+               'stalls' (the decoding fell behind), 'loops', 'decoded',
+               'buffered' (frames decoded ahead) and 'buffered_bytes'
+        """
+        with self.__condition:
+            stats = dict(self.__dict_stats)
+            stats['buffered'] = len(self.__ring)
+            stats['buffered_bytes'] = self.__bytes
+        return stats
+
+    def __tick(self):
+        """Composite the frames whose turn has come and show the last one"""
+        self.__after = None
+        now = monotonic()
+        frames = []
+        with self.__condition:
+            while len(self.__ring) > 0 and self.__deadline <= now:
+                frame = self.__ring.popleft()
+                self.__bytes -= frame[3]
+                frames.append(frame)
+                if frame[0] is None:
+                    break
+                self.__deadline += frame[0] / 1000.0
+            self.__condition.notify_all()
+            empty = len(self.__ring) == 0
+            finished = self.__finished
+        if len(frames) > 0 and frames[-1][0] is None:
+            frames.pop()
+            finished = True
+        for frame in frames:
+            self.__composite(frame)
+        if len(frames) > 0:
+            self.__dict_stats['shown'] += 1
+            self.__dict_stats['dropped'] += len(frames) - 1
+            try:
+                self.__show(self.__canvas)
+            except Exception as e:
+                print(f"ERROR: {e}. In the player show callback.",
+                      file=sys_stderr)
+        if finished and empty:
+            return
+        if empty and self.__deadline <= now:
+            if self.__canvas is not None:
+                self.__dict_stats['stalls'] += 1
+            self.__deadline = now + self.__STALL / 1000.0
+        delay = max(0, int((self.__deadline - monotonic()) * 1000.0))
+        self.__after = self.__widget.after(delay, self.__tick)
+
+    def __composite(self, frame):
+        """Paste the changed region of a frame on the shown frame"""
+        _, box, region, _ = frame
+        if box is None:
+            self.__canvas = region
+        elif region is not None:
+            self.__canvas.paste(region, box[:2])
+
+    def __put(self, frame):
+        """Wait for room in the ring buffer and add a frame to it"""
+        with self.__condition:
+            while not self.__stopping and len(self.__ring) > 0 and \
+                (len(self.__ring) >= self.__capacity or
+                 self.__bytes + frame[3] > self.__budget):
+                self.__condition.wait()
+            if self.__stopping:
+                return False
+            self.__ring.append(frame)
+            self.__bytes += frame[3]
+            self.__dict_stats['decoded'] += 1
+            return True
+
+    def __decode(self):
+        """Decode the frames ahead until the animation ends or stop is
+           called
+        """
+        try:
+            from PIL import Image
+            from PIL import ImageChops
+
+            with Image.open(self.__path) as image:
+                frames = getattr(image, 'n_frames', 1)
+                loops = image.info.get('loop', 1)
+                previous = None
+                index = played = 0
+                while True:
+                    image.seek(index)
+                    current = image.convert('RGBA')
+                    duration = image.info.get('duration') or\
+                        self.__DEFAULT_DURATION
+                    duration = max(self.__MINIMUM_DURATION, duration)
+                    if previous is None or index == 0:
+                        frame = (duration, None, current, get_bytes(current))
+                    else:
+                        box = get_box(ImageChops.difference(current,
+                                                            previous))
+                        if box is None:
+                            frame = (duration, (0, 0, 0, 0), None, 0)
+                        else:
+                            region = current.crop(box)
+                            frame = (duration, box, region, get_bytes(region))
+                    if not self.__put(frame):
+                        return
+                    previous = current
+                    index = (index + 1) % frames
+                    if index == 0:
+                        played += 1
+                        self.__dict_stats['loops'] = played
+                        if frames == 1 or (loops > 0 and played >= loops):
+                            break
+        except Exception as e:
+            print(f"ERROR: {e}. Could not play '{self.__path}'.",
+                  file=sys_stderr)
+        with self.__condition:
+            self.__finished = True
+        self.__put((None, None, None, 0))
+
+    def __str__(self):
+        """Evaluates to the path and the counters of the playback"""
+        stats = self.get_stats()
+        return f'"{self.__path}": {stats["shown"]} shown, '\
+               f'{stats["dropped"]} dropped, {stats["stalls"]} stall(s)'
+
+
+def get_box(difference):
+    """Get the bounding box of the changed pixels of a difference image.
+
+    ---
+    Every band is checked, getbbox alone only checks the alpha band of RGBA
+    images in recent Pillow versions.
+
+    ---
+    Parameters:
+    ---
+    difference: PIL.Image.Image
+        -- the difference of two frames
+
+    Returns:
+    ---
+    : tuple[int, int, int, int] | None
+        -- left, top, right and bottom of the changed pixels, None if no
+           pixel changed
+    """
+    boxes = [box for box in (band.getbbox() for band in difference.split())
+             if box is not None]
+    if len(boxes) == 0:
+        return None
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+def get_bytes(image):
+    """Get the number of bytes of a RGBA frame"""
+    return image.width * image.height * 4
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Player - Plays the animated images.\n"
+        "Copyright:\n"
+        "    imageviewer::player  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # import tkinter
+    # from PIL import ImageTk
+    #
+    # root = tkinter.Tk()
+    # label = tkinter.Label(root)
+    # label.pack()
+    #
+    # def show(frame):
+    #     label.image = ImageTk.PhotoImage(frame)
+    #     label.configure(image=label.image)
+    #
+    # p = Player('D:/Pictures/animation.gif', root, show)
+    # p.play()
+    # root.after(10000, lambda: print(p))
+    # root.mainloop()
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,396 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from functools import lru_cache
+from time import perf_counter
+
+
+class Resampler:
+
+    __FILTERS = ('nearest', 'bilinear', 'box')
+    __BACKENDS = ('numpy', 'pillow')
+
+    __numpy = None
+    __pillow = None
+    __backend = ''
+    __dict_backends = {}
+    __dict_buffers = {}
+
+    def __init__(self, backend='auto'):
+        """Resize images held in NumPy arrays, for zooming and fitting.
+
+        ---
+        The output and the intermediate arrays are kept and reused as long as
+        the sizes do not change, so panning at a fixed zoom allocates nothing.
+        The NumPy backend is vectorised: nearest gathers the rows and the
+        columns, bilinear and box filter the columns and then the rows with
+        one gather per filter offset, with the coefficients of Pillow (see
+        get_coefficients), so both backends give the same images up to the
+        rounding. The colours of an image with an alpha band (2 or 4
+        channels) are filtered premultiplied by the alpha, as Pillow does,
+        so transparent pixels do not bleed into the opaque ones. With the
+        'auto' backend every filter uses whichever of NumPy and Pillow
+        resizes a test image faster, for shrinking and for enlarging,
+        measured the first time it is needed. The images Pillow can not hold
+        (see is_pillow) are always resized with NumPy, and the images with
+        an alpha band always with Pillow if it is installed: Pillow rounds
+        the premultiplied colours to 8 bits, which shows in the faint
+        pixels, so the images would depend on the timing otherwise.
+
+        ---
+        Keyword arguments:
+        ---
+        backend: str
+            -- 'numpy', 'pillow' or 'auto' (default 'auto')
+
+        Raises:
+        ---
+        ImportError and ValueError
+        """
+        import numpy
+
+        if backend not in self.__BACKENDS + ('auto',):
+            raise ValueError(f"'{backend}' is not a valid backend")
+        self.__numpy = numpy
+        self.__pillow = None
+        self.__backend = backend
+        self.__dict_backends = {}
+        self.__dict_buffers = {}
+
+    def resize(self, array, size, filter='bilinear', out=None):
+        """Resize an image.
+
+        ---
+        Parameters:
+        ---
+        array: numpy.ndarray
+            -- the image, height by width (by channels), of 8 bit integers or
+               any other numeric type
+        size: tuple[int, int]
+            -- width and height of the resized image
+
+        Keyword arguments:
+        ---
+        filter: str
+            -- 'nearest', 'bilinear' or 'box' (default 'bilinear')
+        out: numpy.ndarray
+            -- the array to write the resized image into (default None, a
+               buffer of the resampler which the next resize of the same
+               shape overwrites)
+
+        Returns:
+        ---
+        : numpy.ndarray
+            -- the resized image, out if it was given
+
+        Raises:
+        ---
+        ValueError
+        """
+        if filter not in self.__FILTERS:
+            raise ValueError(f"'{filter}' is not a valid filter")
+        width, height = max(1, int(size[0])), max(1, int(size[1]))
+        if out is None:
+            out = self.__buffer('out', (height, width) + array.shape[2:],
+                                array.dtype)
+        backend = self.get_backend(filter, width > array.shape[1] or
+                                   height > array.shape[0],
+                                   array.ndim == 3 and
+                                   array.shape[2] in (2, 4))
+        if backend == 'pillow' and is_pillow(array):
+            return self.__resize_pillow(array, filter, out)
+        if filter == 'nearest':
+            return self.__nearest(array, out)
+        return self.__convolve(array, filter, out)
+
+    def get_backend(self, filter='bilinear', enlarge=False, alpha=False):
+        """Get the backend resizing with a filter.
+
+        ---
+        Keyword arguments:
+        ---
+        filter: str
+            -- 'nearest', 'bilinear' or 'box' (default 'bilinear')
+        enlarge: bool
+            -- the backend enlarging, instead of shrinking (default False)
+        alpha: bool
+            -- the backend of the images with an alpha band (default False)
+
+        Returns:
+        ---
+        : str
+            -- 'numpy' or 'pillow'
+        """
+        if self.__backend != 'auto':
+            return self.__backend
+        if alpha and filter != 'nearest' and self.__has_pillow():
+            return 'pillow'
+        key = (filter, enlarge)
+        backend = self.__dict_backends.get(key)
+        if backend is None:
+            backend = self.__calibrate(filter, enlarge)
+            self.__dict_backends[key] = backend
+        return backend
+
+    def __has_pillow(self):
+        """Checks if Pillow is installed, importing it only once"""
+        if self.__pillow is None:
+            try:
+                import PIL  # noqa: F401
+
+                self.__pillow = True
+            except ImportError:
+                self.__pillow = False
+        return self.__pillow
+
+    def __calibrate(self, filter, enlarge):
+        """Time both backends resizing a test image, return the faster one"""
+        if not self.__has_pillow():
+            return 'numpy'
+        numpy = self.__numpy
+        source, size = ((800, 600), (1920, 1440)) if enlarge else\
+            ((2400, 1800), (1280, 960))
+        array = numpy.arange(source[0] * source[1] * 3, dtype=numpy.uint8)
+        array = array.reshape((source[1], source[0], 3))
+        out = numpy.empty((size[1], size[0], 3), dtype=numpy.uint8)
+        times = {}
+        for backend in self.__BACKENDS:
+            self.__dict_backends[(filter, enlarge)] = backend
+            best = float('inf')
+            for _ in range(2):
+                start = perf_counter()
+                self.resize(array, size, filter, out)
+                best = min(best, perf_counter() - start)
+            times[backend] = best
+        return min(times, key=times.get)
+
+    def __buffer(self, name, shape, dtype):
+        """Get a kept array, allocated again only if the shape changed"""
+        buffer = self.__dict_buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self.__numpy.empty(shape, dtype=dtype)
+            self.__dict_buffers[name] = buffer
+        return buffer
+
+    def __nearest(self, array, out):
+        """Resize gathering the nearest rows and columns"""
+        numpy = self.__numpy
+        rows = get_nearest(array.shape[0], out.shape[0])
+        columns = get_nearest(array.shape[1], out.shape[1])
+        gathered = self.__buffer('rows', (out.shape[0],) + array.shape[1:],
+                                 array.dtype)
+        numpy.take(array, rows, axis=0, out=gathered)
+        numpy.take(gathered, columns, axis=1, out=out)
+        return out
+
+    def __convolve(self, array, filter, out):
+        """Resize with a separable filter, the columns and then the rows"""
+        numpy = self.__numpy
+        alpha = array.ndim == 3 and array.shape[2] in (2, 4)
+        if alpha:
+            premultiplied = self.__buffer('premultiplied', array.shape,
+                                          numpy.float32)
+            numpy.multiply(array, array[:, :, -1:], out=premultiplied,
+                           dtype=numpy.float32)
+            premultiplied[:, :, -1] = array[:, :, -1]
+            array = premultiplied
+        columns = self.__pass(array, out.shape[1], 1, filter, 'columns')
+        rows = self.__pass(columns, out.shape[0], 0, filter, 'rows')
+        if alpha:
+            colours, alphas = rows[:, :, :-1], rows[:, :, -1:]
+            transparent = alphas <= 0.0
+            numpy.divide(colours, alphas, out=colours,
+                         where=~transparent)
+            numpy.copyto(colours, 0.0, where=transparent)
+        return self.__store(rows, out)
+
+    def __pass(self, array, size, axis, filter, name):
+        """Resample along an axis, one gather per offset in the filter"""
+        numpy = self.__numpy
+        indices, weights = get_coefficients(array.shape[axis], size, filter)
+        shape = list(array.shape)
+        shape[axis] = size
+        shape = tuple(shape)
+        extra = (1,) * (array.ndim - 1 - axis)
+        sums = self.__buffer(name, shape, numpy.float32)
+        gathered = self.__buffer(f"{name} gathered", shape, array.dtype)
+        weighted = self.__buffer(f"{name} weighted", shape, numpy.float32)
+        for offset in range(len(indices)):
+            numpy.take(array, indices[offset], axis=axis, out=gathered)
+            numpy.multiply(gathered, weights[offset].reshape((-1,) + extra),
+                           out=sums if offset == 0 else weighted)
+            if offset > 0:
+                sums += weighted
+        return sums
+
+    def __store(self, values, out):
+        """Round the values into the output, if it holds integers"""
+        numpy = self.__numpy
+        if numpy.issubdtype(out.dtype, numpy.integer):
+            limits = numpy.iinfo(out.dtype)
+            numpy.rint(values, out=values)
+            numpy.clip(values, limits.min, limits.max, out=values)
+        numpy.copyto(out, values, casting='unsafe')
+        return out
+
+    def __resize_pillow(self, array, filter, out):
+        """Resize with Pillow, copying the image in and out"""
+        from PIL import Image
+
+        resample = {'nearest': Image.NEAREST,
+                    'bilinear': Image.BILINEAR,
+                    'box': Image.BOX}[filter]
+        image = Image.fromarray(self.__numpy.ascontiguousarray(array))
+        image = image.resize((out.shape[1], out.shape[0]), resample)
+        self.__numpy.copyto(out, self.__numpy.asarray(image),
+                            casting='unsafe')
+        return out
+
+    def __str__(self):
+        """Evaluates to the backend of every filter, shrinking/enlarging"""
+        if self.__backend != 'auto':
+            return ', '.join(f"{filter}: {self.__backend}"
+                             for filter in self.__FILTERS)
+        return ', '.join(
+            f"{filter}: {self.__dict_backends.get((filter, False), '?')}/"
+            f"{self.__dict_backends.get((filter, True), '?')}"
+            for filter in self.__FILTERS)
+
+
+def is_pillow(array):
+    """Checks if Pillow can resize an image held in an array.
+
+    ---
+    Parameters:
+    ---
+    array: numpy.ndarray
+        -- the image, height by width (by channels)
+
+    Returns:
+    ---
+    : bool
+        -- True for 8 bit L, RGB and RGBA images and for 32 bit integer or
+           floating point grayscale images, False otherwise
+    """
+    name = array.dtype.name
+    if name == 'uint8':
+        return array.ndim == 2 or (array.ndim == 3 and
+                                   array.shape[2] in (3, 4))
+    return array.ndim == 2 and name in ('int32', 'float32')
+
+
+@lru_cache(maxsize=64)
+def get_nearest(length, size):
+    """Get the source index of every output index, sampling the centers.
+
+    ---
+    The centers are stepped by repeated additions, as Pillow does, so both
+    backends pick the same pixels, even when a center falls on an edge.
+
+    ---
+    Parameters:
+    ---
+    length: int
+        -- number of source pixels
+    size: int
+        -- number of output pixels
+
+    Returns:
+    ---
+    : numpy.ndarray
+        -- the indices, read-only
+    """
+    import numpy
+
+    steps = numpy.full(size, length / size)
+    steps[0] *= 0.5
+    indices = numpy.add.accumulate(steps).astype(numpy.intp)
+    numpy.minimum(indices, length - 1, out=indices)
+    indices.flags.writeable = False
+    return indices
+
+
+@lru_cache(maxsize=64)
+def get_coefficients(length, size, filter):
+    """Get the source indices and the weights of every output pixel.
+
+    ---
+    The coefficients are the ones Pillow computes, so both backends give
+    the same images (up to the rounding of Pillow's fixed point): the filter
+    is stretched over the source pixels of an output pixel when shrinking,
+    which antialiases, and the weights of every output pixel add up to 1.
+
+    ---
+    Parameters:
+    ---
+    length: int
+        -- number of source pixels
+    size: int
+        -- number of output pixels
+    filter: str
+        -- 'bilinear' or 'box'
+
+    Returns:
+    ---
+    : tuple[numpy.ndarray, numpy.ndarray]
+        -- the indices and the float32 weights, offsets by output pixels,
+           read-only (the weights past the pixels of an output pixel are 0)
+    """
+    import numpy
+
+    scale = length / size
+    stretch = max(1.0, scale)
+    support = (1.0 if filter == 'bilinear' else 0.5) * stretch
+    centers = (numpy.arange(size) + 0.5) * scale
+    starts = numpy.maximum((centers - support + 0.5).astype(numpy.intp), 0)
+    ends = numpy.minimum((centers + support + 0.5).astype(numpy.intp), length)
+    offsets = numpy.arange(int((ends - starts).max()))[:, None]
+    indices = starts[None, :] + offsets
+    distances = (indices - centers[None, :] + 0.5) / stretch
+    if filter == 'bilinear':
+        weights = numpy.maximum(1.0 - numpy.abs(distances), 0.0)
+    else:
+        weights = ((distances > -0.5) & (distances <= 0.5)).astype(float)
+    weights[indices >= ends[None, :]] = 0.0
+    totals = weights.sum(axis=0)
+    weights /= numpy.where(totals > 0.0, totals, 1.0)
+    indices = numpy.minimum(indices, length - 1)
+    weights = weights.astype(numpy.float32)
+    indices.flags.writeable = False
+    weights.flags.writeable = False
+    return indices, weights
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Resample - Resizes the images.\n"
+        "Copyright:\n"
+        "    imageviewer::resample  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # import numpy
+    #
+    # r = Resampler()
+    # image = numpy.zeros((4000, 6000, 3), dtype=numpy.uint8)
+    # print(r.resize(image, (1920, 1280), 'box').shape)
+    # print(r)
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
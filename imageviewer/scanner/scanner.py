@@ -0,0 +1,290 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import insort
+from os import scandir as os_scandir
+from os.path import splitext as os_path_splitext
+from re import compile as re_compile
+from sys import stderr as sys_stderr
+from threading import Lock
+from threading import Thread
+from threading import current_thread
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+
+class Scanner:
+
+    __EXTENSIONS = frozenset((
+        '.bmp', '.dib', '.gif', '.ico', '.j2k', '.jp2', '.jpe', '.jpeg',
+        '.jpg', '.jpx', '.pbm', '.pgm', '.png', '.pnm', '.ppm', '.tif',
+        '.tiff', '.webp'
+    ))
+    __MAGICS = (
+        b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a', b'BM',
+        b'II*\0', b'MM\0*', b'\0\0\1\0', b'\0\0\0\x0cjP  \r\n\x87\n',
+        b'\xffO\xffQ', b'P1', b'P2', b'P3', b'P4', b'P5', b'P6'
+    )
+    __MAGIC_SIZE = 16
+
+    __path = ''
+    __batch = 0
+    __magic = False
+    __list_paths = None
+    __lock = None
+    __thread = None
+    __stopping = False
+    __done = False
+
+    def __init__(self, path, batch=256, magic=False):
+        """Scan a directory for images, keeping them in natural order.
+
+        ---
+        The entries are listed with os.scandir and handed out in batches, so
+        the first images can be shown while a large directory is still being
+        scanned. The images are inserted into a sorted list (a SortedList if
+        sortedcontainers is installed) by natural order, i.e. 'img2.jpg'
+        before 'img10.jpg'.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the directory
+
+        Keyword arguments:
+        ---
+        batch: int
+            -- number of entries in a batch (default 256)
+        magic: bool
+            -- also check the first bytes of the files without an image
+               extension (default False)
+        """
+        self.__path = path
+        self.__batch = max(1, batch)
+        self.__magic = magic
+        self.__list_paths = SortedList() if SortedList is not None else []
+        self.__lock = Lock()
+        self.__stopping = False
+        self.__done = False
+
+    def scan(self):
+        """Scan the directory, yielding the images batch by batch.
+
+        ---
+        The images found by a previous scan are forgotten, so scanning again
+        picks up the changes of the directory.
+
+        ---
+        Returns:
+        ---
+        : Iterator[list[str]]
+            -- the full paths to the images of every batch, in natural order
+        """
+        with self.__lock:
+            self.__list_paths = SortedList() if SortedList is not None\
+                else []
+        self.__done = False
+        batch = []
+        try:
+            with os_scandir(self.__path) as entries:
+                for entry in entries:
+                    if self.__stopping:
+                        break
+                    if self.__is_image(entry):
+                        batch.append((get_key(entry.name), entry.path))
+                    if len(batch) >= self.__batch:
+                        yield self.__add(batch)
+                        batch = []
+        except OSError as e:
+            print(f"ERROR: {e}. Could not scan '{self.__path}'.",
+                  file=sys_stderr)
+        if len(batch) > 0:
+            yield self.__add(batch)
+        self.__done = not self.__stopping
+
+    def start(self, callback=None):
+        """Scan the directory in a background (daemon) thread.
+
+        ---
+        The callback is called from the scanning thread, a Tk user interface
+        must hand the batch over to the main thread (e.g. with after) before
+        showing it. Nothing is done while a scan is running, a finished scan
+        is started again.
+
+        ---
+        Keyword arguments:
+        ---
+        callback: Callable[[list[str], int], None]
+            -- called with the full paths to the images of every batch and
+               the number of images found so far (default None)
+        """
+        if self.__thread is not None:
+            return
+        self.__stopping = False
+        self.__thread = Thread(target=self.__run, args=(callback,),
+                               name='ImageViewer::Scanner', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop scanning and wait for the background thread to finish."""
+        thread = self.__thread
+        if thread is None:
+            return
+        self.__stopping = True
+        thread.join()
+        self.__thread = None
+
+    def is_done(self):
+        """Checks if the whole directory has been scanned"""
+        return self.__done
+
+    def get_paths(self):
+        """Get the images found so far.
+
+        ---
+        Returns:
+        ---
+        : list[str]
+            -- the full paths to the images, in natural order
+        """
+        with self.__lock:
+            return [path for _, path in self.__list_paths]
+
+    def get_count(self):
+        """Get the number of images found so far"""
+        return len(self.__list_paths)
+
+    def get_status(self, strings, language_code=''):
+        """Get the number of images found so far, for the statusbar.
+
+        ---
+        Parameters:
+        ---
+        strings: Strings
+            -- the loaded strings
+
+        Keyword arguments:
+        ---
+        language_code: str
+            -- ISO language code of the default language (default ' ')
+
+        Returns:
+        ---
+        : str
+            -- e.g. '1024 Images', with localised digits and word
+        """
+        return f"{strings.get_number(self.get_count(), language_code)} "\
+               f"{strings.get_word('Images', language_code)}"
+
+    def __run(self, callback):
+        """Scan the directory and call the callback for every batch"""
+        try:
+            for batch in self.scan():
+                if callback is None:
+                    continue
+                try:
+                    callback(batch, self.get_count())
+                except Exception as e:
+                    print(f"ERROR: {e}. In the scanner callback.",
+                          file=sys_stderr)
+        finally:
+            if self.__thread is current_thread():
+                self.__thread = None
+
+    def __is_image(self, entry):
+        """Checks if a directory entry is an image file"""
+        try:
+            if not entry.is_file():
+                return False
+        except OSError:
+            return False
+        if os_path_splitext(entry.name)[1].lower() in self.__EXTENSIONS:
+            return True
+        if not self.__magic:
+            return False
+        try:
+            with open(file=entry.path, mode='rb') as file:
+                head = file.read(self.__MAGIC_SIZE)
+        except OSError:
+            return False
+        return head.startswith(self.__MAGICS) or \
+            (head[:4] == b'RIFF' and head[8:12] == b'WEBP')
+
+    def __add(self, batch):
+        """Insert a batch into the sorted images"""
+        batch.sort()
+        with self.__lock:
+            if SortedList is not None:
+                self.__list_paths.update(batch)
+            elif len(batch) * 8 < len(self.__list_paths):
+                for item in batch:
+                    insort(self.__list_paths, item)
+            else:
+                self.__list_paths.extend(batch)
+                self.__list_paths.sort()
+        return [path for _, path in batch]
+
+    def __str__(self):
+        """Evaluates to the directory and the number of images found"""
+        state = 'scanned' if self.__done else 'scanning'
+        return f'"{self.__path}": {len(self.__list_paths)} image(s), {state}'
+
+
+__DIGITS = re_compile(r'(\d+)')
+
+
+def get_key(name):
+    """Get the natural sort key of a file name.
+
+    ---
+    Parameters:
+    ---
+    name: str
+        -- the file name
+
+    Returns:
+    ---
+    : tuple
+        -- the text (case folded) and the numbers of the name alternating,
+           then the name itself to order equal keys
+    """
+    parts = __DIGITS.split(name)
+    return (tuple(int(part) if index % 2 else part.casefold()
+                  for index, part in enumerate(parts)), name)
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Scanner - Scans the directories for images.\n"
+        "Copyright:\n"
+        "    imageviewer::scanner  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # s = Scanner('D:/Pictures', batch=256)
+    # for batch in s.scan():
+    #     print(len(batch), s.get_count())
+    # print(s, s.get_paths()[:10])
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -30,23 +30,46 @@ class Settings:
     __dict_settings = {}
 
     __statusbar = None
+    __cache = None
 
-    def __init__(self, path_root, languages, strings, themes):
+    __writer = None
+
+    def __init__(self, path_root, languages, strings, themes, state=None):
         """Load the system settings from the root path.
 
         ---
         The path_root sould be full path to the root of this project.
+        If the state is given (see get_state) the settings are restored from
+        it, the settings file is not read at all and the languages, strings
+        and themes are expected to be restored already.
 
         ---
         Parameters:
         ---
         path_root: str
             -- full path to the root of this program
+        languages: Languages
+            -- the loaded languages
+        strings: Strings
+            -- the loaded strings
+        themes: Themes
+            -- the loaded themes
+
+        Keyword arguments:
+        ---
+        state: dict
+            -- a state previously returned by get_state (default None)
 
         Raises:
         ---
         FileNotFoundError and ValueError
         """
+        if state is not None:
+            self.__languages = languages
+            self.__strings = strings
+            self.__themes = themes
+            self.set_state(state)
+            return
         path = path_root + '/' + self.__PATH_SETTINGS
         with open(file=path, mode='rt', encoding='utf-8') as file:
             self.__dict_settings = json_load(file)
@@ -59,8 +82,9 @@ class Settings:
             self.__strings = strings
             self.__themes = themes
             self.__statusbar = self.__dict_settings['statusbar']
+            self.__cache = self.__dict_settings['cache']
 
-    def set(self, language='', theme='', statusbar=None):
+    def set(self, language='', theme='', statusbar=None, cache=None):
         """Set the default settings.
 
         ---
@@ -78,6 +102,8 @@ class Settings:
             -- name of the default theme (default ' ')
         statusbar: bool
             -- visibility of the statusbar (default None)
+        cache: int
+            -- budget of the decoded image cache in bytes (default None)
 
         Raises:
         ---
@@ -88,9 +114,33 @@ class Settings:
         self.__themes.set(theme)
         if statusbar is not None:
             self.__statusbar = statusbar
+        if cache is not None:
+            if isinstance(cache, int) and not isinstance(cache, bool) and \
+               cache >= 0:
+                self.__cache = cache
+            else:
+                print(f"ERROR: '{cache}' is not a valid cache budget.",
+                      f"       Keeping the previous one, {self.__cache}.",
+                      sep='\n',
+                      file=sys_stderr)
         self.__dict_settings['language'] = self.__languages.get_code()
         self.__dict_settings['theme'] = self.__themes.get_name()
         self.__dict_settings['statusbar'] = self.__statusbar
+        self.__dict_settings['cache'] = self.__cache
+        if self.__writer is not None:
+            self.__writer.schedule(self.__dict_settings)
+
+    def set_writer(self, writer):
+        """Set the writer saving the settings whenever they are set.
+
+        ---
+        Parameters:
+        ---
+        writer: Writer | None
+            -- a (started) writer of the user settings file, or None to stop
+               saving the settings
+        """
+        self.__writer = writer
 
     def get(self, thing):
         """Get the setting by name.
@@ -103,7 +153,7 @@ class Settings:
 
         Returns:
         ---
-        : str | dict | bool
+        : str | dict | bool | int
             -- value of the given thing
 
         Raises:
@@ -120,8 +170,25 @@ class Settings:
             return self.__themes.get_name()
         if thing == 'statusbar':
             return self.__statusbar
+        if thing == 'cache':
+            return self.__cache
+        if thing == 'decoder workers':
+            return self.__get_decoder('workers', 2, 1)
+        if thing == 'decoder prefetch':
+            return self.__get_decoder('prefetch', 1, 0)
         return None
 
+    def __get_decoder(self, name, default, minimum):
+        """Get a decoder setting, the default if it is missing or invalid"""
+        value = self.__dict_settings.get('decoder', {}).get(name, default)
+        if not isinstance(value, int) or isinstance(value, bool):
+            print(f"ERROR: '{value}' is not a valid decoder {name} setting.",
+                  f"       Using the default, {default}.",
+                  sep='\n',
+                  file=sys_stderr)
+            return default
+        return max(minimum, value)
+
     def load(self, path_full):
         """Load the user settings from the given full path.
 
@@ -142,14 +209,22 @@ class Settings:
         with open(file=path_full, mode='rt', encoding='utf-8') as file:
             dict_settings = json_load(file)
             for name, setting in dict_settings.items():
+                if isinstance(setting, dict) and \
+                   isinstance(self.__dict_settings.get(name), dict):
+                    setting = {**self.__dict_settings[name], **setting}
                 self.__dict_settings[name] = setting
             self.set(self.__dict_settings['language'],
                      self.__dict_settings['theme'],
-                     self.__dict_settings['statusbar'])
+                     self.__dict_settings['statusbar'],
+                     self.__dict_settings['cache'])
 
     def dump(self, file):
         """Dump the settings dict into the user-settings file.
 
+        ---
+        The file is written synchronously, see set_writer to save the
+        settings atomically in the background instead.
+
         ---
         Parameters:
         ---
@@ -171,6 +246,34 @@ class Settings:
                   sep='\n',
                   file=sys_stderr)
 
+    def get_state(self):
+        """Get the loaded settings, including the user settings.
+
+        ---
+        Returns:
+        ---
+        : dict
+            -- a picklable dict that can be passed to set_state
+        """
+        return {'settings': self.__dict_settings}
+
+    def set_state(self, state):
+        """Restore the settings from a state returned by get_state.
+
+        ---
+        Parameters:
+        ---
+        state: dict
+            -- a state previously returned by get_state
+
+        Raises:
+        ---
+        KeyError
+        """
+        self.__dict_settings = state['settings']
+        self.__statusbar = self.__dict_settings['statusbar']
+        self.__cache = self.__dict_settings['cache']
+
     def __str__(self):
         """Evaluates to the default settings"""
         return f"{self.__dict_settings}"
@@ -207,6 +310,9 @@ def __Main() -> None:
 #           f"{settings.get('theme')}",
 #           f"{settings.get('theme_name')}",
 #           f"{settings.get('statusbar')}",
+#           f"{settings.get('cache')}",
+#           f"{settings.get('decoder workers')}",
+#           f"{settings.get('decoder prefetch')}",
 #           sep='\n')
 #     print('---------------------------------')
 #     settings.set(language='bn-IN')
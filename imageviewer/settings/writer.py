@@ -0,0 +1,281 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from json import dumps as json_dumps
+from os import O_RDONLY
+from os import close as os_close
+from os import fsync as os_fsync
+from os import makedirs as os_makedirs
+from os import open as os_open
+from os import replace as os_replace
+from os.path import dirname as os_path_dirname
+from sys import stderr as sys_stderr
+from threading import Condition
+from threading import Lock
+from threading import Thread
+from time import monotonic
+
+
+class Writer:
+
+    __FILE = 'settings'
+
+    __paths = None
+    __delay = 0.0
+    __fsync_interval = 0.0
+    __condition = None
+    __lock_write = None
+    __thread = None
+    __running = False
+    __dict_settings = None
+    __deadline = 0.0
+    __fsynced = 0.0
+    __unsynced = ''
+    __writes = 0
+
+    def __init__(self, paths, delay=0.5, fsync_interval=5.0):
+        """Write the user settings file (*.json) in the background.
+
+        ---
+        The settings handed to schedule are written after delay seconds
+        without a newer schedule, so a burst of changes is written only once.
+        The file is written into a temporary file, which is synced to the
+        disk and then replaces the user settings file, so a crash never
+        leaves a truncated file behind. The directory, which makes the
+        replacement durable, is synced at most once every fsync_interval
+        seconds (after every write if it is 0), and always by flush and
+        stop, so the last write of a burst is synced too. After every write
+        the paths are told to ignore it, so it is not reported as a
+        modification.
+
+        ---
+        Parameters:
+        ---
+        paths: Paths
+            -- the user paths, the 'settings' file is written
+
+        Keyword arguments:
+        ---
+        delay: float
+            -- seconds the settings must be unchanged before they are written
+               (default 0.5)
+        fsync_interval: float
+            -- minimum seconds between two syncs of the directory (default
+               5.0)
+        """
+        self.__paths = paths
+        self.__delay = delay
+        self.__fsync_interval = fsync_interval
+        self.__condition = Condition()
+        self.__lock_write = Lock()
+        self.__dict_settings = None
+        self.__fsynced = -fsync_interval
+        self.__unsynced = ''
+        self.__writes = 0
+
+    def schedule(self, dict_settings):
+        """Schedule the settings to be written.
+
+        ---
+        A copy of the settings is taken, the caller can keep changing them.
+        Without a running background thread (see start) the settings are
+        written when flush is called.
+
+        ---
+        Parameters:
+        ---
+        dict_settings: dict
+            -- the settings to be written
+        """
+        with self.__condition:
+            self.__dict_settings = dict(dict_settings)
+            self.__deadline = monotonic() + self.__delay
+            self.__condition.notify()
+
+    def flush(self):
+        """Write the scheduled settings now, if there are any.
+
+        ---
+        The file and its directory are always synced to the disk, also when
+        there is nothing to write but the directory of a previous write is
+        not synced yet. A write of the background thread in progress is
+        finished first, so the newest settings are always the ones left in
+        the file.
+
+        ---
+        Returns:
+        ---
+        : bool
+            -- True if the settings were written, False otherwise
+        """
+        with self.__lock_write:
+            with self.__condition:
+                dict_settings = self.__dict_settings
+                self.__dict_settings = None
+            if dict_settings is None:
+                self.__sync_directory()
+                return False
+            return self.__write(dict_settings, True)
+
+    def start(self):
+        """Start writing in a background (daemon) thread."""
+        if self.__thread is not None:
+            return
+        self.__running = True
+        self.__thread = Thread(target=self.__run,
+                               name='ImageViewer::Writer',
+                               daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop the background thread and write the pending settings."""
+        if self.__thread is not None:
+            with self.__condition:
+                self.__running = False
+                self.__condition.notify()
+            self.__thread.join()
+            self.__thread = None
+        self.flush()
+
+    def is_pending(self):
+        """Checks if there are settings waiting to be written.
+
+        ---
+        Returns:
+        ---
+        : bool
+            -- True if settings are scheduled but not written yet
+        """
+        with self.__condition:
+            return self.__dict_settings is not None
+
+    def get_writes(self):
+        """Get the number of times the settings file has been written.
+
+        ---
+        Returns:
+        ---
+        : int
+            -- the number of writes
+        """
+        return self.__writes
+
+    def __write(self, dict_settings, fsync):
+        """Write the settings into a temporary file and replace the user
+           settings file with it, holding the write lock
+        """
+        path = self.__paths.get_file(self.__FILE)
+        if len(path) == 0:
+            return False
+        path_temporary = f"{path}.tmp"
+        try:
+            os_makedirs(os_path_dirname(path), exist_ok=True)
+            with open(file=path_temporary, mode='wt', encoding='utf-8') as \
+                    file:
+                file.write(json_dumps(dict_settings,
+                                      skipkeys=True,
+                                      ensure_ascii=False,
+                                      indent=4))
+                file.flush()
+                os_fsync(file.fileno())
+            os_replace(path_temporary, path)
+        except (OSError, TypeError, ValueError) as e:
+            print("Could not write settings to user-settings file. ",
+                  f"ERROR: {e}.",
+                  sep='\n',
+                  file=sys_stderr)
+            return False
+        self.__unsynced = os_path_dirname(path)
+        if fsync or monotonic() - self.__fsynced >= self.__fsync_interval:
+            self.__sync_directory()
+        self.__paths.ignore(self.__FILE)
+        self.__writes += 1
+        return True
+
+    def __sync_directory(self):
+        """Sync the directory of the last write if it is not synced yet,
+           holding the write lock
+        """
+        if len(self.__unsynced) == 0:
+            return
+        self.__fsync_directory(self.__unsynced)
+        self.__unsynced = ''
+        self.__fsynced = monotonic()
+
+    @staticmethod
+    def __fsync_directory(path):
+        """Sync the directory entry of a replaced file, where supported"""
+        try:
+            fd = os_open(path, O_RDONLY)
+        except OSError:
+            return
+        try:
+            os_fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os_close(fd)
+
+    def __run(self):
+        """Write the scheduled settings until stop is called"""
+        while True:
+            with self.__condition:
+                while self.__running:
+                    if self.__dict_settings is None:
+                        self.__condition.wait()
+                        continue
+                    timeout = self.__deadline - monotonic()
+                    if timeout <= 0.0:
+                        break
+                    self.__condition.wait(timeout)
+                if not self.__running:
+                    return
+            with self.__lock_write:
+                with self.__condition:
+                    dict_settings = self.__dict_settings
+                    self.__dict_settings = None
+                if dict_settings is not None:
+                    self.__write(dict_settings, False)
+
+    def __str__(self):
+        """Evaluates to the user settings file and the number of writes"""
+        return f'Writing "{self.__paths.get_file(self.__FILE)}", '\
+               f'{self.__writes} write(s)'
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Writer - Writes the user settings in the background.\n"
+        "Copyright:\n"
+        "    imageviewer::settings  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # from imageviewer.paths.paths import Paths
+    #
+    # w = Writer(Paths(), delay=0.5, fsync_interval=5.0)
+    # w.start()
+    # for statusbar in (True, False, True, False):
+    #     w.schedule({'theme': 'Light', 'language': 'en-US',
+    #                 'statusbar': statusbar})
+    # w.stop()
+    # print(w)
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,265 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from contextlib import nullcontext
+from os import makedirs as os_makedirs
+from os import replace as os_replace
+from os import scandir as os_scandir
+from os.path import getmtime as os_path_getmtime
+from pickle import dumps as pickle_dumps
+from pickle import loads as pickle_loads
+from pickle import HIGHEST_PROTOCOL as PICKLE_HIGHEST_PROTOCOL
+from sys import stderr as sys_stderr
+
+from imageviewer.languages.languages import Languages
+from imageviewer.strings.strings import Strings
+from imageviewer.themes.themes import Themes
+from imageviewer.settings.settings import Settings
+
+
+class Snapshot:
+
+    __SNAPSHOT_FILE = 'snapshot.bin'
+    __VERSION = 7
+    __SYSTEM_FILES = (
+        'imageviewer/languages/languages.json',
+        'imageviewer/themes/themes.json',
+        'imageviewer/settings/settings.json'
+    )
+    __SYSTEM_SHARDS = 'imageviewer/strings/languages'
+
+    __path_root = ''
+    __path = ''
+    __paths = None
+
+    def __init__(self, path_root, paths):
+        """Prepare the startup snapshot of the profile directory.
+
+        ---
+        The snapshot is a single binary file in the profile directory holding
+        the already merged state of the system and the user languages,
+        strings, themes and settings. It is keyed by the modification times of
+        all the files it was built from, so it is only used while none of them
+        has changed.
+
+        ---
+        Parameters:
+        ---
+        path_root: str
+            -- full path to the root of this program
+        paths: Paths
+            -- the user paths, with the modification times already collected
+        """
+        self.__path_root = path_root
+        self.__paths = paths
+        self.__path = f"{paths.get_profile_path()}/{self.__SNAPSHOT_FILE}"
+
+    def get_key(self):
+        """Get the key the snapshot is valid for.
+
+        ---
+        Returns:
+        ---
+        : tuple
+            -- the format version, the root path and the modification times of
+               the system files, the language shards and the user files
+        """
+        times = []
+        for file in self.__SYSTEM_FILES:
+            try:
+                times.append(os_path_getmtime(f"{self.__path_root}/{file}"))
+            except OSError:
+                times.append(0.0)
+        shards = []
+        try:
+            with os_scandir(f"{self.__path_root}/{self.__SYSTEM_SHARDS}") \
+                    as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json'):
+                        shards.append((entry.name, entry.stat().st_mtime))
+        except OSError:
+            pass
+        return (self.__VERSION,
+                self.__path_root,
+                tuple(times),
+                tuple(sorted(shards)),
+                tuple(sorted(self.__paths.get_times().items())))
+
+    def load(self, startup=None):
+        """Load the languages, strings, themes and settings.
+
+        ---
+        If the snapshot is valid they are restored from it in a single read,
+        otherwise the system files (*.json) are parsed, the existing user files
+        (*.json) are merged on top and a new snapshot is written.
+
+        ---
+        Keyword arguments:
+        ---
+        startup: Startup
+            -- times reading the snapshot and making every object as a step
+               of the startup, see imageviewer.startup (default None)
+
+        Returns:
+        ---
+        : tuple[Languages, Strings, Themes, Settings]
+            -- the loaded languages, strings, themes and settings
+        """
+        def phase(name):
+            """Time a step if profiled"""
+            return nullcontext() if startup is None else startup.phase(name)
+
+        with phase('snapshot read'):
+            key = self.get_key()
+            state = self.__read(key)
+        if state is not None:
+            try:
+                with phase('languages'):
+                    languages = Languages(self.__path_root,
+                                          state=state['languages'])
+                with phase('strings'):
+                    strings = Strings(self.__path_root,
+                                      state=state['strings'])
+                with phase('themes'):
+                    themes = Themes(self.__path_root, state=state['themes'])
+                with phase('settings'):
+                    settings = Settings(self.__path_root, languages, strings,
+                                        themes, state=state['settings'])
+                return languages, strings, themes, settings
+            except (OSError, KeyError, ValueError) as e:
+                print(f"ERROR: {e}. Ignoring the startup snapshot.",
+                      file=sys_stderr)
+        with phase('languages'):
+            languages = Languages(self.__path_root)
+        with phase('strings'):
+            strings = Strings(self.__path_root,
+                              path_catalogs=self.__paths.get_profile_path())
+        with phase('themes'):
+            themes = Themes(self.__path_root)
+        with phase('settings'):
+            settings = Settings(self.__path_root, languages, strings, themes)
+        with phase('snapshot merge'):
+            self.__merge(languages, strings, themes, settings)
+        with phase('snapshot dump'):
+            self.dump(languages, strings, themes, settings, key)
+        return languages, strings, themes, settings
+
+    def dump(self, languages, strings, themes, settings, key=None):
+        """Write the snapshot into the profile directory.
+
+        ---
+        The snapshot is written into a temporary file first and then renamed,
+        so a crash never leaves a truncated snapshot behind.
+
+        ---
+        Parameters:
+        ---
+        languages: Languages
+            -- the loaded languages
+        strings: Strings
+            -- the loaded strings
+        themes: Themes
+            -- the loaded themes
+        settings: Settings
+            -- the loaded settings
+
+        Keyword arguments:
+        ---
+        key: tuple
+            -- the key returned by get_key (default None, the current key)
+        """
+        if key is None:
+            key = self.get_key()
+        state = {
+            'languages': languages.get_state(),
+            'strings': strings.get_state(),
+            'themes': themes.get_state(),
+            'settings': settings.get_state()
+        }
+        path = f"{self.__path}.tmp"
+        try:
+            os_makedirs(self.__paths.get_profile_path(), exist_ok=True)
+            with open(file=path, mode='wb') as file:
+                file.write(pickle_dumps((key, state),
+                                        protocol=PICKLE_HIGHEST_PROTOCOL))
+            os_replace(path, self.__path)
+        except OSError as e:
+            print(f"Could not write the startup snapshot. ",
+                  f"ERROR: {e}.",
+                  sep='\n',
+                  file=sys_stderr)
+
+    def __read(self, key):
+        """Read the snapshot state if it is valid for the key"""
+        try:
+            with open(file=self.__path, mode='rb') as file:
+                snapshot_key, state = pickle_loads(file.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"ERROR: {e}. Ignoring the startup snapshot.",
+                  file=sys_stderr)
+            return None
+        if snapshot_key != key:
+            return None
+        return state
+
+    def __merge(self, languages, strings, themes, settings):
+        """Merge the existing user files (*.json) on top of the system ones"""
+        times = self.__paths.get_times()
+        loaders = (
+            ('languages', languages.load),
+            ('numbers', strings.load_numbers),
+            ('alphabets', strings.load_alphabets),
+            ('words', strings.load_words),
+            ('themes', themes.load),
+            ('settings', settings.load)
+        )
+        for name, loader in loaders:
+            if times.get(name, 0.0) == 0.0:
+                continue
+            try:
+                loader(self.__paths.get_file(name))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"ERROR: {e}. Could not load user-{name}.json.",
+                      file=sys_stderr)
+            if name == 'languages':
+                strings.load_language_codes(languages.get_codes())
+
+    def __str__(self):
+        """Evaluates to the path of the snapshot file"""
+        return f'Startup snapshot: "{self.__path}"'
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Snapshot - Contains and handles the startup snapshot.\n"
+        "Copyright:\n"
+        "    imageviewer::snapshot  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # from imageviewer.paths.paths import Paths
+    # snapshot = Snapshot('D:/Repository/ImageViewer', Paths())
+    # print(snapshot)
+    # languages, strings, themes, settings = snapshot.load()
+    # print(languages, strings, themes, settings, sep='\n')
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,240 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from sys import meta_path as sys_meta_path
+from time import perf_counter
+
+
+class Startup:
+
+    __start = 0.0
+    __finder = None
+    __list_imports = []
+    __list_phases = []
+    __stack = []
+
+    def __init__(self):
+        """Profile the startup, per imported module and per phase.
+
+        ---
+        While started, every module imported is timed, both on its own and
+        with the modules it imports. The startup steps (loading the settings,
+        decoding and painting the first image, ...) are timed with phase.
+
+        ---
+        See also python -X importtime, which times the imports done before
+        the profile is started too.
+        """
+        self.__start = perf_counter()
+        self.__finder = Finder(self.__enter, self.__exit)
+        self.__list_imports = []
+        self.__list_phases = []
+        self.__stack = []
+
+    def start(self):
+        """Start timing the imports."""
+        if self.__finder not in sys_meta_path:
+            sys_meta_path.insert(0, self.__finder)
+
+    def stop(self):
+        """Stop timing the imports."""
+        if self.__finder in sys_meta_path:
+            sys_meta_path.remove(self.__finder)
+
+    @contextmanager
+    def phase(self, name):
+        """Time a step of the startup, in a with statement.
+
+        ---
+        Parameters:
+        ---
+        name: str
+            -- name of the step, e.g. 'settings'
+        """
+        imports = len(self.__list_imports)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.__list_phases.append(
+                (name, perf_counter() - start,
+                 sum(seconds for _, seconds, _ in
+                     self.__list_imports[imports:])))
+
+    def get_imports(self):
+        """Get the times of the imported modules, slowest first.
+
+        ---
+        Returns:
+        ---
+        : list[tuple[str, float, float]]
+            -- the name of every module, the seconds spent executing it and
+               the seconds including the modules it imports
+        """
+        return sorted(self.__list_imports, key=lambda item: -item[1])
+
+    def get_phases(self):
+        """Get the times of the steps of the startup, in order.
+
+        ---
+        Returns:
+        ---
+        : list[tuple[str, float, float]]
+            -- the name of every step, its seconds and the seconds spent
+               importing in it
+        """
+        return list(self.__list_phases)
+
+    def get_total(self):
+        """Get the seconds since the profile was made"""
+        return perf_counter() - self.__start
+
+    def get_report(self, limit=15):
+        """Get the profile as a table.
+
+        ---
+        Keyword arguments:
+        ---
+        limit: int
+            -- number of the slowest modules listed (default 15)
+
+        Returns:
+        ---
+        : str
+            -- the steps, then the slowest modules, in milliseconds
+        """
+        lines = [f"{'phase':<32} {'ms':>9} {'import ms':>10}"]
+        for name, seconds, imports in self.__list_phases:
+            lines.append(f"{name:<32} {seconds * 1000:>9.2f} "
+                         f"{imports * 1000:>10.2f}")
+        lines.append(f"{'total':<32} {self.get_total() * 1000:>9.2f}")
+        lines.append('')
+        lines.append(f"{'module':<48} {'self ms':>9} {'cumul. ms':>10}")
+        for name, own, cumulative in self.get_imports()[:limit]:
+            lines.append(f"{name:<48} {own * 1000:>9.2f} "
+                         f"{cumulative * 1000:>10.2f}")
+        imports = sum(own for _, own, _ in self.__list_imports)
+        lines.append(f"{len(self.__list_imports)} module(s) imported, "
+                     f"{imports * 1000:.2f} ms")
+        return '\n'.join(lines)
+
+    def __enter(self, name):
+        """Start timing a module"""
+        self.__stack.append([name, perf_counter(), 0.0])
+
+    def __exit(self):
+        """Stop timing a module"""
+        name, start, children = self.__stack.pop()
+        cumulative = perf_counter() - start
+        if len(self.__stack) > 0:
+            self.__stack[-1][2] += cumulative
+        self.__list_imports.append((name, cumulative - children, cumulative))
+
+    def __str__(self):
+        """Evaluates to the number of imported modules and total time"""
+        return f"{len(self.__list_imports)} module(s) imported, "\
+               f"{self.get_total() * 1000:.2f} ms"
+
+
+class Finder(MetaPathFinder):
+
+    __enter = None
+    __exit = None
+
+    def __init__(self, enter, exit):
+        """Finds the modules with the next finders and times their loading.
+
+        ---
+        Parameters:
+        ---
+        enter: Callable[[str], None]
+            -- called with the name of a module before it is executed
+        exit: Callable[[], None]
+            -- called after it is executed
+        """
+        self.__enter = enter
+        self.__exit = exit
+
+    def find_spec(self, name, path, target=None):
+        """Find the spec of a module and wrap its loader"""
+        for finder in sys_meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = Loader(spec.loader, name, self.__enter, self.__exit)
+        return spec
+
+
+class Loader:
+
+    __loader = None
+    __name = ''
+    __enter = None
+    __exit = None
+
+    def __init__(self, loader, name, enter, exit):
+        """Wraps the loader of a module to time its execution"""
+        self.__loader = loader
+        self.__name = name
+        self.__enter = enter
+        self.__exit = exit
+
+    def create_module(self, spec):
+        """Creates the module with the wrapped loader"""
+        return self.__loader.create_module(spec)
+
+    def exec_module(self, module):
+        """Executes the module with the wrapped loader, timed"""
+        module.__loader__ = self.__loader
+        module.__spec__.loader = self.__loader
+        self.__enter(self.__name)
+        try:
+            self.__loader.exec_module(module)
+        finally:
+            self.__exit()
+
+    def __getattr__(self, name):
+        """Gets an attribute of the wrapped loader"""
+        return getattr(self.__loader, name)
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Startup - Profiles the startup.\n"
+        "Copyright:\n"
+        "    imageviewer::startup  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # s = Startup()
+    # s.start()
+    # with s.phase('numpy'):
+    #     import numpy
+    # s.stop()
+    # print(s.get_report())
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,329 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from mmap import mmap
+from mmap import ACCESS_READ as MMAP_ACCESS_READ
+from struct import calcsize as struct_calcsize
+from struct import pack_into as struct_pack_into
+from struct import unpack_from as struct_unpack_from
+from zlib import crc32 as zlib_crc32
+
+
+class Catalog:
+    """A compiled message catalog of the words and their translations.
+
+    ---
+    The catalog is a single binary file, similar to a gettext .mo file, made
+    of the following parts (all integers are little endian):
+
+        header      -- magic, version, size and mtime of the source words.json
+                       and the counts and offsets of the other parts
+        languages   -- (code offset, code length, table offset) per language
+        messages    -- (offset, length) of every message id, its index being
+                       the integer message id
+        hash index  -- open addressing table of message id + 1 (0 is empty),
+                       indexed by the CRC-32 of the message
+        tables      -- one flat (offset, length) table per language with the
+                       translation of every message id, MISSING if there is
+                       none
+        strings     -- UTF-8 encoded codes, messages and translations
+
+    A word translated by a plain string in words.json is stored in the table
+    of the language ANY and is used for every language.
+    """
+
+    ANY = '*'
+
+    __MAGIC = b'IVCT'
+    __VERSION = 1
+    __HEADER = '<4sIqqIIIIII'
+    __HEADER_SIZE = struct_calcsize(__HEADER)
+    __LANGUAGE = '<III'
+    __LANGUAGE_SIZE = struct_calcsize(__LANGUAGE)
+    __ENTRY = '<II'
+    __ENTRY_SIZE = struct_calcsize(__ENTRY)
+    __SLOT = '<I'
+    __SLOT_SIZE = struct_calcsize(__SLOT)
+    __MISSING = 0xFFFFFFFF
+
+    __path = ''
+    __data = None
+    __source = (0, 0)
+    __count = 0
+    __hash_size = 0
+    __messages_offset = 0
+    __hash_offset = 0
+    __dict_tables = {}
+
+    def __init__(self, path='', data=None):
+        """Open a compiled catalog.
+
+        ---
+        The catalog file is memory-mapped, so nothing is parsed and the pages
+        are only read when a lookup touches them. The catalog can also be
+        opened from the bytes returned by compile.
+
+        ---
+        Keyword arguments:
+        ---
+        path: str
+            -- full path to the catalog file (default '')
+        data: bytes
+            -- a compiled catalog, used if the path is empty (default None)
+
+        Raises:
+        ---
+        FileNotFoundError and ValueError
+        """
+        if len(path) > 0:
+            with open(file=path, mode='rb') as file:
+                data = mmap(file.fileno(), 0, access=MMAP_ACCESS_READ)
+        if data is None or len(data) < self.__HEADER_SIZE:
+            raise ValueError('The catalog is empty or truncated')
+        magic, version, mtime, size, count, languages, hash_size,\
+            languages_offset, messages_offset, hash_offset = \
+            struct_unpack_from(self.__HEADER, data, 0)
+        if magic != self.__MAGIC or version != self.__VERSION:
+            raise ValueError('The catalog has an unknown format')
+        self.__path = path
+        self.__data = data
+        self.__source = (mtime, size)
+        self.__count = count
+        self.__hash_size = hash_size
+        self.__messages_offset = messages_offset
+        self.__hash_offset = hash_offset
+        self.__dict_tables = {}
+        for index in range(languages):
+            offset, length, table = struct_unpack_from(
+                self.__LANGUAGE, data,
+                languages_offset + index * self.__LANGUAGE_SIZE)
+            code = bytes(data[offset:offset + length]).decode('utf-8')
+            self.__dict_tables[code] = table
+
+    @staticmethod
+    def compile(dict_words, source=(0, 0)):
+        """Compile the words and their translations into a catalog.
+
+        ---
+        Parameters:
+        ---
+        dict_words: dict[str, dict[str, str] | str]
+            -- the words as in words.json
+
+        Keyword arguments:
+        ---
+        source: tuple[int, int]
+            -- mtime (ns) and size of the source words.json (default (0, 0))
+
+        Returns:
+        ---
+        : bytes
+            -- the compiled catalog
+        """
+        messages = list(dict_words.keys())
+        codes = []
+        for value in dict_words.values():
+            for code in (value if isinstance(value, dict) else (Catalog.ANY,)):
+                if code not in codes:
+                    codes.append(code)
+        count = len(messages)
+        hash_size = 1
+        while hash_size < count * 2:
+            hash_size *= 2
+        languages_offset = Catalog.__HEADER_SIZE
+        messages_offset = languages_offset + \
+            len(codes) * Catalog.__LANGUAGE_SIZE
+        hash_offset = messages_offset + count * Catalog.__ENTRY_SIZE
+        tables_offset = hash_offset + hash_size * Catalog.__SLOT_SIZE
+        strings_offset = tables_offset + \
+            len(codes) * count * Catalog.__ENTRY_SIZE
+        strings = bytearray()
+        dict_strings = {}
+
+        def add(string):
+            """Add a string to the strings part, once"""
+            encoded = string.encode('utf-8')
+            offset = dict_strings.get(encoded)
+            if offset is None:
+                offset = strings_offset + len(strings)
+                dict_strings[encoded] = offset
+                strings.extend(encoded)
+            return offset, len(encoded)
+
+        data = bytearray(strings_offset)
+        struct_pack_into(Catalog.__HEADER, data, 0, Catalog.__MAGIC,
+                         Catalog.__VERSION, source[0], source[1], count,
+                         len(codes), hash_size, languages_offset,
+                         messages_offset, hash_offset)
+        for index, code in enumerate(codes):
+            offset, length = add(code)
+            struct_pack_into(Catalog.__LANGUAGE, data,
+                             languages_offset +
+                             index * Catalog.__LANGUAGE_SIZE,
+                             offset, length,
+                             tables_offset + index * count *
+                             Catalog.__ENTRY_SIZE)
+        mask = hash_size - 1
+        for index, message in enumerate(messages):
+            offset, length = add(message)
+            struct_pack_into(Catalog.__ENTRY, data,
+                             messages_offset + index * Catalog.__ENTRY_SIZE,
+                             offset, length)
+            slot = zlib_crc32(message.encode('utf-8')) & mask
+            while struct_unpack_from(Catalog.__SLOT, data, hash_offset +
+                                     slot * Catalog.__SLOT_SIZE)[0] != 0:
+                slot = (slot + 1) & mask
+            struct_pack_into(Catalog.__SLOT, data,
+                             hash_offset + slot * Catalog.__SLOT_SIZE,
+                             index + 1)
+        for index, code in enumerate(codes):
+            table = tables_offset + index * count * Catalog.__ENTRY_SIZE
+            for message_id, message in enumerate(messages):
+                value = dict_words[message]
+                if isinstance(value, dict):
+                    value = value.get(code)
+                elif code != Catalog.ANY:
+                    value = None
+                if value is None:
+                    entry = (Catalog.__MISSING, Catalog.__MISSING)
+                else:
+                    entry = add(value)
+                struct_pack_into(Catalog.__ENTRY, data,
+                                 table + message_id * Catalog.__ENTRY_SIZE,
+                                 *entry)
+        return bytes(data + strings)
+
+    def get_id(self, string):
+        """Get the integer message id of a word.
+
+        ---
+        Parameters:
+        ---
+        string: str
+            -- a word
+
+        Returns:
+        ---
+        : int
+            -- the message id, or -1 if the word is not in the catalog
+        """
+        if self.__hash_size == 0:
+            return -1
+        data = self.__data
+        encoded = string.encode('utf-8')
+        mask = self.__hash_size - 1
+        slot = zlib_crc32(encoded) & mask
+        while True:
+            message_id = struct_unpack_from(
+                self.__SLOT, data,
+                self.__hash_offset + slot * self.__SLOT_SIZE)[0] - 1
+            if message_id < 0:
+                return -1
+            offset, length = struct_unpack_from(
+                self.__ENTRY, data,
+                self.__messages_offset + message_id * self.__ENTRY_SIZE)
+            if length == len(encoded) and \
+               data[offset:offset + length] == encoded:
+                return message_id
+            slot = (slot + 1) & mask
+
+    def get_by_id(self, message_id, language_code):
+        """Get the translation of a message id.
+
+        ---
+        Parameters:
+        ---
+        message_id: int
+            -- a message id returned by get_id
+        language_code: str
+            -- ISO language code of the translation
+
+        Returns:
+        ---
+        : str | None
+            -- the translation, or None if there is none
+        """
+        for code in (language_code, self.ANY):
+            table = self.__dict_tables.get(code)
+            if table is None:
+                continue
+            offset, length = struct_unpack_from(
+                self.__ENTRY, self.__data,
+                table + message_id * self.__ENTRY_SIZE)
+            if offset != self.__MISSING:
+                return bytes(self.__data[offset:offset + length])\
+                    .decode('utf-8')
+        return None
+
+    def get(self, string, language_code):
+        """Get the translation of a word.
+
+        ---
+        Parameters:
+        ---
+        string: str
+            -- a word
+        language_code: str
+            -- ISO language code of the translation
+
+        Returns:
+        ---
+        : str | None
+            -- the translation, or None if there is none
+        """
+        message_id = self.get_id(string)
+        if message_id < 0:
+            return None
+        return self.get_by_id(message_id, language_code)
+
+    def get_codes(self):
+        """Get the ISO language codes of the catalog.
+
+        ---
+        Returns:
+        ---
+        : set[str]
+            -- ISO codes of all the languages with translations
+        """
+        return set(self.__dict_tables.keys()) - {self.ANY}
+
+    def get_path(self):
+        """Get the full path of the catalog file, '' if it is in memory"""
+        return self.__path
+
+    def get_data(self):
+        """Get the compiled catalog as bytes"""
+        return bytes(self.__data)
+
+    def get_source(self):
+        """Get the mtime (ns) and size of the source words.json"""
+        return self.__source
+
+    def close(self):
+        """Close the memory map of the catalog file."""
+        if isinstance(self.__data, mmap):
+            self.__data.close()
+        self.__data = None
+        self.__hash_size = 0
+        self.__dict_tables = {}
+
+    def __len__(self):
+        """Evaluates to the number of words"""
+        return self.__count
+
+    def __str__(self):
+        """Evaluates to the number of words and languages"""
+        return f"{self.__count} word(s), {len(self.get_codes())} language(s)"
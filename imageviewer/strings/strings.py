@@ -14,28 +14,54 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import ChainMap
+from collections import OrderedDict
 from json import load as json_load
+from os import makedirs as os_makedirs
+from os import replace as os_replace
+from os import stat as os_stat
+from re import compile as re_compile
 from sys import stderr as sys_stderr
+from threading import Lock
+
+from imageviewer.changes.changes import diff
+from imageviewer.paths.paths import Paths
+from imageviewer.strings.catalog import Catalog
 
 
 class Strings:
 
-    __PATH_NUMBERS = "imageviewer/strings/numbers.json"
-    __PATH_ALPHABETS = "imageviewer/strings/alphabets.json"
-    __PATH_WORDS = "imageviewer/strings/words.json"
+    __PATH_LANGUAGES = "imageviewer/strings/languages"
     __DEFAULT_LANGUAGE_CODE = 'en-US'
+    __LANGUAGE_CODE = re_compile(r'[A-Za-z0-9_-]+')
+    __MEMO_ABBREVIATIONS = 256
+
+    __dict_bases = {}
+    __lock = Lock()
+
+    __path_languages = ''
+    __path_catalogs = ''
 
     __language_code = ''
-    __language_codes = set((__DEFAULT_LANGUAGE_CODE,))
+    __language_codes = set()
 
-    __dict_numbers = {}
-    __dict_alphabets = {}
+    __dict_numbers = ChainMap()
+    __dict_alphabets = ChainMap()
     __dict_words = {}
+    __dict_catalogs = {}
+    __loaded = set()
 
     __list_numbers = []
     __list_alphabets = []
 
-    def __init__(self, path_root, language_code=''):
+    __dict_tables = {}
+    __table = None
+    __dict_abbreviations = {}
+    __abbreviation = None
+    __memo_abbreviations = OrderedDict()
+
+    def __init__(self, path_root, language_code='', state=None,
+                 path_catalogs=''):
         """Load the system strings from the root path.
 
         ---
@@ -44,6 +70,15 @@ class Strings:
         language. If the language corresponding to the language_code is not in
         the loaded languages list 'en-US' is set as the default language and a
         ValueError is raised.
+        The system strings are split into one shard per language
+        (languages/<ISO code>.json). Only the shards of 'en-US' and of the
+        default language are loaded here, the others are loaded the first time
+        set_language or a language_code argument asks for them. The shards are
+        shared, read-only, by all the instances, while the user strings, the
+        supported and the default language are kept per instance, so every
+        window can use its own.
+        If the state is given (see get_state) the strings are restored from it
+        and the strings files are not read at all.
 
         ---
         Parameters:
@@ -55,11 +90,20 @@ class Strings:
         ---
         language_code: str
             -- ISO language code of the default language (default ' ')
+        state: dict
+            -- a state previously returned by get_state (default None)
+        path_catalogs: str
+            -- full path to the directory of the compiled catalogs
+               (default ' ', the profile directory, see Paths)
 
         Raises:
         ---
         FileNotFoundError and ValueError
         """
+        if state is not None:
+            self.set_state(state)
+            return
+        self.__language_codes = set((self.__DEFAULT_LANGUAGE_CODE,))
         self.__language_code = self.__DEFAULT_LANGUAGE_CODE
         if len(language_code) > 0:
             try:
@@ -77,19 +121,102 @@ class Strings:
                       sep='\n',
                       file=sys_stderr)
                 self.__language_code = self.__DEFAULT_LANGUAGE_CODE
-        path = path_root + '/' + self.__PATH_NUMBERS
-        with open(file=path, mode='rt', encoding='utf-8') as file:
-            self.__dict_numbers = json_load(file)
-            self.__list_numbers = self.__dict_numbers.get(self.__language_code,
+        self.__path_languages = path_root + '/' + self.__PATH_LANGUAGES
+        self.__path_catalogs = path_catalogs
+        if len(self.__path_catalogs) == 0:
+            self.__path_catalogs = Paths().get_profile_path()
+        with self.__lock:
+            base = self.__dict_bases.setdefault(
+                (self.__path_languages, self.__path_catalogs),
+                {'numbers': {}, 'alphabets': {}, 'catalogs': {}})
+        self.__dict_numbers = ChainMap({}, base['numbers'])
+        self.__dict_alphabets = ChainMap({}, base['alphabets'])
+        self.__dict_catalogs = base['catalogs']
+        self.__dict_words = {}
+        self.__loaded = set()
+        self.__load_language(self.__DEFAULT_LANGUAGE_CODE)
+        self.__load_language(self.__language_code)
+
+    def __load_language(self, language_code):
+        """Load the shard of a language, unless it is loaded already.
+
+        ---
+        A shard is read only once per process, into the system strings shared
+        by all the instances with the same paths. The numbers and alphabets of
+        the shard never replace the ones loaded from the user files. The words
+        of the shard are compiled into a catalog file (see Catalog) that is
+        memory-mapped, it is only compiled again when the shard changes. If
+        the catalog file can not be written it is kept in memory. A language
+        without a shard is remembered as loaded, without any strings.
+        """
+        if language_code in self.__loaded:
+            return
+        with self.__lock:
+            if language_code not in self.__dict_catalogs:
+                self.__read_shard(language_code)
+        self.__loaded.add(language_code)
+        self.__list_numbers = self.__dict_numbers.get(self.__language_code, [])
+        self.__list_alphabets = self.__dict_alphabets.get(self.__language_code,
                                                           [])
-        path = path_root + '/' + self.__PATH_ALPHABETS
-        with open(file=path, mode='rt', encoding='utf-8') as file:
-            self.__dict_alphabets = json_load(file)
-            self.__list_alphabets = self.__dict_alphabets.get(
-                self.__language_code, [])
-        path = path_root + '/' + self.__PATH_WORDS
+        self.__compile_numbers()
+
+    def __read_shard(self, language_code):
+        """Read the shard of a language into the shared system strings.
+
+        ---
+        Only letters, digits, '-' and '_' are accepted in the language code,
+        so it can not name a file outside the languages directory.
+        """
+        if self.__LANGUAGE_CODE.fullmatch(language_code) is None:
+            print(f"ERROR: '{language_code}' is not a valid language code.",
+                  file=sys_stderr)
+            self.__dict_catalogs[language_code] = None
+            return
+        path = f"{self.__path_languages}/{language_code}.json"
+        try:
+            stat = os_stat(path)
+        except OSError:
+            self.__dict_catalogs[language_code] = None
+            return
+        source = (stat.st_mtime_ns, stat.st_size)
         with open(file=path, mode='rt', encoding='utf-8') as file:
-            self.__dict_words = json_load(file)
+            dict_language = json_load(file)
+        self.__dict_numbers.maps[1][language_code] = \
+            dict_language.get('numbers', [])
+        self.__dict_alphabets.maps[1][language_code] = \
+            dict_language.get('alphabets', [])
+        path = f"{self.__path_catalogs}/{language_code}.cat"
+        catalog = None
+        try:
+            catalog = Catalog(path)
+            if catalog.get_source() != source:
+                catalog.close()
+                catalog = None
+        except (OSError, ValueError):
+            pass
+        if catalog is None:
+            catalog = self.__compile_catalog(
+                path, language_code, dict_language.get('words', {}), source)
+        self.__dict_catalogs[language_code] = catalog
+
+    def __compile_catalog(self, path, language_code, dict_words, source):
+        """Compile the words of a shard into a catalog file"""
+        data = Catalog.compile({word: {language_code: translation}
+                                for word, translation in dict_words.items()},
+                               source)
+        try:
+            os_makedirs(self.__path_catalogs, exist_ok=True)
+            with open(file=f"{path}.tmp", mode='wb') as file:
+                file.write(data)
+            os_replace(f"{path}.tmp", path)
+            return Catalog(path)
+        except OSError as e:
+            print(f"ERROR: {e}.",
+                  f"       Could not write the catalog, '{path}'.",
+                  f"       Keeping the catalog in memory.",
+                  sep='\n',
+                  file=sys_stderr)
+            return Catalog(data=data)
 
     def load_language_codes(self, language_codes):
         """Set the set of supported ISO language codes.
@@ -129,9 +256,12 @@ class Strings:
                       f"'{self.__language_code}'.",
                       sep='\n',
                       file=sys_stderr)
+        self.__load_language(self.__language_code)
         self.__list_numbers = self.__dict_numbers.get(self.__language_code, [])
         self.__list_alphabets = self.__dict_alphabets.get(self.__language_code,
                                                           [])
+        self.__table = self.__dict_tables.get(self.__language_code)
+        self.__compile_alphabets()
 
     def get_language(self):
         """Returns the default ISO language code"""
@@ -156,23 +286,63 @@ class Strings:
         : str
             -- a stringified number
         """
-        string = str(number)
         if len(language_code) == 0:
-            language_code = self.__language_code
-        if language_code is self.__DEFAULT_LANGUAGE_CODE:
-            return string
-        numbers = self.__dict_numbers.get(language_code, self.__list_numbers)
-        if len(numbers) == 0:
-            return string
-        return string.replace('0', numbers[0]).replace('1', numbers[1])\
-                     .replace('2', numbers[2]).replace('3', numbers[3])\
-                     .replace('4', numbers[4]).replace('5', numbers[5])\
-                     .replace('6', numbers[6]).replace('7', numbers[7])\
-                     .replace('8', numbers[8]).replace('9', numbers[9])
+            table = self.__table
+        elif language_code is self.__DEFAULT_LANGUAGE_CODE:
+            return str(number)
+        else:
+            if language_code not in self.__loaded:
+                self.__load_language(language_code)
+            table = self.__dict_tables.get(language_code, self.__table)
+        if table is None:
+            return str(number)
+        return str(number).translate(table)
+
+    def get_numbers(self, numbers, language_code=''):
+        """Get the numbers as strings in the provided language.
+
+        ---
+        The same as calling get_number for every number, but the language is
+        resolved only once, e.g. for a whole column of file sizes.
+
+        ---
+        Parameters:
+        ---
+        numbers: Iterable[int | float]
+            -- integer or floating point values
+
+        Keyword arguments:
+        ---
+        language_code: str
+            -- ISO language code of the default language (default ' ')
+
+        Returns:
+        ---
+        : list[str]
+            -- the stringified numbers
+        """
+        if len(language_code) == 0:
+            table = self.__table
+        elif language_code is self.__DEFAULT_LANGUAGE_CODE:
+            table = None
+        else:
+            if language_code not in self.__loaded:
+                self.__load_language(language_code)
+            table = self.__dict_tables.get(language_code, self.__table)
+        if table is None:
+            return [str(number) for number in numbers]
+        return [str(number).translate(table) for number in numbers]
 
     def get_abbreviation(self, string, language_code=''):
         """Get the abbreviation of the string in the provided language.
 
+        ---
+        The digits and the latin capital letters of the upper cased string are
+        mapped to the numbers and alphabets of the language in a single pass,
+        so every character is mapped exactly once: a numeral or an alphabet
+        that itself contains a digit or a latin capital letter is kept as it
+        is. The most recent abbreviations are memoised.
+
         ---
         Parameters:
         ---
@@ -191,29 +361,26 @@ class Strings:
         """
         if len(string) == 0:
             return ''
-        string = string.upper()
         if len(language_code) == 0:
             language_code = self.__language_code
-        if language_code is self.__DEFAULT_LANGUAGE_CODE:
-            return string
-        alphabets = self.__dict_alphabets.get(language_code,
-                                              self.__list_alphabets)
-        if len(alphabets) == 0:
-            return string
-        return self.get_number(string, language_code)\
-            .replace('A', alphabets[0]).replace('B', alphabets[1])\
-            .replace('C', alphabets[2]).replace('D', alphabets[3])\
-            .replace('E', alphabets[4]).replace('F', alphabets[5])\
-            .replace('G', alphabets[6]).replace('H', alphabets[7])\
-            .replace('I', alphabets[8]).replace('J', alphabets[9])\
-            .replace('K', alphabets[10]).replace('L', alphabets[11])\
-            .replace('M', alphabets[12]).replace('N', alphabets[13])\
-            .replace('O', alphabets[14]).replace('P', alphabets[15])\
-            .replace('Q', alphabets[16]).replace('R', alphabets[17])\
-            .replace('S', alphabets[18]).replace('T', alphabets[19])\
-            .replace('U', alphabets[20]).replace('V', alphabets[21])\
-            .replace('W', alphabets[22]).replace('X', alphabets[23])\
-            .replace('Y', alphabets[24]).replace('Z', alphabets[25])
+        elif language_code not in self.__loaded:
+            self.__load_language(language_code)
+        key = (string, language_code)
+        memo = self.__memo_abbreviations
+        abbreviation = memo.get(key)
+        if abbreviation is not None:
+            memo.move_to_end(key)
+            return abbreviation
+        abbreviation = string.upper()
+        if language_code is not self.__DEFAULT_LANGUAGE_CODE:
+            table = self.__dict_abbreviations.get(language_code,
+                                                  self.__abbreviation)
+            if table is not None:
+                abbreviation = abbreviation.translate(table)
+        memo[key] = abbreviation
+        if len(memo) > self.__MEMO_ABBREVIATIONS:
+            memo.popitem(last=False)
+        return abbreviation
 
     def get_word(self, string, language_code=''):
         """Get the string translated in the provided language.
@@ -239,10 +406,22 @@ class Strings:
             language_code = self.__language_code
         if language_code is self.__DEFAULT_LANGUAGE_CODE:
             return string
-        value = self.__dict_words.get(string, string)
-        if isinstance(value, str):
-            return value
-        return value.get(language_code, string)
+        value = self.__dict_words.get(string)
+        if value is not None:
+            if isinstance(value, str):
+                return value
+            translation = value.get(language_code)
+            if translation is not None:
+                return translation
+        if language_code not in self.__loaded:
+            self.__load_language(language_code)
+        catalog = self.__dict_catalogs.get(language_code)
+        if catalog is None:
+            return string
+        translation = catalog.get(string, language_code)
+        if translation is None:
+            return string
+        return translation
 
     def load_numbers(self, path_full):
         """Load the user defined numbers from the given full path.
@@ -265,6 +444,45 @@ class Strings:
             dict_numbers = json_load(file)
             for code, numbers in dict_numbers.items():
                 self.__dict_numbers[code] = numbers
+        self.__list_numbers = self.__dict_numbers.get(self.__language_code, [])
+        self.__compile_numbers()
+
+    def __compile_numbers(self):
+        """Compile the numbers of every language into translation tables.
+
+        ---
+        A table maps each of the digits 0-9 to its numeral in one pass, so
+        a numeral containing a digit is never translated again.
+        """
+        self.__dict_tables = {}
+        for code, numbers in self.__dict_numbers.items():
+            if len(numbers) == 0:
+                continue
+            self.__dict_tables[code] = str.maketrans(
+                {str(digit): numeral for digit, numeral in enumerate(numbers)
+                 if digit < 10})
+        self.__table = self.__dict_tables.get(self.__language_code)
+        self.__compile_alphabets()
+
+    def __compile_alphabets(self):
+        """Compile the alphabets and numbers of every language into
+           abbreviation tables.
+
+        ---
+        Like get_number does for the digits, a language without numbers uses
+        the numbers of the default language.
+        """
+        self.__dict_abbreviations = {}
+        for code, alphabets in self.__dict_alphabets.items():
+            if len(alphabets) == 0:
+                continue
+            table = dict(self.__dict_tables.get(code, self.__table) or {})
+            for index, alphabet in enumerate(alphabets[:26]):
+                table[ord('A') + index] = alphabet
+            self.__dict_abbreviations[code] = table
+        self.__abbreviation = self.__dict_abbreviations.get(
+            self.__language_code)
+        self.__memo_abbreviations = OrderedDict()
 
     def load_alphabets(self, path_full):
         """Load the user defined strings from the given full path.
@@ -287,13 +505,17 @@ class Strings:
             dict_alphabets = json_load(file)
             for code, alphabets in dict_alphabets.items():
                 self.__dict_alphabets[code] = alphabets
+        self.__list_alphabets = self.__dict_alphabets.get(self.__language_code,
+                                                          [])
+        self.__compile_alphabets()
 
     def load_words(self, path_full):
         """Load the user defined strings from the given full path.
 
         ---
         The path_full should be full path to the user-words file in JSON file
-        format.
+        format. The user words are kept in a small overlay that is looked up
+        before the catalog of the system words.
 
         ---
         Parameters:
@@ -308,19 +530,142 @@ class Strings:
         with open(file=path_full, mode='rt', encoding='utf-8') as file:
             dict_words = json_load(file)
             for word, codes in dict_words.items():
-                _codes = self.__dict_words.get(word, {})
-                if len(_codes) == 0:
-                    self.__dict_words[word] = codes
-                else:
-                    for code, translation in codes.items():
-                        _codes[code] = translation
+                _codes = dict(self.__dict_words.get(word, {}))
+                _codes.update(codes)
+                self.__dict_words[word] = _codes
+
+    def reload_words(self, path_full):
+        """Reload the user defined strings from the given full path
+           incrementally.
+
+        ---
+        The user-words file is compared with the previously loaded user
+        strings and only the translations that were added, changed or removed
+        are applied. A removed user translation reverts to the system
+        translation, if there is one.
+
+        ---
+        Parameters:
+        ---
+        path_full: str
+            -- full path to the user-words file (*.json)
+
+        Returns:
+        ---
+        : list[tuple[str, str, str, str]]
+            -- the ('word', word, ISO language code, action) of every change
+
+        Raises:
+        ---
+        FileNotFoundError and ValueError
+        """
+        with open(file=path_full, mode='rt', encoding='utf-8') as file:
+            dict_words = json_load(file)
+        changes = []
+        for word in dict_words.keys() | self.__dict_words.keys():
+            codes_old = self.__dict_words.get(word, {})
+            codes_new = dict_words.get(word, {})
+            if codes_old == codes_new:
+                continue
+            for code, action in diff(codes_old, codes_new):
+                changes.append(('word', word, code, action))
+            if len(codes_new) == 0:
+                del self.__dict_words[word]
+            else:
+                self.__dict_words[word] = codes_new
+        return changes
+
+    def get_state(self):
+        """Get the loaded strings, including the user strings.
+
+        ---
+        Returns:
+        ---
+        : dict
+            -- a picklable dict that can be passed to set_state
+        """
+        dict_catalogs = {}
+        for code in self.__loaded:
+            catalog = self.__dict_catalogs.get(code)
+            if catalog is not None:
+                catalog = catalog.get_path() or catalog.get_data()
+            dict_catalogs[code] = catalog
+        return {
+            'path_languages': self.__path_languages,
+            'path_catalogs': self.__path_catalogs,
+            'language_code': self.__language_code,
+            'language_codes': self.__language_codes,
+            'system_numbers': {code: self.__dict_numbers.maps[1][code]
+                               for code in self.__loaded
+                               if code in self.__dict_numbers.maps[1]},
+            'system_alphabets': {code: self.__dict_alphabets.maps[1][code]
+                                 for code in self.__loaded
+                                 if code in self.__dict_alphabets.maps[1]},
+            'catalogs': dict_catalogs,
+            'numbers': self.__dict_numbers.maps[0],
+            'alphabets': self.__dict_alphabets.maps[0],
+            'words': self.__dict_words
+        }
+
+    def set_state(self, state):
+        """Restore the strings from a state returned by get_state.
+
+        ---
+        The system strings of the state are shared with the other instances
+        with the same paths.
+
+        ---
+        Parameters:
+        ---
+        state: dict
+            -- a state previously returned by get_state
+
+        Raises:
+        ---
+        KeyError
+        """
+        self.__path_languages = state['path_languages']
+        self.__path_catalogs = state['path_catalogs']
+        with self.__lock:
+            base = self.__dict_bases.setdefault(
+                (self.__path_languages, self.__path_catalogs),
+                {'numbers': {}, 'alphabets': {}, 'catalogs': {}})
+            for code, catalog in state['catalogs'].items():
+                if code in base['catalogs']:
+                    continue
+                if isinstance(catalog, str):
+                    catalog = Catalog(catalog)
+                elif catalog is not None:
+                    catalog = Catalog(data=catalog)
+                if code in state['system_numbers']:
+                    base['numbers'][code] = state['system_numbers'][code]
+                if code in state['system_alphabets']:
+                    base['alphabets'][code] = state['system_alphabets'][code]
+                base['catalogs'][code] = catalog
+        self.__dict_numbers = ChainMap(dict(state['numbers']),
+                                       base['numbers'])
+        self.__dict_alphabets = ChainMap(dict(state['alphabets']),
+                                         base['alphabets'])
+        self.__dict_catalogs = base['catalogs']
+        self.__loaded = set(state['catalogs'].keys())
+        self.__language_codes = set(state['language_codes'])
+        self.__dict_words = dict(state['words'])
+        self.__language_code = state['language_code']
+        self.__list_numbers = self.__dict_numbers.get(self.__language_code, [])
+        self.__list_alphabets = self.__dict_alphabets.get(self.__language_code,
+                                                          [])
+        self.__compile_numbers()
 
     def __str__(self):
-        """Evaluates to number of languages, words, and default ISO language
-           code
+        """Evaluates to number of languages, words of the default language,
+           and default ISO language code
         """
+        catalog = self.__dict_catalogs.get(self.__language_code)
+        words = 0 if catalog is None else len(catalog)
+        words += sum(1 for word in self.__dict_words.keys()
+                     if catalog is None or catalog.get_id(word) < 0)
         return f"{len(self.__language_codes)} language(s), "\
-               f"{len(self.__dict_words)} word(s), "\
+               f"{words} word(s), "\
                f"ISO:{self.__language_code}"
 
 
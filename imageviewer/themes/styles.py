@@ -0,0 +1,300 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from functools import lru_cache
+from sys import stderr as sys_stderr
+from threading import Lock
+
+
+class Styles:
+    """A theme compiled into ready-to-apply widget options.
+
+    ---
+    A widget of a theme is any dict with plain values, named by its dotted
+    path, e.g. 'label' or 'menubar.submenu'. Its 'clicked' and 'disabled'
+    sub-dicts are its states, '' being the normal state.
+    """
+
+    __STATES = ('clicked', 'disabled')
+    __OPTIONS = {
+        '': {'background': 'background',
+             'foreground': 'foreground',
+             'highlight': 'highlightcolor'},
+        'clicked': {'background': 'activebackground',
+                    'foreground': 'activeforeground'},
+        'disabled': {'foreground': 'disabledforeground'}
+    }
+    __CACHE_SIZE = 8
+
+    __cache = OrderedDict()
+    __lock = Lock()
+
+    __theme = None
+    __dict_states = {}
+    __dict_options = {}
+    __dict_rgb = {}
+
+    def __init__(self, theme):
+        """Compile a theme.
+
+        ---
+        Use Styles.compile to reuse the styles of the recently compiled
+        themes.
+
+        ---
+        Parameters:
+        ---
+        theme: dict
+            -- a theme as returned by Themes.get
+        """
+        self.__theme = theme
+        self.__dict_states = {}
+        self.__dict_options = {}
+        self.__dict_rgb = {}
+        self.__walk(theme, '')
+
+    @staticmethod
+    def compile(theme):
+        """Get the compiled styles of a theme.
+
+        ---
+        The styles of the most recently compiled themes are kept, so
+        switching back and forth between themes does not compile them again,
+        while the memory stays bounded however many themes are loaded.
+
+        ---
+        Parameters:
+        ---
+        theme: dict
+            -- a theme as returned by Themes.get
+
+        Returns:
+        ---
+        : Styles
+            -- the compiled styles of the theme
+        """
+        key = id(theme)
+        with Styles.__lock:
+            styles = Styles.__cache.get(key)
+            if styles is not None and styles.__theme is theme:
+                Styles.__cache.move_to_end(key)
+                return styles
+        styles = Styles(theme)
+        with Styles.__lock:
+            Styles.__cache[key] = styles
+            Styles.__cache.move_to_end(key)
+            while len(Styles.__cache) > Styles.__CACHE_SIZE:
+                Styles.__cache.popitem(last=False)
+        return styles
+
+    def __walk(self, node, widget):
+        """Compile the widgets of a (sub-)dict of the theme"""
+        values = {key: value for key, value in node.items()
+                  if not isinstance(value, dict)}
+        if len(values) > 0:
+            self.__add(widget, '', values)
+            for state in self.__STATES:
+                if isinstance(node.get(state), dict):
+                    self.__add(widget, state, node[state])
+        for key, value in node.items():
+            if isinstance(value, dict) and \
+               (len(values) == 0 or key not in self.__STATES):
+                self.__walk(value, key if len(widget) == 0
+                            else f"{widget}.{key}")
+
+    def __add(self, widget, state, values):
+        """Add a state of a widget with its options and parsed colors"""
+        values = {key: value for key, value in values.items()
+                  if not isinstance(value, dict)}
+        self.__dict_states[(widget, state)] = values
+        options = self.__dict_options.setdefault(widget, {})
+        for key, option in self.__OPTIONS[state].items():
+            if key in values:
+                options[option] = values[key]
+        rgb = {}
+        for key, value in values.items():
+            try:
+                rgb[key] = parse(value)
+            except ValueError as e:
+                print(f"ERROR: {e}. In the theme widget '{widget}'.",
+                      file=sys_stderr)
+        self.__dict_rgb[(widget, state)] = rgb
+
+    def get(self, widget, state=''):
+        """Get the values of a widget state.
+
+        ---
+        Parameters:
+        ---
+        widget: str
+            -- dotted path of the widget, e.g. 'statusbar.bar'
+
+        Keyword arguments:
+        ---
+        state: str
+            -- '', 'clicked' or 'disabled' (default '')
+
+        Returns:
+        ---
+        : dict[str, str]
+            -- e.g. {'background': '#ffffff', 'foreground': '#000000'}, an
+               empty dict if the widget or state is not in the theme
+        """
+        return self.__dict_states.get((widget, state), {})
+
+    def get_options(self, widget):
+        """Get the Tk options of a widget, for all its states.
+
+        ---
+        Parameters:
+        ---
+        widget: str
+            -- dotted path of the widget, e.g. 'button'
+
+        Returns:
+        ---
+        : dict[str, str]
+            -- e.g. {'background': '#ffffff', 'activebackground': '#ffffff',
+               'disabledforeground': '#000000', ...} to be passed to
+               configure, an empty dict if the widget is not in the theme
+        """
+        return self.__dict_options.get(widget, {})
+
+    def get_rgb(self, widget, key='background', state=''):
+        """Get a color of a widget state as a RGB tuple.
+
+        ---
+        Parameters:
+        ---
+        widget: str
+            -- dotted path of the widget, e.g. 'imageview'
+
+        Keyword arguments:
+        ---
+        key: str
+            -- name of the color (default 'background')
+        state: str
+            -- '', 'clicked' or 'disabled' (default '')
+
+        Returns:
+        ---
+        : tuple[int, int, int] | None
+            -- the color, or None if it is not in the theme
+        """
+        return self.__dict_rgb.get((widget, state), {}).get(key)
+
+    def get_widgets(self):
+        """Get the dotted paths of all the widgets of the theme"""
+        return list(self.__dict_options.keys())
+
+    def blend(self, widget, key, other, ratio, state=''):
+        """Get a color of a widget state blended with another color.
+
+        ---
+        E.g. blend('button', 'background', 'foreground', 0.1) is a hover
+        color slightly towards the foreground. The blended colors are cached.
+
+        ---
+        Parameters:
+        ---
+        widget: str
+            -- dotted path of the widget
+        key: str
+            -- name of the color
+        other: str
+            -- name of the other color of the widget state, or a '#rrggbb'
+               color
+        ratio: float
+            -- 0.0 is the color, 1.0 is the other color
+
+        Keyword arguments:
+        ---
+        state: str
+            -- '', 'clicked' or 'disabled' (default '')
+
+        Returns:
+        ---
+        : str | None
+            -- the blended '#rrggbb' color, or None if a color is missing
+        """
+        values = self.get(widget, state)
+        color = values.get(key)
+        other = values.get(other, other)
+        if color is None or not other.startswith('#'):
+            return None
+        return blend(color, other, round(ratio, 3))
+
+    def __str__(self):
+        """Evaluates to the number of widgets and widget states"""
+        return f"{len(self.__dict_options)} widget(s), "\
+               f"{len(self.__dict_states)} state(s)"
+
+
+@lru_cache(maxsize=1024)
+def parse(color):
+    """Parse a '#rrggbb' (or '#rgb') color into a RGB tuple.
+
+    ---
+    Parameters:
+    ---
+    color: str
+        -- a color
+
+    Returns:
+    ---
+    : tuple[int, int, int]
+        -- the red, green and blue components (0-255)
+
+    Raises:
+    ---
+    ValueError
+    """
+    if not isinstance(color, str) or not color.startswith('#') or \
+       len(color) not in (4, 7):
+        raise ValueError(f"'{color}' is not a '#rrggbb' color")
+    if len(color) == 4:
+        color = '#' + ''.join(digit * 2 for digit in color[1:])
+    return (int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
+
+
+@lru_cache(maxsize=256)
+def blend(color, other, ratio):
+    """Blend two '#rrggbb' colors.
+
+    ---
+    Parameters:
+    ---
+    color: str
+        -- the first color
+    other: str
+        -- the second color
+    ratio: float
+        -- 0.0 is the first color, 1.0 is the second color
+
+    Returns:
+    ---
+    : str
+        -- the blended '#rrggbb' color
+
+    Raises:
+    ---
+    ValueError
+    """
+    first = parse(color)
+    second = parse(other)
+    return '#' + ''.join(f"{round(a + (b - a) * ratio):02x}"
+                         for a, b in zip(first, second))
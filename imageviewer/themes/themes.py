@@ -14,28 +14,49 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import ChainMap
 from json import load as json_load
 from sys import stderr as sys_stderr
 
+from imageviewer.changes.changes import ADDED
+from imageviewer.changes.changes import REMOVED
+from imageviewer.changes.changes import apply
+from imageviewer.changes.changes import diff
+from imageviewer.changes.changes import flatten
+from imageviewer.themes.styles import Styles
+
 
 class Themes:
 
     __PATH_THEMES = 'imageviewer/themes/themes.json'
 
-    __dict_themes = {}
+    __dict_bases = {}
+
+    __path = ''
+    __dict_themes = ChainMap()
+    __dict_system_themes = {}
+    __dict_user_themes = {}
     __names = set()
     __default_name = ''
+    __system_default_name = ''
+    __user_default_name = None
     __name = ''
     __theme = {}
 
-    def __init__(self, path_root, name=''):
+    def __init__(self, path_root, name='', state=None):
         """Load the system themes from the root path.
 
         ---
         The path_root sould be full path to the root of this project.
+        The system themes are read once per process and shared, read-only, by
+        all the instances loaded from the same root path. The user themes and
+        the default theme are kept per instance, so every window can use its
+        own.
         If the name is an empty string the default theme, 'Light' is set. If
         the theme corresponding to the name is not in the loaded themes the
         default theme is set as 'Light' and KeyError is raised.
+        If the state is given (see get_state) the themes are restored from it
+        and the themes file is not read at all.
 
         ---
         Parameters:
@@ -47,34 +68,48 @@ class Themes:
         ---
         name: str
             -- name of the default theme (default ' ')
+        state: dict
+            -- a state previously returned by get_state (default None)
 
         Raises:
         ---
         FileNotFoundError and ValueError
         """
+        if state is not None:
+            self.set_state(state)
+            return
         path = path_root + '/' + self.__PATH_THEMES
-        with open(file=path, mode='rt', encoding='utf-8') as file:
-            dict_themes = json_load(file)
-            for theme_name, theme in dict_themes.items():
-                if isinstance(theme, dict):
-                    self.__dict_themes[theme_name] = theme
-                    self.__names.add(theme_name)
-            self.__default_name = dict_themes['default']
-            if len(name) == 0:
-                name = self.__default_name
-            try:
-                if name not in self.__names:
-                    raise ValueError(f"'{name}' is not a valid system theme")
-            except ValueError as e:
-                print(f"ERROR: {e}.",
-                      f"       Valid themes are: {self.__names}",
-                      f"       Reverting to default theme, "
-                      f"'{self.__default_name}'.",
-                      sep='\n',
-                      file=sys_stderr)
-                name = self.__default_name
-            self.__name = name
-            self.__theme = self.__dict_themes[name]
+        base = self.__dict_bases.get(path)
+        if base is None:
+            with open(file=path, mode='rt', encoding='utf-8') as file:
+                dict_themes = json_load(file)
+            base = ({theme_name: theme
+                     for theme_name, theme in dict_themes.items()
+                     if isinstance(theme, dict)},
+                    dict_themes['default'])
+            self.__dict_bases[path] = base
+        self.__path = path
+        self.__dict_system_themes = base[0]
+        self.__dict_user_themes = {}
+        self.__dict_themes = ChainMap(self.__dict_user_themes, base[0])
+        self.__names = set(self.__dict_themes.keys())
+        self.__default_name = base[1]
+        self.__system_default_name = base[1]
+        if len(name) == 0:
+            name = self.__default_name
+        try:
+            if name not in self.__names:
+                raise ValueError(f"'{name}' is not a valid system theme")
+        except ValueError as e:
+            print(f"ERROR: {e}.",
+                  f"       Valid themes are: {self.__names}",
+                  f"       Reverting to default theme, "
+                  f"'{self.__default_name}'.",
+                  sep='\n',
+                  file=sys_stderr)
+            name = self.__default_name
+        self.__name = name
+        self.__theme = self.__dict_themes[name]
 
     def set(self, name=''):
         """Set the default theme.
@@ -147,6 +182,26 @@ class Themes:
                   file=sys_stderr)
             return self.__theme
 
+    def get_styles(self, name=''):
+        """Get the theme by name, compiled into widget options.
+
+        ---
+        The compiled styles are cached, and compiled again only when the
+        theme is reloaded.
+
+        ---
+        Keyword arguments:
+        ---
+        name: str
+            -- name of the theme, the default theme if empty (default ' ')
+
+        Returns:
+        ---
+        : Styles
+            -- the compiled theme, e.g. get_styles().get_options('button')
+        """
+        return Styles.compile(self.get(name))
+
     def get_name(self):
         """Get the name of the default theme.
 
@@ -199,12 +254,146 @@ class Themes:
             dict_themes = json_load(file)
             for theme_name, theme in dict_themes.items():
                 if isinstance(theme, dict):
-                    self.__dict_themes[theme_name] = theme
+                    self.__dict_user_themes[theme_name] = theme
                     self.__names.add(theme_name)
+            self.__user_default_name = dict_themes.get('default')
             self.__default_name = dict_themes.get('default',
                                                   self.__default_name)
             self.set(dict_themes.get('default', name))
 
+    def reload(self, path_full, name=''):
+        """Reload the user themes from the given full path incrementally.
+
+        ---
+        The user-themes file is compared with the previously loaded user
+        themes and only the values that were added, changed or removed are
+        applied and reported. A removed user theme reverts to the system theme
+        of the same name, if there is one. The current theme is kept, unless
+        it was removed or the 'default' of the file changed, then the default
+        theme is set. A name asks for that theme instead.
+
+        ---
+        Parameters:
+        ---
+        path_full: str
+            -- full path to the user-themes file (*.json)
+
+        Keyword arguments:
+        ---
+        name: str
+            -- name of the theme to be set, ' ' to keep the current one
+               (default ' ')
+
+        Returns:
+        ---
+        : list[tuple[str, str, str, str]]
+            -- the ('theme', theme name, key, action) of every change, the key
+               being the dotted path of a theme value, e.g.
+               'statusbar.bar.background', or '' for a whole theme
+
+        Raises:
+        ---
+        FileNotFoundError and KeyError
+        """
+        with open(file=path_full, mode='rt', encoding='utf-8') as file:
+            dict_themes = json_load(file)
+        dict_user_themes = {theme_name: theme
+                            for theme_name, theme in dict_themes.items()
+                            if isinstance(theme, dict)}
+        changes = []
+        for theme_name in dict_user_themes.keys() | \
+                self.__dict_user_themes.keys():
+            user_old = self.__dict_user_themes.get(theme_name)
+            user_new = dict_user_themes.get(theme_name)
+            if user_old == user_new:
+                continue
+            theme_old = user_old if user_old is not None else\
+                self.__dict_system_themes.get(theme_name)
+            theme_new = user_new if user_new is not None else\
+                self.__dict_system_themes.get(theme_name)
+            if theme_new is None:
+                changes.append(('theme', theme_name, '', REMOVED))
+            elif theme_old is None:
+                changes.append(('theme', theme_name, '', ADDED))
+            else:
+                flat_new = flatten(theme_new)
+                theme_changes = diff(flatten(theme_old), flat_new)
+                for key, action in theme_changes:
+                    changes.append(('theme', theme_name, key, action))
+            if user_new is None:
+                del self.__dict_user_themes[theme_name]
+            elif user_old is None:
+                self.__dict_user_themes[theme_name] = user_new
+            else:
+                apply(user_old, flat_new, theme_changes)
+        if len(changes) > 0:
+            self.__names = set(self.__dict_themes.keys())
+        default_name = dict_themes.get('default')
+        if default_name != self.__user_default_name:
+            self.__user_default_name = default_name
+            self.__default_name = default_name if default_name is not None\
+                else self.__system_default_name
+            if default_name is not None and len(name) == 0:
+                name = default_name
+        if self.__default_name not in self.__names:
+            self.__default_name = self.__system_default_name
+        if self.__name not in self.__names:
+            self.__name = self.__default_name
+        self.__theme = self.__dict_themes[self.__name]
+        if len(name) > 0:
+            self.set(name)
+        return changes
+
+    def get_state(self):
+        """Get the loaded themes, including the user themes.
+
+        ---
+        Returns:
+        ---
+        : dict
+            -- a picklable dict that can be passed to set_state
+        """
+        return {
+            'path': self.__path,
+            'system_themes': self.__dict_system_themes,
+            'system_default_name': self.__system_default_name,
+            'user_themes': self.__dict_user_themes,
+            'user_default_name': self.__user_default_name,
+            'default_name': self.__default_name,
+            'name': self.__name
+        }
+
+    def set_state(self, state):
+        """Restore the themes from a state returned by get_state.
+
+        ---
+        The system themes of the state are shared with the other instances
+        loaded from the same root path.
+
+        ---
+        Parameters:
+        ---
+        state: dict
+            -- a state previously returned by get_state
+
+        Raises:
+        ---
+        KeyError
+        """
+        base = self.__dict_bases.setdefault(
+            state['path'],
+            (state['system_themes'], state['system_default_name']))
+        self.__path = state['path']
+        self.__dict_system_themes = base[0]
+        self.__dict_user_themes = dict(state['user_themes'])
+        self.__dict_themes = ChainMap(self.__dict_user_themes, base[0])
+        self.__names = set(self.__dict_themes.keys())
+        self.__user_default_name = state['user_default_name']
+        self.__default_name = state['default_name']
+        self.__system_default_name = base[1]
+        self.__name = state['name']
+        self.__theme = self.__dict_themes[self.__name]
+
     def __str__(self):
         """Evaluates to the default theme name"""
         return f"'{self.__name}'"
@@ -230,6 +419,7 @@ def __Main():
     #     f"{t.get('Monokai')}",
     #     sep='\n------------------------------\n'
     # )
+    # print(t.get_styles().get_options('button'))
     # t.set()
     # print(t)
     # t.set('Light')
@@ -0,0 +1,602 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import repeat
+from mmap import ACCESS_READ as MMAP_ACCESS_READ
+from mmap import mmap
+from os import makedirs as os_makedirs
+from os import replace as os_replace
+from os import stat as os_stat
+from os.path import abspath as os_path_abspath
+from pickle import dumps as pickle_dumps
+from pickle import loads as pickle_loads
+from pickle import HIGHEST_PROTOCOL as PICKLE_HIGHEST_PROTOCOL
+from struct import calcsize as struct_calcsize
+from struct import pack as struct_pack
+from struct import unpack_from as struct_unpack_from
+from sys import stderr as sys_stderr
+from threading import RLock
+from zlib import crc32 as zlib_crc32
+
+
+class Thumbnails:
+
+    __PACK_FILE = 'thumbnails.pack'
+    __INDEX_FILE = 'thumbnails.index'
+    __MAGIC = b'IVTP'
+    __VERSION = 1
+    __HEADER = '<4sI'
+    __HEADER_SIZE = struct_calcsize(__HEADER)
+    __SIZE, __MTIME, __OFFSET, __LENGTH, __CRC, __USED = range(6)
+
+    __path_pack = ''
+    __path_index = ''
+    __size = 0
+    __limit = 0
+    __file = None
+    __map = None
+    __end = 0
+    __used = 0
+    __dirty = False
+    __dict_index = {}
+    __lock = None
+
+    def __init__(self, paths, size=128, limit=256 * 1024 * 1024):
+        """Open the thumbnail store of the profile directory.
+
+        ---
+        The thumbnails are PNG data (which Tk shows without Pillow) appended
+        to a single pack file. The index maps the absolute path of every image
+        to its size, modification time and the place of its thumbnail in the
+        pack, so a thumbnail is only used while the image is unchanged. A
+        missing, foreign or damaged store is started again empty.
+
+        ---
+        Parameters:
+        ---
+        paths: Paths
+            -- the user paths, the store is in the profile directory
+
+        Keyword arguments:
+        ---
+        size: int
+            -- maximum width and height of the thumbnails (default 128)
+        limit: int
+            -- maximum number of bytes of the pack file, see collect (default
+               256 MiB)
+        """
+        path = paths.get_profile_path()
+        self.__path_pack = f"{path}/{self.__PACK_FILE}"
+        self.__path_index = f"{path}/{self.__INDEX_FILE}"
+        self.__size = size
+        self.__limit = limit
+        self.__dict_index = {}
+        self.__lock = RLock()
+        try:
+            os_makedirs(path, exist_ok=True)
+            self.__open()
+        except OSError as e:
+            print(f"Could not open the thumbnail store. ",
+                  f"ERROR: {e}.",
+                  sep='\n',
+                  file=sys_stderr)
+
+    def __open(self):
+        """Open the pack file and read the index, both valid or both new"""
+        try:
+            self.__file = open(file=self.__path_pack, mode='r+b')
+            header = self.__file.read(self.__HEADER_SIZE)
+            if len(header) != self.__HEADER_SIZE or \
+               struct_unpack_from(self.__HEADER, header) != \
+               (self.__MAGIC, self.__VERSION):
+                raise ValueError('The thumbnail pack is not valid')
+            self.__end = self.__file.seek(0, 2)
+            self.__read_index()
+        except (OSError, ValueError):
+            if self.__file is not None:
+                self.__file.close()
+            self.__create()
+
+    def __create(self):
+        """Start a new empty pack file and index"""
+        self.__file = open(file=self.__path_pack, mode='w+b')
+        self.__file.write(struct_pack(self.__HEADER, self.__MAGIC,
+                                      self.__VERSION))
+        self.__file.flush()
+        self.__end = self.__HEADER_SIZE
+        self.__map = None
+        self.__used = 0
+        self.__dict_index = {}
+        self.__dirty = True
+        self.save()
+
+    def __read_index(self):
+        """Read the index, dropping the entries past the end of the pack"""
+        with open(file=self.__path_index, mode='rb') as file:
+            index = pickle_loads(file.read())
+        if index['version'] != self.__VERSION or index['size'] != self.__size:
+            raise ValueError('The thumbnail index is not valid')
+        self.__used = index['used']
+        self.__dict_index = {
+            path: entry for path, entry in index['entries'].items()
+            if entry[self.__OFFSET] + entry[self.__LENGTH] <= self.__end
+        }
+        self.__dirty = len(self.__dict_index) != len(index['entries'])
+
+    def save(self):
+        """Write the index, if it has changed.
+
+        ---
+        The index is written into a temporary file which then replaces the
+        index file. Call it when the thumbnails are shown and on exit.
+        """
+        with self.__lock:
+            if not self.__dirty or self.__file is None:
+                return
+            index = {'version': self.__VERSION,
+                     'size': self.__size,
+                     'used': self.__used,
+                     'entries': self.__dict_index}
+            path = f"{self.__path_index}.tmp"
+            try:
+                self.__file.flush()
+                with open(file=path, mode='wb') as file:
+                    file.write(pickle_dumps(index,
+                                            protocol=PICKLE_HIGHEST_PROTOCOL))
+                os_replace(path, self.__path_index)
+                self.__dirty = False
+            except OSError as e:
+                print(f"Could not write the thumbnail index. ",
+                      f"ERROR: {e}.",
+                      sep='\n',
+                      file=sys_stderr)
+
+    def close(self):
+        """Save the index and close the pack file."""
+        with self.__lock:
+            self.save()
+            if self.__map is not None:
+                self.__map.close()
+                self.__map = None
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    def get(self, path, stat=None):
+        """Get the thumbnail of an image.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+
+        Keyword arguments:
+        ---
+        stat: os.stat_result | os.DirEntry
+            -- the stat of the image, if it is known already (default None)
+
+        Returns:
+        ---
+        : bytes | None
+            -- PNG data of the thumbnail, None if the image has none or has
+               changed since
+        """
+        path = os_path_abspath(path)
+        with self.__lock:
+            entry = self.__dict_index.get(path)
+            if entry is None or self.__file is None:
+                return None
+            key = get_key(path, stat)
+            if key is None or key != (entry[self.__SIZE], entry[self.__MTIME]):
+                return None
+            end = entry[self.__OFFSET] + entry[self.__LENGTH]
+            if self.__map is None or len(self.__map) < end:
+                self.__remap()
+            self.__used += 1
+            entry[self.__USED] = self.__used
+            self.__dirty = True
+            return self.__map[entry[self.__OFFSET]:end]
+
+    def get_missing(self, paths):
+        """Get the images that have no valid thumbnail.
+
+        ---
+        Parameters:
+        ---
+        paths: Iterable[str]
+            -- full paths to the images
+
+        Returns:
+        ---
+        : list[str]
+            -- the absolute paths to the images without a thumbnail
+        """
+        missing = []
+        with self.__lock:
+            for path in paths:
+                path = os_path_abspath(path)
+                entry = self.__dict_index.get(path)
+                if entry is None or get_key(path) != \
+                   (entry[self.__SIZE], entry[self.__MTIME]):
+                    missing.append(path)
+        return missing
+
+    def put(self, path, data, stat=None):
+        """Store the thumbnail of an image.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+        data: bytes
+            -- PNG data of the thumbnail
+
+        Keyword arguments:
+        ---
+        stat: os.stat_result | os.DirEntry
+            -- the stat of the image the thumbnail was made from (default
+               None)
+
+        Returns:
+        ---
+        : bool
+            -- True if the thumbnail was stored, False otherwise
+        """
+        path = os_path_abspath(path)
+        key = get_key(path, stat)
+        if key is None:
+            return False
+        with self.__lock:
+            if self.__file is None:
+                return False
+            try:
+                self.__file.seek(self.__end)
+                self.__file.write(data)
+            except OSError as e:
+                print(f"Could not write the thumbnail of '{path}'. ",
+                      f"ERROR: {e}.",
+                      sep='\n',
+                      file=sys_stderr)
+                return False
+            self.__used += 1
+            self.__dict_index[path] = [key[0], key[1], self.__end, len(data),
+                                       zlib_crc32(data), self.__used]
+            self.__end += len(data)
+            self.__dirty = True
+        return True
+
+    def generate(self, paths, workers=None, callback=None, chunksize=16):
+        """Make the missing thumbnails of the images in a process pool.
+
+        ---
+        Parameters:
+        ---
+        paths: Iterable[str]
+            -- full paths to the images
+
+        Keyword arguments:
+        ---
+        workers: int
+            -- number of worker processes, one per CPU if None (default None)
+        callback: Callable[[str, bytes], None]
+            -- called with the path and the PNG data of every new thumbnail,
+               in the calling thread (default None)
+        chunksize: int
+            -- number of images handed to a worker process at once (default
+               16)
+
+        Returns:
+        ---
+        : int
+            -- the number of thumbnails made
+        """
+        missing = self.get_missing(paths)
+        if len(missing) == 0:
+            return 0
+        dict_stats = {}
+        for path in missing:
+            try:
+                dict_stats[path] = os_stat(path)
+            except OSError:
+                pass
+        missing = list(dict_stats.keys())
+        made = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path, data in zip(missing,
+                                  executor.map(make_thumbnail, missing,
+                                               repeat(self.__size),
+                                               chunksize=chunksize)):
+                if data is None or not self.put(path, data, dict_stats[path]):
+                    continue
+                made += 1
+                if callback is not None:
+                    callback(path, data)
+        self.save()
+        return made
+
+    def collect(self, limit=None):
+        """Garbage collect the pack file.
+
+        ---
+        The pack file is rewritten if it is larger than the limit or if more
+        than a quarter of it is taken by replaced thumbnails. The most
+        recently used thumbnails that fit in three quarters of the limit are
+        kept, so the pack is not rewritten again soon after.
+
+        ---
+        Keyword arguments:
+        ---
+        limit: int
+            -- maximum number of bytes of the pack file (default None, the
+               limit of the store)
+
+        Returns:
+        ---
+        : int
+            -- the number of bytes reclaimed
+        """
+        limit = self.__limit if limit is None else limit
+        with self.__lock:
+            if self.__file is None:
+                return 0
+            live = sum(entry[self.__LENGTH]
+                       for entry in self.__dict_index.values())
+            if self.__end <= limit and \
+               self.__end - self.__HEADER_SIZE - live <= self.__end // 4:
+                return 0
+            entries = sorted(self.__dict_index.items(),
+                             key=lambda item: item[1][self.__USED],
+                             reverse=True)
+            kept = []
+            total = self.__HEADER_SIZE
+            for path, entry in entries:
+                if total + entry[self.__LENGTH] > limit * 3 // 4 and \
+                   self.__end > limit:
+                    break
+                total += entry[self.__LENGTH]
+                kept.append((path, entry))
+            return self.__rewrite(kept)
+
+    def __rewrite(self, entries):
+        """Rewrite the pack file with only the given entries"""
+        end = self.__end
+        path = f"{self.__path_pack}.tmp"
+        if self.__map is None or len(self.__map) < self.__end:
+            self.__remap()
+        dict_index = {}
+        try:
+            with open(file=path, mode='wb') as file:
+                offset = file.write(struct_pack(self.__HEADER, self.__MAGIC,
+                                                self.__VERSION))
+                for image, entry in entries:
+                    start = entry[self.__OFFSET]
+                    file.write(self.__map[start:start + entry[self.__LENGTH]])
+                    entry = list(entry)
+                    entry[self.__OFFSET] = offset
+                    dict_index[image] = entry
+                    offset += entry[self.__LENGTH]
+            if self.__map is not None:
+                self.__map.close()
+                self.__map = None
+            self.__file.close()
+            os_replace(path, self.__path_pack)
+        except OSError as e:
+            print(f"Could not garbage collect the thumbnail store. ",
+                  f"ERROR: {e}.",
+                  sep='\n',
+                  file=sys_stderr)
+            return 0
+        finally:
+            if self.__file.closed:
+                self.__file = open(file=self.__path_pack, mode='r+b')
+        self.__end = offset
+        self.__dict_index = dict_index
+        self.__dirty = True
+        self.save()
+        return end - offset
+
+    def verify(self):
+        """Verify the thumbnails and drop the invalid ones.
+
+        ---
+        A thumbnail is invalid if its data is damaged, or if its image was
+        removed or has changed since.
+
+        ---
+        Returns:
+        ---
+        : list[str]
+            -- the absolute paths to the images whose thumbnails were dropped
+        """
+        invalid = []
+        with self.__lock:
+            if self.__file is None:
+                return invalid
+            self.__remap()
+            for path, entry in self.__dict_index.items():
+                start = entry[self.__OFFSET]
+                end = start + entry[self.__LENGTH]
+                if end > self.__end or \
+                   zlib_crc32(self.__map[start:end]) != entry[self.__CRC] or \
+                   get_key(path) != (entry[self.__SIZE], entry[self.__MTIME]):
+                    invalid.append(path)
+            for path in invalid:
+                del self.__dict_index[path]
+            if len(invalid) > 0:
+                self.__dirty = True
+                self.save()
+        return invalid
+
+    def rebuild(self, workers=None):
+        """Make all the thumbnails again, in a new pack file.
+
+        ---
+        Keyword arguments:
+        ---
+        workers: int
+            -- number of worker processes, one per CPU if None (default None)
+
+        Returns:
+        ---
+        : int
+            -- the number of thumbnails made
+        """
+        with self.__lock:
+            paths = list(self.__dict_index.keys())
+            if self.__file is None:
+                return 0
+            if self.__map is not None:
+                self.__map.close()
+            self.__file.close()
+            self.__create()
+        return self.generate(paths, workers=workers)
+
+    def get_stats(self):
+        """Get the occupancy of the store.
+
+        ---
+        Returns:
+        ---
+        : dict[str, int]
+            -- 'thumbnails', 'bytes' (of the pack file), 'live_bytes' (of the
+               indexed thumbnails) and 'limit'
+        """
+        with self.__lock:
+            return {'thumbnails': len(self.__dict_index),
+                    'bytes': self.__end,
+                    'live_bytes': sum(entry[self.__LENGTH]
+                                      for entry in self.__dict_index.values()),
+                    'limit': self.__limit}
+
+    def __remap(self):
+        """Map the pack file again, after it has grown"""
+        self.__file.flush()
+        if self.__map is not None:
+            self.__map.close()
+        self.__map = mmap(self.__file.fileno(), 0, access=MMAP_ACCESS_READ)
+
+    def __len__(self):
+        """Evaluates to the number of thumbnails"""
+        return len(self.__dict_index)
+
+    def __str__(self):
+        """Evaluates to the number of thumbnails and the pack file"""
+        return f'{len(self.__dict_index)} thumbnail(s) in '\
+               f'"{self.__path_pack}", {self.__end} bytes'
+
+
+def get_key(path, stat=None):
+    """Get the size and the modification time of an image.
+
+    ---
+    Parameters:
+    ---
+    path: str
+        -- full path to the image
+
+    Keyword arguments:
+    ---
+    stat: os.stat_result | os.DirEntry
+        -- the stat of the image, if it is known already (default None)
+
+    Returns:
+    ---
+    : tuple[int, int] | None
+        -- the size and the modification time in nanoseconds, None if the
+           image does not exist
+    """
+    try:
+        if stat is None:
+            stat = os_stat(path)
+        elif not hasattr(stat, 'st_size'):
+            stat = stat.stat()
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def make_thumbnail(path, size):
+    """Make the thumbnail of an image with Pillow.
+
+    ---
+    Runs in the worker processes of Thumbnails.generate. JPEG images are
+    decoded at a reduced size directly.
+
+    ---
+    Parameters:
+    ---
+    path: str
+        -- full path to the image
+    size: int
+        -- maximum width and height of the thumbnail
+
+    Returns:
+    ---
+    : bytes | None
+        -- PNG data of the thumbnail, None if it could not be made
+    """
+    try:
+        from PIL import Image
+        with Image.open(path) as image:
+            image.draft('RGB', (size, size))
+            image.thumbnail((size, size))
+            if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands()
+                                      else 'RGB')
+            buffer = BytesIO()
+            image.save(buffer, format='PNG', compress_level=1)
+            return buffer.getvalue()
+    except Exception as e:
+        print(f"ERROR: {e}. Could not make the thumbnail of '{path}'.",
+              file=sys_stderr)
+        return None
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Thumbnails - Stores the thumbnails of the images.\n"
+        "Copyright:\n"
+        "    imageviewer::thumbnails  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    from argparse import ArgumentParser
+    from imageviewer.paths.paths import Paths
+
+    parser = ArgumentParser(prog='python -m imageviewer.thumbnails.thumbnails')
+    parser.add_argument('command', nargs='?', default='stats',
+                        choices=('stats', 'verify', 'rebuild', 'collect'))
+    parser.add_argument('--workers', type=int, default=None)
+    arguments = parser.parse_args()
+    t = Thumbnails(Paths())
+    if arguments.command == 'verify':
+        print(f"{len(t.verify())} thumbnail(s) dropped")
+    elif arguments.command == 'rebuild':
+        print(f"{t.rebuild(workers=arguments.workers)} thumbnail(s) made")
+    elif arguments.command == 'collect':
+        print(f"{t.collect()} byte(s) reclaimed")
+    print(t, t.get_stats(), sep='\n')
+    t.close()
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function
@@ -0,0 +1,599 @@
+#     A simple image previewer app built using Python-Tkinter.
+#     Copyright (C) 2021  Kumarjit Das | কুমারজিৎ দাস
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from math import log2
+from queue import PriorityQueue
+from sys import stderr as sys_stderr
+from threading import Lock
+from threading import Thread
+
+from imageviewer.cache.cache import Cache
+from imageviewer.cache.cache import get_size
+from imageviewer.mapped.mapped import open_mapped
+from imageviewer.mapped.mapped import reduce_array
+
+
+class Tiles:
+
+    __tile = 0
+    __source = None
+    __cache = None
+    __size = (0, 0)
+    __levels = 1
+    __queue = None
+    __threads = []
+    __lock = None
+    __lock_cut = None
+    __generation = 0
+    __wanted = set()
+    __requested = set()
+    __level = None
+    __callback = None
+    __dict_stats = {}
+
+    def __init__(self, path, tile=256, workers=2, cache=None, source=None):
+        """Render a large image as tiles decoded on demand.
+
+        ---
+        Level 0 of the pyramid is the image at full resolution, every next
+        level is half the size of the previous one, down to the level that
+        fits in a single tile. Only the tiles that intersect the viewport at
+        the level matching the zoom are decoded, in the background, the ones
+        nearest to the center of the viewport first. The decoded tiles are
+        kept in a cache bounded in bytes, so the memory depends on the size of
+        the screen and not on the size of the image. An image whose regions
+        can not be read on their own is decoded whole, one level at a time.
+        A decoded level that fits in a quarter of the cache is kept to cut
+        the next tiles from. A larger one only lives while the tiles of the
+        request and the ring of tiles around them are cut, so small pans are
+        served from the cache.
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+
+        Keyword arguments:
+        ---
+        tile: int
+            -- width and height of the tiles (default 256)
+        workers: int
+            -- number of worker threads (default 2)
+        cache: Cache
+            -- cache of the decoded tiles (default None, a 64 MiB cache)
+        source: Source | Mapped
+            -- reads the regions of the image, it is closed with the
+               renderer (default None, the mapped image if it is
+               uncompressed, a Source of the path otherwise)
+        """
+        self.__tile = max(16, tile)
+        if source is None:
+            source = open_mapped(path)
+        self.__source = source if source is not None else Source(path)
+        self.__cache = cache if cache is not None else Cache(64 * 1024 * 1024)
+        self.__size = self.__source.get_size()
+        longest = max(self.__size)
+        self.__levels = 1
+        while longest > self.__tile:
+            longest = -(-longest // 2)
+            self.__levels += 1
+        self.__queue = PriorityQueue()
+        self.__lock = Lock()
+        self.__lock_cut = Lock()
+        self.__generation = 0
+        self.__wanted = set()
+        self.__requested = set()
+        self.__level = None
+        self.__callback = None
+        self.__dict_stats = {'requested': 0, 'decoded': 0, 'composed': 0,
+                             'skipped': 0, 'errors': 0}
+        self.__threads = [Thread(target=self.__run,
+                                 name=f'ImageViewer::Tiles-{worker}',
+                                 daemon=True)
+                          for worker in range(max(1, workers))]
+        for thread in self.__threads:
+            thread.start()
+
+    def get_size(self):
+        """Get the width and the height of the image at full resolution"""
+        return self.__size
+
+    def get_levels(self):
+        """Get the number of levels of the pyramid"""
+        return self.__levels
+
+    def get_level(self, zoom):
+        """Get the level of the pyramid to be shown at a zoom.
+
+        ---
+        Parameters:
+        ---
+        zoom: float
+            -- the zoom, 1.0 is 100%
+
+        Returns:
+        ---
+        : int
+            -- the coarsest level that is not smaller than the zoom
+        """
+        if zoom >= 1.0 or zoom <= 0.0:
+            return 0
+        return min(self.__levels - 1, int(log2(1.0 / zoom)))
+
+    def get_tiles(self, box, zoom):
+        """Get the tiles of a viewport, nearest to its center first.
+
+        ---
+        Parameters:
+        ---
+        box: tuple[int, int, int, int]
+            -- left, top, right and bottom of the viewport, in pixels of the
+               image at full resolution
+        zoom: float
+            -- the zoom, 1.0 is 100%
+
+        Returns:
+        ---
+        : list[tuple[int, int, int]]
+            -- the keys (level, column, row) of the tiles
+        """
+        level = self.get_level(zoom)
+        size = self.__tile << level
+        left = max(0, int(box[0]) // size)
+        top = max(0, int(box[1]) // size)
+        right = min(-(-self.__size[0] // size), -(-int(box[2]) // size))
+        bottom = min(-(-self.__size[1] // size), -(-int(box[3]) // size))
+        center = ((box[0] + box[2]) / 2 / size - 0.5,
+                  (box[1] + box[3]) / 2 / size - 0.5)
+        keys = [(level, column, row) for row in range(top, bottom)
+                for column in range(left, right)]
+        keys.sort(key=lambda key: (key[1] - center[0]) ** 2 +
+                  (key[2] - center[1]) ** 2)
+        return keys
+
+    def get_box(self, key):
+        """Get the region of a tile.
+
+        ---
+        Parameters:
+        ---
+        key: tuple[int, int, int]
+            -- the key (level, column, row) of the tile
+
+        Returns:
+        ---
+        : tuple[int, int, int, int]
+            -- left, top, right and bottom of the tile, in pixels of the image
+               at full resolution
+        """
+        level, column, row = key
+        size = self.__tile << level
+        return (column * size, row * size,
+                min(self.__size[0], (column + 1) * size),
+                min(self.__size[1], (row + 1) * size))
+
+    def request(self, box, zoom, callback=None):
+        """Request the tiles of a viewport.
+
+        ---
+        The tiles that are decoded already are returned, the others are
+        decoded in the background, nearest to the center first, and handed to
+        the callback. Tiles of a previous request that are not in this one
+        are not decoded anymore. The callback is called from a worker thread,
+        a Tk user interface must hand the tile over to the main thread (e.g.
+        with after) before showing it. The tiles of a Mapped source are
+        read-only NumPy arrays, the ones of a Source are PIL images.
+
+        ---
+        Parameters:
+        ---
+        box: tuple[int, int, int, int]
+            -- left, top, right and bottom of the viewport, in pixels of the
+               image at full resolution
+        zoom: float
+            -- the zoom, 1.0 is 100%
+
+        Keyword arguments:
+        ---
+        callback: Callable[[tuple[int, int, int], Any], None]
+            -- called with the key and the image (PIL.Image.Image or
+               numpy.ndarray) of every decoded tile (default None)
+
+        Returns:
+        ---
+        : dict[tuple[int, int, int], PIL.Image.Image | numpy.ndarray]
+            -- the images of the tiles decoded already, by key
+        """
+        keys = self.get_tiles(box, zoom)
+        tiles = {}
+        missing = []
+        for key in keys:
+            image = self.__cache.get(key)
+            if image is None:
+                missing.append(key)
+            else:
+                tiles[key] = image
+        with self.__lock:
+            self.__generation += 1
+            self.__wanted = set(missing)
+            self.__requested = set(keys)
+            self.__callback = callback
+            self.__dict_stats['requested'] += len(missing)
+            for priority, key in enumerate(missing):
+                self.__queue.put((-self.__generation, priority, key))
+        return tiles
+
+    def get(self, key):
+        """Get a decoded tile, None if it is not decoded"""
+        return self.__cache.get(key)
+
+    def get_stats(self):
+        """Get the counters of the renderer.
+
+        ---
+        Returns:
+        ---
+        : dict[str, int]
+            -- 'requested', 'decoded' (read from the image), 'composed' (made
+               from the tiles of the previous level), 'skipped' (not wanted
+               anymore) and 'errors', and the occupancy of the cache
+        """
+        with self.__lock:
+            stats = dict(self.__dict_stats)
+        stats.update(self.__cache.get_stats())
+        return stats
+
+    def close(self):
+        """Stop the worker threads and close the source."""
+        with self.__lock:
+            self.__wanted = set()
+            for _ in self.__threads:
+                self.__queue.put((float('-inf'), 0, None))
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+        self.__level = None
+        self.__source.close()
+
+    def __run(self):
+        """Decode the wanted tiles until close is called"""
+        while True:
+            _, _, key = self.__queue.get()
+            if key is None:
+                return
+            with self.__lock:
+                if key not in self.__wanted:
+                    self.__dict_stats['skipped'] += 1
+                    continue
+                self.__wanted.discard(key)
+            try:
+                image = self.__read(key)
+            except Exception as e:
+                print(f"ERROR: {e}. Could not decode the tile {key}.",
+                      file=sys_stderr)
+                with self.__lock:
+                    self.__dict_stats['errors'] += 1
+                continue
+            with self.__lock:
+                callback = self.__callback
+            if callback is not None:
+                try:
+                    callback(key, image)
+                except Exception as e:
+                    print(f"ERROR: {e}. In the callback for the tile {key}.",
+                          file=sys_stderr)
+
+    def __read(self, key):
+        """Get a tile from the cache, or decode it and put it there"""
+        image = self.__cache.get(key)
+        if image is not None:
+            return image
+        level = key[0]
+        box = self.get_box(key)
+        image = self.__source.read(box, 1 << level)
+        if image is not None:
+            with self.__lock:
+                self.__dict_stats['decoded'] += 1
+        elif level > 0 and self.__source.is_tiled():
+            image = self.__compose(key)
+            with self.__lock:
+                self.__dict_stats['composed'] += 1
+        else:
+            with self.__lock_cut:
+                image = self.__cache.get(key)
+                if image is not None:
+                    return image
+                image = self.__cut(level, key)
+        self.__cache.put(key, image)
+        return image
+
+    def __compose(self, key):
+        """Make a tile from the (up to) four tiles of the previous level"""
+        level, column, row = key
+        left, top, right, bottom = self.get_box(key)
+        scale = 1 << (level - 1)
+        tiles = []
+        for child in ((level - 1, column * 2, row * 2),
+                      (level - 1, column * 2 + 1, row * 2),
+                      (level - 1, column * 2, row * 2 + 1),
+                      (level - 1, column * 2 + 1, row * 2 + 1)):
+            box = self.get_box(child)
+            if box[0] < right and box[1] < bottom:
+                tiles.append((self.__read(child), ((box[0] - left) // scale,
+                                                   (box[1] - top) // scale)))
+        return compose(tiles, (-(-(right - left) // scale),
+                               -(-(bottom - top) // scale)))
+
+    def __cut(self, level, key):
+        """Cut a tile from a whole decoded level.
+
+        ---
+        A decoded level that fits in a quarter of the cache is kept, so
+        panning over an image that can only be decoded whole does not decode
+        it again for every tile, and only the other tiles of the last request
+        are put into the cache with it, so they are not evicted by the tiles
+        of the rest of the level. A larger level is released once those
+        tiles and the ring of tiles around them are cut, so the memory does
+        not stay at the size of the image.
+        """
+        if self.__level is not None and self.__level[0] == level:
+            image = self.__level[1]
+        else:
+            self.__level = None
+            image = self.__source.read_level(1 << level)
+            with self.__lock:
+                self.__dict_stats['decoded'] += 1
+        keep = get_size(image) * 4 <= self.__cache.get_budget()
+        with self.__lock:
+            keys = {other for other in self.__wanted | self.__requested
+                    if other[0] == level}
+        if not keep:
+            size = self.__tile << level
+            columns = -(-self.__size[0] // size)
+            rows = -(-self.__size[1] // size)
+            keys = {(level, column, row) for _, near_column, near_row in keys
+                    for column in range(max(0, near_column - 1),
+                                        min(columns, near_column + 2))
+                    for row in range(max(0, near_row - 1),
+                                     min(rows, near_row + 2))}
+        for other in keys:
+            if other != key and other not in self.__cache:
+                self.__cache.put(other, self.__crop(image, other))
+        self.__level = (level, image) if keep else None
+        return self.__crop(image, key)
+
+    def __crop(self, image, key):
+        """Cut a tile from a whole decoded level"""
+        level = key[0]
+        left, top, right, bottom = self.get_box(key)
+        box = (left >> level, top >> level,
+               -(-right >> level), -(-bottom >> level))
+        if getattr(image, 'mode', None) is None:
+            return image[box[1]:box[3], box[0]:box[2]]
+        return image.crop(box)
+
+    def __str__(self):
+        """Evaluates to the size of the image and of the pyramid"""
+        return f"{self.__size[0]}x{self.__size[1]}, {self.__levels} level(s) "\
+               f"of {self.__tile}x{self.__tile} tiles"
+
+
+class Source:
+
+    __path = ''
+    __size = (0, 0)
+    __tiled = False
+    __dict_pages = {}
+
+    def __init__(self, path):
+        """Read the regions of an image with Pillow.
+
+        ---
+        Regions are decoded on their own for the images Pillow splits into
+        several tiles or strips, like uncompressed tiled and striped TIFF.
+        The pages of a multi-page TIFF pyramid are used for its reduced
+        levels. Any other image is decoded whole, at a reduced resolution
+        where the format allows it (see decoder.reduce_image).
+
+        ---
+        Parameters:
+        ---
+        path: str
+            -- full path to the image
+
+        Raises:
+        ---
+        ImportError, OSError and PIL.UnidentifiedImageError
+        """
+        from PIL import Image
+
+        self.__path = path
+        self.__dict_pages = {}
+        with Image.open(path) as image:
+            self.__size = image.size
+            self.__tiled = len(image.tile) > 1
+            width, height = image.size
+            for page in range(1, getattr(image, 'n_frames', 1)):
+                image.seek(page)
+                scale = width / image.width
+                if image.width > 0 and scale > 1.0 and \
+                   scale == 2 ** round(log2(scale)) and \
+                   image.height in (height // int(scale),
+                                    -(-height // int(scale))):
+                    self.__dict_pages[int(scale)] = (page, len(image.tile) > 1)
+
+    def get_size(self):
+        """Get the width and the height of the image at full resolution"""
+        return self.__size
+
+    def is_tiled(self):
+        """Checks if regions of the full resolution can be read on their own"""
+        return self.__tiled
+
+    def read(self, box, scale):
+        """Read a region of the image at a reduced resolution.
+
+        ---
+        Parameters:
+        ---
+        box: tuple[int, int, int, int]
+            -- left, top, right and bottom of the region, in pixels of the
+               image at full resolution
+        scale: int
+            -- the region is reduced by this power of 2
+
+        Returns:
+        ---
+        : PIL.Image.Image | None
+            -- the region, None if it can not be read on its own
+        """
+        from PIL import Image
+
+        page, tiled = (0, self.__tiled) if scale == 1 else\
+            self.__dict_pages.get(scale, (None, False))
+        if page is None or not tiled:
+            return None
+        with Image.open(self.__path) as image:
+            image.seek(page)
+            return read_region(image, (box[0] // scale, box[1] // scale,
+                                       -(-box[2] // scale),
+                                       -(-box[3] // scale)))
+
+    def read_level(self, scale):
+        """Decode the whole image at a reduced resolution.
+
+        ---
+        Parameters:
+        ---
+        scale: int
+            -- the image is reduced by this power of 2
+
+        Returns:
+        ---
+        : PIL.Image.Image
+            -- the image, ceil(width / scale) by ceil(height / scale) pixels
+        """
+        from PIL import Image
+
+        from imageviewer.decoder.decoder import reduce_image
+
+        size = (-(-self.__size[0] // scale), -(-self.__size[1] // scale))
+        with Image.open(self.__path) as image:
+            page = self.__dict_pages.get(scale, (0, False))[0]
+            if page > 0:
+                image.seek(page)
+            else:
+                reduce_image(image, size)
+            image.load()
+            if image.size != size:
+                return image.resize(size, Image.BOX, reducing_gap=2.0)
+            return image.copy()
+
+    def close(self):
+        """Nothing to release, the image is opened for every read."""
+
+    def __str__(self):
+        """Evaluates to the path of the image"""
+        return f'"{self.__path}"'
+
+
+def read_region(image, box):
+    """Decode only the tiles or strips of an opened image within a region.
+
+    ---
+    Parameters:
+    ---
+    image: PIL.Image.Image
+        -- the image, as returned by PIL.Image.open and not loaded
+    box: tuple[int, int, int, int]
+        -- left, top, right and bottom of the region
+
+    Returns:
+    ---
+    : PIL.Image.Image
+        -- the region
+    """
+    tiles = [tile for tile in image.tile
+             if tile[1][0] < box[2] and tile[1][2] > box[0] and
+             tile[1][1] < box[3] and tile[1][3] > box[1]]
+    left = min(tile[1][0] for tile in tiles)
+    top = min(tile[1][1] for tile in tiles)
+    right = max(tile[1][2] for tile in tiles)
+    bottom = max(tile[1][3] for tile in tiles)
+    make = getattr(type(tiles[0]), '_make', tuple)
+    image.tile = [make((tile[0], (tile[1][0] - left, tile[1][1] - top,
+                                  tile[1][2] - left, tile[1][3] - top),
+                        tile[2], tile[3])) for tile in tiles]
+    image._size = (right - left, bottom - top)
+    image.load()
+    return image.crop((box[0] - left, box[1] - top,
+                       box[2] - left, box[3] - top))
+
+
+def compose(tiles, size):
+    """Make a tile of the next level from the tiles of a level.
+
+    ---
+    Parameters:
+    ---
+    tiles: list[tuple[PIL.Image.Image | numpy.ndarray, tuple[int, int]]]
+        -- the tiles and their places
+    size: tuple[int, int]
+        -- width and height of the tiles together
+
+    Returns:
+    ---
+    : PIL.Image.Image | numpy.ndarray
+        -- the tiles together, at half the size, of the type of the tiles
+    """
+    first = tiles[0][0]
+    if getattr(first, 'mode', None) is None:
+        import numpy
+
+        array = numpy.zeros((size[1], size[0]) + first.shape[2:],
+                            dtype=first.dtype)
+        for tile, place in tiles:
+            array[place[1]:place[1] + tile.shape[0],
+                  place[0]:place[0] + tile.shape[1]] = tile
+        return reduce_array(array)
+    from PIL import Image
+
+    image = Image.new(first.mode, size)
+    for tile, place in tiles:
+        image.paste(tile, place)
+    return image.reduce(2)
+
+
+def __Main():
+    """Main entry point of this program"""
+    print(
+        "ImageViewer::Tiles - Renders large images as tiles.\n"
+        "Copyright:\n"
+        "    imageviewer::tiles  Copyright (C) 2021  Kumarjit Das\n"
+        "    This program comes with ABSOLUTELY NO WARRANTY.\n"
+        "    This is free software, and you are welcome to redistribute it\n"
+        "    under certain conditions."
+    )
+    # t = Tiles('D:/Pictures/scan.tif', tile=256)
+    # print(t)
+    # print(t.request((0, 0, 30000, 30000), 1920 / 30000,
+    #                 lambda key, image: print(key, image.size)))
+    # t.close()
+
+
+if __name__ == "__main__":
+    __Main()  # calling the __Main function